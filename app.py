@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, make_response, stream_with_context
 from flask_cors import CORS
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
@@ -7,14 +7,27 @@ import os
 from urllib.parse import quote_plus, urlencode
 from celery import group, chord
 from celery.result import AsyncResult
-from sqlalchemy import inspect, text, or_, create_engine
+from sqlalchemy import inspect, text, or_, and_, func, bindparam, create_engine
 from sqlalchemy.engine.url import make_url
 import time
 import logging
 import sys
 import uuid
+import json
+import base64
+import functools
 
-from models import db, AvailabilitySlot, ScrapingTask
+from models import db, AvailabilitySlot, AvailabilitySummary, ScrapingTask, VenueMetadata, DataVersion, RefreshState, dumps_json, slot_json, slot_json_fragment, slot_api_fields
+from slot_search import setup_slot_search, apply_slot_search
+from wal_checkpoint import get_checkpoint_manager, wal_file_size, WAL_CHECKPOINT_ENABLED
+import response_cache
+import response_formats
+import slot_events
+import refresh_scheduler
+import rate_limiter
+import refresh_cycles
+import task_dedup
+from slot_normalization import parse_start_minutes, normalize_price, is_available_status
 
 # Import celery_app after app is created to avoid circular import
 try:
@@ -110,7 +123,9 @@ if database_url.startswith('sqlite'):
         logger = logging.getLogger(__name__)
         logger.warning(f"Could not enable WAL mode for SQLite: {e}")
 
-# Create tables and ensure latest schema
+# Create tables and ensure latest schema. Set when existing rows need
+# backfill_slot_json_fragments() to derive newly added columns.
+slot_rows_need_backfill = False
 with app.app_context():
     db.create_all()
     inspector = inspect(db.engine)
@@ -118,6 +133,53 @@ with app.app_context():
     if 'booking_url' not in columns:
         with db.engine.connect() as conn:
             conn.execute(text("ALTER TABLE availability_slots ADD COLUMN booking_url VARCHAR(500)"))
+    if 'removed_at' not in columns:
+        with db.engine.begin() as conn:
+            conn.execute(text("ALTER TABLE availability_slots ADD COLUMN removed_at DATETIME"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_availability_slots_removed_at ON availability_slots (removed_at)"))
+    if 'json_fragment' not in columns:
+        # Existing rows are filled in by backfill_slot_json_fragments(); until then the
+        # data API serializes them on the fly
+        with db.engine.begin() as conn:
+            conn.execute(text("ALTER TABLE availability_slots ADD COLUMN json_fragment TEXT"))
+    if 'price_amount' not in columns:
+        with db.engine.begin() as conn:
+            conn.execute(text("ALTER TABLE availability_slots ADD COLUMN price_amount FLOAT"))
+            conn.execute(text("ALTER TABLE availability_slots ADD COLUMN price_currency VARCHAR(3)"))
+            conn.execute(text("ALTER TABLE availability_slots ADD COLUMN price_basis VARCHAR(20)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_availability_slots_price_amount ON availability_slots (price_amount)"))
+            conn.execute(text("UPDATE availability_slots SET json_fragment = NULL"))
+        slot_rows_need_backfill = True
+    if 'start_minutes' not in columns:
+        with db.engine.begin() as conn:
+            conn.execute(text("ALTER TABLE availability_slots ADD COLUMN start_minutes INTEGER"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_city_guests_date_start "
+                "ON availability_slots (city, guests, date, start_minutes)"
+            ))
+            conn.execute(text("UPDATE availability_slots SET json_fragment = NULL"))
+        slot_rows_need_backfill = True
+    if 'change_version' not in columns:
+        with db.engine.begin() as conn:
+            conn.execute(text("ALTER TABLE availability_slots ADD COLUMN change_version INTEGER"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_availability_slots_change_version ON availability_slots (change_version)"))
+    try:
+        for version_name in ('slots', 'slots_reset'):
+            if db.session.get(DataVersion, version_name) is None:
+                db.session.add(DataVersion(name=version_name, value=0))
+        db.session.commit()
+    except Exception:
+        # Another process created the counters first
+        db.session.rollback()
+    setup_slot_search(db.engine)
+
+# Background WAL checkpointing runs in web processes only (started on the first
+# request, so Celery workers that import this module don't spawn the thread)
+@app.before_request
+def ensure_wal_checkpointer():
+    if WAL_CHECKPOINT_ENABLED and db.engine.dialect.name == 'sqlite':
+        get_checkpoint_manager(db.engine, db_file_path)
+
 
 # Venue lists
 NYC_VENUES = [
@@ -358,7 +420,11 @@ def cleanup_old_slots():
         if old_slots_count > 0:
             # Delete old slots using bulk delete
             deleted_count = AvailabilitySlot.query.filter(AvailabilitySlot.date < today).delete(synchronize_session=False)
+            AvailabilitySummary.query.filter(AvailabilitySummary.date < today).delete(synchronize_session=False)
+            mark_slots_reset()
             db.session.commit()
+            response_cache.bump_all()
+            slot_events.publish_purge(date_to=today - timedelta(days=1))
             logger.info(f"[CLEANUP] Deleted {deleted_count} old availability slots (dates before {today})")
             return deleted_count
         else:
@@ -374,6 +440,126 @@ def cleanup_old_slots():
         return 0
 
 
+def next_change_version(name='slots'):
+    """Reserve the next value of a DataVersion counter in the current transaction.
+
+    The counter row stays write-locked until commit, so versions become visible
+    in order: a reader that sees version N also sees every change up to N.
+    """
+    table = DataVersion.__table__
+    return db.session.execute(
+        table.update().where(table.c.name == name).values(value=table.c.value + 1).returning(table.c.value)
+    ).scalar_one()
+
+
+def current_change_version(name='slots'):
+    return db.session.query(DataVersion.value).filter(DataVersion.name == name).scalar() or 0
+
+
+def mark_slots_reset():
+    """Record that slots were hard-deleted; change feeds older than this must resync"""
+    version = next_change_version()
+    db.session.execute(
+        DataVersion.__table__.update().where(DataVersion.name == 'slots_reset').values(value=version)
+    )
+    return version
+
+
+def refresh_availability_summaries(partitions):
+    """Recompute the AvailabilitySummary rows of (venue_name, date, guests) partitions.
+
+    Runs inside the caller's transaction (no commit), so summaries change together
+    with the slot writes behind them. slot_count counts every visible slot; the
+    available count, earliest/latest time and minimum price cover available slots.
+    """
+    partitions = set(partitions)
+    if not partitions:
+        return 0
+    slots = AvailabilitySlot.__table__
+    summaries = AvailabilitySummary.__table__
+    
+    grouped = {}
+    query = db.session.query(
+        slots.c.venue_name, slots.c.date, slots.c.guests, slots.c.city,
+        slots.c.time, slots.c.start_minutes, slots.c.price, slots.c.price_amount, slots.c.status
+    ).filter(
+        slots.c.venue_name.in_({p[0] for p in partitions}),
+        slots.c.date.in_({p[1] for p in partitions}),
+        slots.c.guests.in_({p[2] for p in partitions}),
+        slots.c.removed_at.is_(None),
+    )
+    for r in query:
+        key = (r.venue_name, r.date, r.guests)
+        if key in partitions:
+            grouped.setdefault(key, []).append(r)
+    
+    now = datetime.utcnow()
+    new_rows = []
+    for (venue, day, guests), rows in grouped.items():
+        available = [r for r in rows if is_available_status(r.status)]
+        timed = [(r.start_minutes, r.time) for r in available if r.start_minutes is not None]
+        priced = [(r.price_amount, r.price) for r in available if r.price_amount is not None]
+        earliest = min(timed) if timed else (None, None)
+        latest = max(timed) if timed else (None, None)
+        cheapest = min(priced) if priced else (None, None)
+        new_rows.append({
+            'venue_name': venue,
+            'date': day,
+            'guests': guests,
+            'city': rows[0].city,
+            'slot_count': len(rows),
+            'available_count': len(available),
+            'earliest_minutes': earliest[0],
+            'earliest_time': earliest[1],
+            'latest_minutes': latest[0],
+            'latest_time': latest[1],
+            'min_price': cheapest[0],
+            'min_price_label': cheapest[1],
+            'updated_at': now,
+        })
+    
+    db.session.execute(
+        summaries.delete().where(and_(
+            summaries.c.venue_name == bindparam('_venue_name'),
+            summaries.c.date == bindparam('_date'),
+            summaries.c.guests == bindparam('_guests'),
+        )),
+        [{'_venue_name': venue, '_date': day, '_guests': guests} for venue, day, guests in partitions]
+    )
+    if new_rows:
+        db.session.execute(summaries.insert(), new_rows)
+    return len(new_rows)
+
+
+def rebuild_availability_summaries(batch_size=500):
+    """Build summaries for every partition if the table is empty (first deploy)"""
+    logger = logging.getLogger(__name__)
+    if db.session.query(AvailabilitySummary.venue_name).first() is not None:
+        return 0
+    partitions = [
+        tuple(p) for p in db.session.query(
+            AvailabilitySlot.venue_name, AvailabilitySlot.date, AvailabilitySlot.guests
+        ).filter(AvailabilitySlot.removed_at.is_(None)).distinct()
+    ]
+    built = 0
+    try:
+        for start in range(0, len(partitions), batch_size):
+            batch = partitions[start:start + batch_size]
+            
+            def _rebuild_batch():
+                count = refresh_availability_summaries(batch)
+                db.session.commit()
+                return count
+            
+            built += retry_db_operation(_rebuild_batch)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"[SUMMARY] Error building availability summaries: {e}")
+    if built:
+        logger.info(f"[SUMMARY] Built {built} availability summaries")
+    return built
+
+
 def save_slot_to_db(venue_name, date_str, time, price, status, guests, city, venue_specific_data=None, booking_url=None):
     """Save or update availability slot in database with retry logic for lock errors"""
     def _save_operation():
@@ -388,21 +574,33 @@ def save_slot_to_db(venue_name, date_str, time, price, status, guests, city, ven
         ).first()
         
         if existing:
+            existing.start_minutes = parse_start_minutes(time)
             existing.price = price
+            for column, value in normalize_price(price, existing.city).items():
+                setattr(existing, column, value)
             existing.status = status
+            existing.removed_at = None
             existing.last_updated = datetime.utcnow()
             if effective_booking_url and existing.booking_url != effective_booking_url:
                 existing.booking_url = effective_booking_url
             if venue_specific_data:
                 existing.set_venue_specific_data(venue_specific_data)
+            existing.refresh_json_fragment()
+            existing.change_version = next_change_version()
+            refresh_availability_summaries({(venue_name, date_obj, guests)})
             db.session.commit()
+            slot_events.publish([slot_events.slot_event(
+                'update', venue_name, date_obj, time, guests, existing.city, slot=existing.to_dict()
+            )])
             return existing
         else:
             slot = AvailabilitySlot(
                 venue_name=venue_name,
                 date=date_obj,
                 time=time,
+                start_minutes=parse_start_minutes(time),
                 price=price,
+                **normalize_price(price, city),
                 status=status,
                 guests=guests,
                 city=city,
@@ -412,8 +610,14 @@ def save_slot_to_db(venue_name, date_str, time, price, status, guests, city, ven
             )
             if venue_specific_data:
                 slot.set_venue_specific_data(venue_specific_data)
+            slot.refresh_json_fragment()
+            slot.change_version = next_change_version()
             db.session.add(slot)
+            refresh_availability_summaries({(venue_name, date_obj, guests)})
             db.session.commit()
+            slot_events.publish([slot_events.slot_event(
+                'insert', venue_name, date_obj, time, guests, city, slot=slot.to_dict()
+            )])
             return slot
     
     try:
@@ -425,6 +629,251 @@ def save_slot_to_db(venue_name, date_str, time, price, status, guests, city, ven
         return None
 
 
+def _slot_key(row):
+    return (row['venue_name'], row['date'], row['time'], row['guests'])
+
+
+def save_slots_bulk(slots, snapshot=None):
+    """Write a batch of slots in a single transaction, touching only rows that changed.
+
+    Each slot is a dict with the save_slot_to_db fields (venue_name, date, time,
+    price, status, guests, city, venue_specific_data, booking_url). Duplicate keys
+    within the batch keep the last item. New and changed slots are written with
+    INSERT ... ON CONFLICT (venue_name, date, time, guests) DO UPDATE; unchanged
+    rows are left alone. Written rows get their json_fragment recomputed from the
+    values they end up with. All rows written or marked removed by one call share
+    a new change_version, and the AvailabilitySummary rows of the partitions they
+    touch are recomputed in the same transaction. After the commit, insert/update/delete events for the
+    changed rows are published through slot_events.
+
+    Args:
+        slots: List of slot dicts
+        snapshot: Optional iterable of (venue_name, date, guests) partitions the
+            batch is authoritative for. Stored rows in those partitions that are
+            missing from the batch get removed_at set; rows that reappear have it
+            cleared.
+
+    Returns:
+        Dict with 'inserted', 'updated', 'unchanged' and 'removed' counts plus
+        'changed_partitions', the (city, date, guests) partitions whose rows changed;
+        or None if the batch could not be written (the caller can fall back to
+        save_slot_to_db)
+    """
+    logger = logging.getLogger(__name__)
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        logger.warning(f"[BULK_SAVE] Upsert not supported for dialect {dialect}")
+        return None
+
+    def _to_date(value):
+        return datetime.strptime(value, "%Y-%m-%d").date() if isinstance(value, str) else value
+
+    now = datetime.utcnow()
+    rows = {}
+    for slot in slots:
+        date_value = slot.get('date')
+        try:
+            date_obj = _to_date(date_value)
+        except ValueError:
+            logger.warning(f"[BULK_SAVE] Skipping slot with invalid date {date_value!r} for {slot.get('venue_name')}")
+            continue
+        if not date_obj:
+            continue
+        venue_specific = slot.get('venue_specific_data')
+        if isinstance(venue_specific, dict):
+            venue_specific = json.dumps(venue_specific) if venue_specific else None
+        row = {
+            'venue_name': slot['venue_name'],
+            'date': date_obj,
+            'time': slot.get('time', ''),
+            'start_minutes': parse_start_minutes(slot.get('time', '')),
+            'price': slot.get('price', ''),
+            **normalize_price(slot.get('price', ''), slot['city']),
+            'status': slot.get('status', 'Available'),
+            'guests': slot['guests'],
+            'city': slot['city'],
+            'booking_url': get_booking_url_for_venue(slot['venue_name'], slot.get('booking_url')),
+            'venue_specific_data': venue_specific or None,
+            'timestamp': now,
+            'last_updated': now,
+            'removed_at': None,
+        }
+        rows[_slot_key(row)] = row
+
+    partitions = {(venue, _to_date(day), guests) for venue, day, guests in (snapshot or [])}
+
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'removed': 0, 'changed_partitions': set()}
+    if not rows and not partitions:
+        return counts
+
+    table = AvailabilitySlot.__table__
+    stmt = dialect_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['venue_name', 'date', 'time', 'guests'],
+        set_={
+            'start_minutes': stmt.excluded.start_minutes,
+            'price': stmt.excluded.price,
+            'price_amount': stmt.excluded.price_amount,
+            'price_currency': stmt.excluded.price_currency,
+            'price_basis': stmt.excluded.price_basis,
+            'status': stmt.excluded.status,
+            'booking_url': func.coalesce(stmt.excluded.booking_url, table.c.booking_url),
+            'venue_specific_data': func.coalesce(stmt.excluded.venue_specific_data, table.c.venue_specific_data),
+            'last_updated': stmt.excluded.last_updated,
+            'json_fragment': stmt.excluded.json_fragment,
+            'change_version': stmt.excluded.change_version,
+            'removed_at': None,
+        }
+    )
+
+    events = []
+    
+    def _bulk_operation():
+        counts.update(inserted=0, updated=0, unchanged=0, removed=0, changed_partitions=set())
+        del events[:]
+        scope = set(partitions) | {(key[0], key[1], key[3]) for key in rows}
+        existing = {}
+        query = db.session.query(
+            table.c.id, table.c.venue_name, table.c.date, table.c.time, table.c.guests, table.c.city,
+            table.c.price, table.c.status, table.c.booking_url, table.c.venue_specific_data,
+            table.c.timestamp, table.c.removed_at
+        ).filter(
+            table.c.venue_name.in_({p[0] for p in scope}),
+            table.c.date.in_({p[1] for p in scope}),
+            table.c.guests.in_({p[2] for p in scope}),
+        )
+        for r in query:
+            existing[(r.venue_name, r.date, r.time, r.guests)] = r
+
+        to_write = []
+        for key, row in rows.items():
+            current = existing.get(key)
+            if current is None:
+                counts['inserted'] += 1
+                op = 'insert'
+                written = row
+            elif (current.removed_at is not None or current.price != row['price'] or current.status != row['status']
+                  or (row['booking_url'] and current.booking_url != row['booking_url'])
+                  or (row['venue_specific_data'] and current.venue_specific_data != row['venue_specific_data'])):
+                counts['updated'] += 1
+                op = 'update'
+                # Mirror the ON CONFLICT coalesce so the fragment matches the stored row
+                written = dict(
+                    row,
+                    booking_url=row['booking_url'] or current.booking_url,
+                    venue_specific_data=row['venue_specific_data'] or current.venue_specific_data,
+                    timestamp=current.timestamp,
+                )
+            else:
+                counts['unchanged'] += 1
+                continue
+            fields = slot_api_fields(**written)
+            to_write.append(dict(row, json_fragment=dumps_json(fields)))
+            events.append(slot_events.slot_event(op, row['venue_name'], row['date'], row['time'], row['guests'], row['city'], slot=fields))
+            counts['changed_partitions'].add((row['city'], row['date'], row['guests']))
+
+        gone = [
+            r for key, r in existing.items()
+            if key not in rows and r.removed_at is None and (key[0], key[1], key[3]) in partitions
+        ]
+        gone_ids = [r.id for r in gone]
+        counts['removed'] = len(gone_ids)
+        counts['changed_partitions'].update((r.city, r.date, r.guests) for r in gone)
+        events.extend(slot_events.slot_event('delete', r.venue_name, r.date, r.time, r.guests, r.city) for r in gone)
+
+        if to_write or gone_ids:
+            version = next_change_version()
+        if to_write:
+            db.session.execute(stmt, [dict(row, change_version=version) for row in to_write])
+        if gone_ids:
+            db.session.execute(
+                table.update().where(table.c.id.in_(gone_ids)).values(
+                    removed_at=now, last_updated=now, change_version=version
+                )
+            )
+        refresh_availability_summaries(
+            {(row['venue_name'], row['date'], row['guests']) for row in to_write}
+            | {(r.venue_name, r.date, r.guests) for r in gone}
+        )
+        db.session.commit()
+        return counts
+
+    try:
+        result = retry_db_operation(_bulk_operation)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"[BULK_SAVE] Error saving {len(rows)} slots after retries: {e}")
+        return None
+    slot_events.publish(events)
+    return result
+
+
+def backfill_slot_json_fragments(batch_size=1000):
+    """Fill json_fragment (and the normalized price / start_minutes columns) for rows that lack it.
+
+    Covers rows written before these columns existed. Rows without a stored
+    booking URL get the resolved one, as save_slot_to_db would store.
+    last_updated is passed through so the update doesn't bump it.
+    """
+    logger = logging.getLogger(__name__)
+    table = AvailabilitySlot.__table__
+    stmt = table.update().where(table.c.id == bindparam('_id')).values(
+        json_fragment=bindparam('_json_fragment'),
+        booking_url=bindparam('_booking_url'),
+        price_amount=bindparam('_price_amount'),
+        price_currency=bindparam('_price_currency'),
+        price_basis=bindparam('_price_basis'),
+        start_minutes=bindparam('_start_minutes'),
+        last_updated=bindparam('_last_updated'),
+    )
+    
+    def _backfill_batch():
+        slots = AvailabilitySlot.query.filter(AvailabilitySlot.json_fragment.is_(None)).limit(batch_size).all()
+        params = []
+        for slot in slots:
+            columns = slot._column_values()
+            columns['booking_url'] = get_booking_url_for_venue(slot.venue_name, slot.booking_url)
+            columns.update(normalize_price(slot.price, slot.city))
+            columns['start_minutes'] = parse_start_minutes(slot.time)
+            params.append({
+                '_id': slot.id,
+                '_json_fragment': slot_json_fragment(**columns),
+                '_booking_url': columns['booking_url'],
+                '_price_amount': columns['price_amount'],
+                '_price_currency': columns['price_currency'],
+                '_price_basis': columns['price_basis'],
+                '_start_minutes': columns['start_minutes'],
+                '_last_updated': slot.last_updated,
+            })
+        if params:
+            db.session.execute(stmt, params)
+        db.session.commit()
+        return len(params)
+    
+    filled = 0
+    try:
+        while True:
+            count = retry_db_operation(_backfill_batch)
+            filled += count
+            if count < batch_size:
+                break
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"[BACKFILL] Error filling slot JSON fragments: {e}")
+    if filled:
+        logger.info(f"[BACKFILL] Filled json_fragment for {filled} slots")
+    return filled
+
+
+if slot_rows_need_backfill:
+    with app.app_context():
+        backfill_slot_json_fragments()
+
+
 def update_task_status(task_id, status=None, progress=None, current_venue=None, total_slots=None, error=None):
     """Update scraping task status in database with retry logic for lock errors"""
     def _update_operation():
@@ -443,6 +892,7 @@ def update_task_status(task_id, status=None, progress=None, current_venue=None,
             if status in ['SUCCESS', 'FAILURE']:
                 task.completed_at = datetime.utcnow()
             db.session.commit()
+            slot_events.publish_task(task.to_dict())
             return True
         return False
     
@@ -455,8 +905,17 @@ def update_task_status(task_id, status=None, progress=None, current_venue=None,
         return False
 
 
-def run_scraper_and_save_to_db(scraper_func, venue_name, city, guests, *args, task_id=None, **kwargs):
-    """Run scraper function and save results to database"""
+def run_scraper_and_save_to_db(scraper_func, venue_name, city, guests, *args, task_id=None, snapshot_dates=None, snapshot_empty=True, **kwargs):
+    """Run scraper function and save results to database
+
+    If snapshot_dates is given, the results are treated as the complete availability
+    for those dates (for venue_name and every venue in the results, at this guest
+    count): stored slots the scrape no longer returns are marked removed. Only pass
+    it when the scraper covers whole days, not a selected time or option, and
+    raises when a page or API call fails instead of returning no slots for it.
+    Scrapers that still return [] for a page that did not load pass
+    snapshot_empty=False, so an empty result from them is not applied.
+    """
     logger = logging.getLogger(__name__)
     
     print(f"[SCRAPER] Starting scraper for {venue_name} (city: {city}, guests: {guests})", flush=True)
@@ -481,6 +940,7 @@ def run_scraper_and_save_to_db(scraper_func, venue_name, city, guests, *args, ta
     
     logger.info(f"[SCRAPER] {venue_name}: Found {len(results)} items, saving to database...")
     
+    slots = []
     for item in results:
         item_venue_name = item.get('website', venue_name)
         item_city = city
@@ -493,29 +953,182 @@ def run_scraper_and_save_to_db(scraper_func, venue_name, city, guests, *args, ta
         booking_url = item.get('booking_url') or VENUE_BOOKING_URLS.get(item_venue_name) or VENUE_BOOKING_URLS.get(venue_name)
         venue_specific = item.get('venue_specific_data') if isinstance(item.get('venue_specific_data'), dict) else item.get('venue_specific_data')
         
-        saved = save_slot_to_db(
-            venue_name=item_venue_name,
-            date_str=item.get('date', ''),
-            time=item.get('time', ''),
-            price=item.get('price', ''),
-            status=item.get('status', 'Available'),
-            guests=guests,
-            city=item_city,
-            venue_specific_data=venue_specific,
-            booking_url=booking_url
-        )
-        if saved:
-            slots_saved += 1
+        slots.append({
+            'venue_name': item_venue_name,
+            'date': item.get('date', ''),
+            'time': item.get('time', ''),
+            'price': item.get('price', ''),
+            'status': item.get('status', 'Available'),
+            'guests': guests,
+            'city': item_city,
+            'venue_specific_data': venue_specific,
+            'booking_url': booking_url
+        })
+    
+    sync_venue_metadata({slot['venue_name'] for slot in slots})
+    
+    snapshot = None
+    if snapshot_dates and not slots and not snapshot_empty:
+        logger.info(f"[SCRAPER] {venue_name}: Empty result, keeping stored slots for {len(snapshot_dates)} date(s)")
+    elif snapshot_dates:
+        snapshot_venues = {venue_name} | {slot['venue_name'] for slot in slots}
+        snapshot = [(venue, day, guests) for venue in snapshot_venues for day in snapshot_dates]
+    
+    counts = save_slots_bulk(slots, snapshot=snapshot)
+    if counts is not None:
+        slots_saved = counts['inserted'] + counts['updated'] + counts['unchanged']
+        logger.info(f"[SCRAPER] {venue_name}: {counts['inserted']} inserted, {counts['updated']} updated, {counts['unchanged']} unchanged, {counts['removed']} removed")
+        if counts['changed_partitions']:
+            response_cache.bump_partitions(counts['changed_partitions'])
+            refresh_scheduler.note_changed_dates({day for _, day, _ in counts['changed_partitions']})
+    else:
+        # Batch write failed; fall back to saving slot by slot
+        logger.warning(f"[SCRAPER] {venue_name}: Bulk save failed, saving slots individually")
+        for slot in slots:
+            saved = save_slot_to_db(
+                venue_name=slot['venue_name'],
+                date_str=slot['date'],
+                time=slot['time'],
+                price=slot['price'],
+                status=slot['status'],
+                guests=slot['guests'],
+                city=slot['city'],
+                venue_specific_data=slot['venue_specific_data'],
+                booking_url=slot['booking_url']
+            )
+            if saved:
+                slots_saved += 1
+        if slots_saved:
+            response_cache.bump_partitions({(slot['city'], slot['date'], slot['guests']) for slot in slots if slot['date']})
+            refresh_scheduler.note_changed_dates({slot['date'] for slot in slots if slot['date']})
     
     logger.info(f"[SCRAPER] {venue_name}: Successfully saved {slots_saved} slots to database")
     
     return slots_saved
 
 
+def record_refresh_results(website, guests, dates, changed_dates, success, reused_at=None):
+    """Fold a finished scrape of website × guests × dates into RefreshState (see refresh_scheduler).
+    reused_at marks a result reused from an identical scrape that finished at that time."""
+    logger = logging.getLogger(__name__)
+    days = sorted({datetime.strptime(d, '%Y-%m-%d').date() if isinstance(d, str) else d for d in dates if d})
+    if not days:
+        return
+    
+    def _record_operation():
+        now = datetime.utcnow()
+        try:
+            states = {
+                state.date: state
+                for state in RefreshState.query.filter(
+                    RefreshState.website == website,
+                    RefreshState.guests == guests,
+                    RefreshState.date.in_(days)
+                )
+            }
+            for day in days:
+                state = states.get(day)
+                if state is None:
+                    state = RefreshState(website=website, date=day, guests=guests, scrape_count=0, failure_count=0)
+                    db.session.add(state)
+                if reused_at:
+                    refresh_scheduler.apply_reused(state, reused_at, now)
+                elif success:
+                    refresh_scheduler.apply_outcome(state, day.isoformat() in changed_dates, now)
+                else:
+                    refresh_scheduler.apply_failure(state, now)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    
+    try:
+        retry_db_operation(_record_operation)
+    except Exception as e:
+        logger.warning(f"[REFRESH] Could not record refresh state for {website} (guests: {guests}): {e}")
+
+
+def record_refresh_cycle_task(cycle_id, success):
+    """Count a finished sweep task; starts the next cycle once enough of this one is done (see refresh_cycles)"""
+    if not cycle_id:
+        return
+    status = refresh_cycles.record_task_done(cycle_id, success)
+    if status:
+        logging.getLogger(__name__).info(
+            f"[REFRESH] Cycle {cycle_id}: {status['done']} done, {status['failed']} failed of {status['total']} tasks. Starting next cycle..."
+        )
+        trigger_next_refresh_cycle.delay(venues_filter=status['venues_filter'])
+
+
+def finish_coalesced_scrape(dedup_key, owner_id, success, slots_found=0, error=None):
+    """Release a scrape's dedup lease and copy its outcome to the tasks attached to it (see task_dedup)"""
+    for waiter_id in task_dedup.finish(dedup_key, owner_id, success, slots_found):
+        if success:
+            update_task_status(waiter_id, status='SUCCESS', progress=f'Scraping completed by task {owner_id}! Found {slots_found} slots', total_slots=slots_found)
+        else:
+            update_task_status(waiter_id, status='FAILURE', error=error or f'Scrape by task {owner_id} failed')
+
+
+def count_slots_by_date(venue_name, guests, dates):
+    """Stored (not removed) slots per date for one venue and guest count, as {'YYYY-MM-DD': count}"""
+    days = [datetime.strptime(d, "%Y-%m-%d").date() for d in dates]
+    try:
+        rows = db.session.query(AvailabilitySlot.date, func.count(AvailabilitySlot.id)).filter(
+            AvailabilitySlot.venue_name == venue_name,
+            AvailabilitySlot.guests == guests,
+            AvailabilitySlot.date.in_(days),
+            AvailabilitySlot.removed_at.is_(None)
+        ).group_by(AvailabilitySlot.date).all()
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"[SCRAPER] Could not count slots for {venue_name}: {e}")
+        return {}
+    return {day.isoformat(): count for day, count in rows}
+
+
+def find_coalescable_scrape(dedup_key, task_id):
+    """Recent result for dedup_key, or the running scrape with task_id attached to it; None if neither"""
+    for _ in range(2):
+        existing = task_dedup.lookup(dedup_key)
+        if not existing or existing['state'] == 'recent':
+            return existing
+        owner_id = task_dedup.attach(dedup_key, task_id)
+        if owner_id:
+            return dict(existing, task_id=owner_id)
+    return None
+
+
 # Import scrapers
 from scrapers import swingers, electric_shuffle, lawn_club, spin, five_iron_golf, lucky_strike, easybowl
 from scrapers import fair_game, clays_bar, puttshack, flight_club_darts, f1_arcade, topgolfchigwell, tsquaredsocial, daysmart, hijingo, pingpong, puttery, kick_axe, allstarlanes_bowling
 
+# Venues whose scrapers can return a whole date window in one run. Each range
+# scraper takes (guests, dates) and returns items carrying their own 'date', so
+# the refresh cycle schedules one task per venue × guests × window instead of
+# one per day.
+# website -> (range scraper function, venue name, city)
+RANGE_SCRAPERS = {
+    'swingers_nyc': (swingers.scrape_swingers_range, 'Swingers (Nomad)', 'NYC'),
+    'swingers_london': (swingers.scrape_swingers_uk_range, 'Swingers (Oxford Circus)', 'London'),
+    'electric_shuffle_nyc': (electric_shuffle.scrape_electric_shuffle_range, 'Electric Shuffle (Nomad)', 'NYC'),
+    'fair_game_canary_wharf': (fair_game.scrape_fair_game_canary_wharf_range, 'Fair Game (Canary Wharf)', 'London'),
+    'fair_game_city': (fair_game.scrape_fair_game_city_range, 'Fair Game (City)', 'London'),
+    'topgolf_chigwell': (topgolfchigwell.scrape_topgolf_chigwell_range, 'Topgolf (Chigwell)', 'London'),
+    'hijingo': (hijingo.scrape_hijingo_range, 'Hijingo (Shoreditch)', 'London'),
+    'pingpong': (pingpong.scrape_pingpong_range, 'Bounce (Farringdon)', 'London'),
+}
+
+# Number of consecutive dates handed to one range task during a refresh cycle
+RANGE_WINDOW_DAYS = int(os.getenv('RANGE_WINDOW_DAYS', '30'))
+
+# Guest counts covered by background refreshes
+REFRESH_GUEST_COUNTS = list(range(2, 9))  # [2, 3, 4, 5, 6, 7, 8]
+
+# Venues that only support specific guest counts
+# daysmart_chelsea only supports 2 guests
+VENUE_GUEST_RESTRICTIONS = {
+    'daysmart_chelsea': [2]  # Only scrape for 2 guests
+}
+
 # Flask Routes
 @app.route('/')
 def index():
@@ -748,6 +1361,27 @@ def run_scraper():
         'f1_experience': f1_experience
     }
     
+    if website not in ('all_new_york', 'all_london'):
+        # An identical scrape is running or just finished: follow that one instead of starting another
+        existing = find_coalescable_scrape(task_dedup.scrape_key(website, target_date, guests, options), task_id)
+        if existing and existing['state'] == 'recent':
+            slots_found = existing.get('slots_found', 0)
+            update_task_status(task_id, status='SUCCESS', progress=f"Reused results from {existing['age_seconds']:.0f}s ago: found {slots_found} slots", total_slots=slots_found)
+            return jsonify({
+                'message': 'Recent results reused',
+                'task_id': task_id,
+                'deduplicated': 'recent',
+                'attached_to': existing['task_id']
+            })
+        if existing:
+            update_task_status(task_id, status='STARTED', progress=f"Attached to identical scrape in progress (task {existing['task_id']})")
+            return jsonify({
+                'message': 'Identical scrape already in progress',
+                'task_id': task_id,
+                'deduplicated': 'in_flight',
+                'attached_to': existing['task_id']
+            })
+    
     if website == 'all_new_york':
         result = scrape_all_venues_task.delay('NYC', guests, target_date, task_id, options)
     elif website == 'all_london':
@@ -915,10 +1549,530 @@ def get_status():
         'website': ''
     })
 
+@app.route('/api/metrics/wal')
+def wal_metrics():
+    """WAL size and background checkpoint statistics for this web process"""
+    if db.engine.dialect.name != 'sqlite':
+        return jsonify({'enabled': False, 'reason': f'database is {db.engine.dialect.name}'})
+    manager = get_checkpoint_manager(db.engine, db_file_path, start=False)
+    return jsonify(dict(manager.stats(), enabled=WAL_CHECKPOINT_ENABLED))
+
+
+@app.route('/api/metrics/cache')
+def cache_metrics():
+    """/api/data response cache statistics for this web process"""
+    return jsonify(dict(response_cache.response_lru.stats(), enabled=response_cache.RESPONSE_CACHE_ENABLED))
+
+
+@app.route('/api/metrics/refresh')
+def refresh_metrics():
+    """Adaptive refresh scheduler state: tracked keys, overdue, in flight, backing off"""
+    from datetime import date
+    today = date.today()
+    now = datetime.utcnow()
+    states = RefreshState.query.filter(RefreshState.date >= today).all()
+    overdue = [state for state in states if refresh_scheduler.staleness(state, state.date, today, now) >= 1]
+    rates = [state.change_rate for state in states if state.change_rate is not None]
+    return jsonify({
+        'mode': refresh_scheduler.REFRESH_MODE,
+        'tracked_keys': len(states),
+        'overdue': len(overdue),
+        'in_flight': sum(1 for state in states if refresh_scheduler.is_in_flight(state, now)),
+        'backing_off': sum(1 for state in states if refresh_scheduler.is_backing_off(state, now)),
+        'mean_change_rate': round(sum(rates) / len(rates), 3) if rates else None,
+        'budget_per_minute': refresh_scheduler.REFRESH_BUDGET_PER_MINUTE,
+        'horizon_days': refresh_scheduler.REFRESH_HORIZON_DAYS,
+        'sweep_cycle': refresh_cycles.cycle_status()
+    })
+
+
+@app.route('/api/metrics/rate_limits')
+def rate_limit_metrics():
+    """Per-platform scrape limits: running scrapes, throttle pauses and strikes"""
+    platforms = rate_limiter.stats()
+    return jsonify({'enabled': rate_limiter.RATE_LIMIT_ENABLED and platforms is not None, 'platforms': platforms or {}})
+
+
+@app.route('/api/events')
+def slot_event_stream():
+    """Server-Sent Events feed of slot changes and task progress.
+
+    Query params (all optional): city, date_from, date_to (YYYY-MM-DD), guests,
+    task_id. Event types: slot (op insert/update/delete), task, purge.
+    """
+    try:
+        guests = request.args.get('guests', type=int)
+        filters = {
+            'city': normalize_city(request.args['city']) if request.args.get('city') else None,
+            'date_from': datetime.strptime(request.args['date_from'], "%Y-%m-%d").date().isoformat() if request.args.get('date_from') else None,
+            'date_to': datetime.strptime(request.args['date_to'], "%Y-%m-%d").date().isoformat() if request.args.get('date_to') else None,
+            'guests': guests,
+            'task_id': request.args.get('task_id') or None,
+        }
+    except ValueError as e:
+        return jsonify({'error': f'Invalid date filter: {e}. Expected YYYY-MM-DD'}), 400
+    
+    try:
+        events = slot_events.stream_events(filters)
+    except RuntimeError as e:
+        return jsonify({'error': f'Event stream unavailable: {e}'}), 503
+    
+    response = Response(stream_with_context(events), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@app.route('/api/debug/data_diagnostics')
+def data_diagnostics():
+    """Opt-in database diagnostics for when /api/data unexpectedly returns nothing.
+
+    Optional query params: city, guests, checkpoint=truncate (forces a TRUNCATE
+    checkpoint first, which waits for readers and writers).
+    """
+    logger = logging.getLogger(__name__)
+    city = request.args.get('city')
+    guests = request.args.get('guests')
+    diagnostics = {
+        'database_uri': app.config.get('SQLALCHEMY_DATABASE_URI', 'unknown'),
+        'engine_url': str(db.engine.url),
+    }
+    try:
+        if db.engine.dialect.name == 'sqlite':
+            diagnostics['file'] = {
+                'path': db_file_path,
+                'exists': os.path.exists(db_file_path),
+                'size': os.path.getsize(db_file_path) if os.path.exists(db_file_path) else 0,
+                'wal_size': wal_file_size(db_file_path),
+                'shm_exists': os.path.exists(db_file_path + '-shm'),
+            }
+            if request.args.get('checkpoint', '').lower() == 'truncate':
+                manager = get_checkpoint_manager(db.engine, db_file_path, start=False)
+                diagnostics['checkpoint'] = manager.checkpoint('TRUNCATE')
+        
+        with db.engine.connect() as conn:
+            diagnostics['direct_count'] = conn.execute(text("SELECT COUNT(*) FROM availability_slots")).scalar()
+            if db.engine.dialect.name == 'sqlite':
+                diagnostics['journal_mode'] = conn.execute(text("PRAGMA journal_mode")).scalar()
+            diagnostics['counts_by_city_guests'] = [
+                list(row) for row in conn.execute(text(
+                    "SELECT city, guests, COUNT(*) FROM availability_slots GROUP BY city, guests ORDER BY city, guests"
+                ))
+            ]
+        
+        diagnostics['removed_count'] = AvailabilitySlot.query.filter(AvailabilitySlot.removed_at.isnot(None)).count()
+        sample_slots = AvailabilitySlot.query.limit(10).all()
+        diagnostics['sample'] = {
+            'cities': sorted({slot.city for slot in sample_slots}),
+            'venues': sorted({slot.venue_name for slot in sample_slots})[:5],
+            'guests': sorted({slot.guests for slot in sample_slots}),
+        }
+        if city:
+            city_value = 'NYC' if city.upper() in ['NEW YORK', 'NY', 'NYC'] else 'London' if city.upper() == 'LONDON' else city
+            diagnostics['city_filter_count'] = AvailabilitySlot.query.filter(AvailabilitySlot.city == city_value).count()
+        if guests:
+            try:
+                diagnostics['guests_filter_count'] = AvailabilitySlot.query.filter(AvailabilitySlot.guests == int(guests)).count()
+            except ValueError:
+                pass
+        return jsonify(diagnostics)
+    except Exception as e:
+        logger.error(f"[API DEBUG] Diagnostics failed: {e}", exc_info=True)
+        diagnostics['error'] = str(e)
+        return jsonify(diagnostics), 500
+
+
+# Venue name to neighborhood mapping (simplified version of frontend metadata)
+VENUE_NEIGHBORHOODS = {
+    # NYC venues
+    'Swingers (Nomad)': 'Midtown',
+    'Electric Shuffle (Nomad)': 'Midtown',
+    'Puttery (Meatpacking)': 'Downtown',
+    'Five Iron Golf (Financial District)': 'Downtown',
+    'Five Iron Golf (Flatiron)': 'Midtown',
+    'Five Iron Golf (Midtown East)': 'Midtown',
+    'Five Iron Golf (Herald Square)': 'Midtown',
+    'Five Iron Golf (Long Island City)': 'Brooklyn/Queens',
+    'Five Iron Golf (Upper East Side)': 'Uptown',
+    'Five Iron Golf (Rockefeller Center)': 'Midtown',
+    'SPIN (Flatiron)': 'Midtown',
+    'SPIN (Midtown East)': 'Midtown',
+    'T-Squared Social (Midtown East)': 'Midtown',
+    'Lucky Strike (Times Square)': 'Midtown',
+    'Lucky Strike (Chelsea Piers)': 'Midtown',
+    'The Lawn Club (Financial District)': 'Downtown',
+    'The Lawn Club (Croquet Lawns)': 'Downtown',
+    'The Lawn Club (Curling Lawns)': 'Downtown',
+    'The Lawn Club (Indoor Gaming)': 'Downtown',
+    'Kick Axe (Brooklyn)': 'Brooklyn/Queens',
+    'Chelsea Piers (Chelsea)': 'Midtown',
+    # London venues
+    'Puttshack (Bank)': 'The City',
+    'Swingers (Oxford Circus)': 'West End',
+    'Flight Club Darts (Shoreditch)': 'The City',
+    'Flight Club Darts (Bloomsbury)': 'West End',
+    'Flight Club Darts (Victoria)': 'Westminster',
+    'Flight Club Darts (Angel)': 'The City',
+    'Electric Shuffle (Canary Wharf)': 'Canary Wharf',
+    'Electric Shuffle (London Bridge)': 'The City',
+    'Electric Shuffle (King\'s Cross)': None,
+    'Clays Bar (Canary Wharf)': 'Canary Wharf',
+    'Clays Bar (The City)': 'The City',
+    'Clays Bar (Soho)': 'West End',
+    'F1 Arcade (St Paul\'s)': 'The City',
+    'Fair Game (Canary Wharf)': 'Canary Wharf',
+    'Fair Game (City)': 'The City',
+    'Bounce (Farringdon)': 'The City',
+    'Bounce (Shoreditch)': 'The City',
+    'All Star Lanes (Holborn)': 'West End',
+    'All Star Lanes (Shoreditch)': 'The City',
+    'Hijingo (Shoreditch)': 'The City',
+    'Topgolf (Chigwell)': None,
+}
+
+
+def get_venue_neighborhood(venue_name):
+    """Neighborhood for a venue, tolerating slight variations in the venue name"""
+    neighborhood = VENUE_NEIGHBORHOODS.get(venue_name)
+    if not neighborhood:
+        for mapped_venue, mapped_neighborhood in VENUE_NEIGHBORHOODS.items():
+            if mapped_venue.lower() in venue_name.lower() or venue_name.lower() in mapped_venue.lower():
+                return mapped_neighborhood
+    return neighborhood
+
+
+_synced_venue_names = set()
+
+
+def sync_venue_metadata(venue_names=None):
+    """Make sure venue_metadata has a row (with neighborhood) for each venue name.
+
+    Names in VENUE_NEIGHBORHOODS always take the mapped neighborhood; other names
+    get a fuzzy match once, when their row is created. With no argument, every
+    mapped venue and every venue name present in availability_slots is synced.
+    """
+    logger = logging.getLogger(__name__)
+    if venue_names is None:
+        names = set(VENUE_NEIGHBORHOODS) | {v for (v,) in db.session.query(AvailabilitySlot.venue_name.distinct())}
+    else:
+        names = set(venue_names) - _synced_venue_names
+    if not names:
+        return 0
+
+    def _sync_operation():
+        existing = {m.venue_name: m for m in VenueMetadata.query.filter(VenueMetadata.venue_name.in_(names))}
+        changed = 0
+        for name in names:
+            row = existing.get(name)
+            if row is None:
+                db.session.add(VenueMetadata(venue_name=name, neighborhood=get_venue_neighborhood(name)))
+                changed += 1
+            elif name in VENUE_NEIGHBORHOODS and row.neighborhood != VENUE_NEIGHBORHOODS[name]:
+                row.neighborhood = VENUE_NEIGHBORHOODS[name]
+                changed += 1
+        db.session.commit()
+        return changed
+
+    try:
+        changed = retry_db_operation(_sync_operation)
+        _synced_venue_names.update(names)
+        if changed:
+            logger.info(f"[VENUE_METADATA] Synced {changed} venue(s)")
+        return changed
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"[VENUE_METADATA] Could not sync venue metadata: {e}")
+        return 0
+
+
+with app.app_context():
+    sync_venue_metadata()
+
+
+def slot_to_api_dict(slot):
+    """Serialize a slot for the data API, filling in a booking URL if none was stored"""
+    slot_dict = slot.to_dict()
+    if not slot_dict.get('booking_url'):
+        slot_dict['booking_url'] = get_booking_url_for_venue(slot_dict.get('venue_name'))
+    return slot_dict
+
+
+# Columns the data API reads: the sort key (for cursors) and the pre-serialized row
+SLOT_JSON_COLUMNS = (
+    AvailabilitySlot.id,
+    AvailabilitySlot.date,
+    AvailabilitySlot.time,
+    AvailabilitySlot.start_minutes,
+    AvailabilitySlot.venue_name,
+    AvailabilitySlot.json_fragment,
+)
+
+
+# Columns read for the columnar / msgpack formats
+SLOT_COLUMNAR_COLUMNS = (
+    AvailabilitySlot.id,
+    AvailabilitySlot.venue_name,
+    AvailabilitySlot.city,
+    AvailabilitySlot.date,
+    AvailabilitySlot.time,
+    AvailabilitySlot.start_minutes,
+    AvailabilitySlot.price,
+    AvailabilitySlot.price_amount,
+    AvailabilitySlot.price_currency,
+    AvailabilitySlot.price_basis,
+    AvailabilitySlot.status,
+    AvailabilitySlot.guests,
+    AvailabilitySlot.booking_url,
+    AvailabilitySlot.venue_specific_data,
+    AvailabilitySlot.timestamp,
+    AvailabilitySlot.last_updated,
+)
+
+
+def slot_row_json(row):
+    """API JSON text for a row selected with SLOT_JSON_COLUMNS.
+
+    Rows written before json_fragment existed are loaded and serialized on the fly.
+    """
+    if row.json_fragment:
+        return slot_json(row.id, row.json_fragment)
+    return dumps_json(slot_to_api_dict(db.session.get(AvailabilitySlot, row.id)))
+
+
+def slot_json_response(items, key='data', **meta):
+    """{key: [...], **meta} built from already-serialized items"""
+    body = '{"' + key + '":[' + ','.join(items) + '],' + dumps_json(meta)[1:]
+    return Response(body, mimetype='application/json')
+
+
+# Keyset pagination for /api/data. Rows are ordered by (date DESC, start time, time,
+# venue_name, id), with unparseable times after the rest of their day; a cursor is
+# the opaque, URL-safe encoding of the last row's sort key.
+API_DATA_PAGE_SIZE = int(os.getenv('API_DATA_PAGE_SIZE', '500'))
+API_DATA_STREAM_BATCH = int(os.getenv('API_DATA_STREAM_BATCH', '1000'))
+
+
+# start_minutes with NULLs (unparseable times) sorted last
+SLOT_START_SORT = func.coalesce(AvailabilitySlot.start_minutes, 24 * 60)
+
+
+def encode_slot_cursor(slot):
+    start = slot.start_minutes if slot.start_minutes is not None else 24 * 60
+    key = [slot.date.isoformat(), start, slot.time, slot.venue_name, slot.id]
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_slot_cursor(cursor):
+    """Decode a cursor from encode_slot_cursor; raises ValueError if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        date_str, start, time_str, venue_name, slot_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.strptime(date_str, "%Y-%m-%d").date(), int(start), str(time_str), str(venue_name), int(slot_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def order_slots_for_keyset(query):
+    return query.order_by(
+        AvailabilitySlot.date.desc(),
+        SLOT_START_SORT,
+        AvailabilitySlot.time,
+        AvailabilitySlot.venue_name,
+        AvailabilitySlot.id
+    )
+
+
+def order_slots(query, sort=None):
+    """Keyset order, or cheapest first for sort=price (unpriced slots last, keyset order within)"""
+    if sort == 'price':
+        query = query.order_by(AvailabilitySlot.price_amount.is_(None), AvailabilitySlot.price_amount)
+    return order_slots_for_keyset(query)
+
+
+def apply_slot_keyset(query, cursor_key):
+    """Restrict an ordered slot query to rows after cursor_key"""
+    date_val, start_val, time_val, venue_val, id_val = cursor_key
+    return query.filter(or_(
+        AvailabilitySlot.date < date_val,
+        (AvailabilitySlot.date == date_val) & or_(
+            SLOT_START_SORT > start_val,
+            (SLOT_START_SORT == start_val) & or_(
+                AvailabilitySlot.time > time_val,
+                (AvailabilitySlot.time == time_val) & or_(
+                    AvailabilitySlot.venue_name > venue_val,
+                    (AvailabilitySlot.venue_name == venue_val) & (AvailabilitySlot.id > id_val)
+                )
+            )
+        )
+    ))
+
+
+def slot_page_response(ordered_query, page_size):
+    """One keyset page; one extra row is read to tell whether another page follows"""
+    rows = ordered_query.with_entities(*SLOT_JSON_COLUMNS).limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    
+    return slot_json_response(
+        [slot_row_json(row) for row in rows],
+        total_count=len(rows),
+        limit=page_size,
+        next_cursor=encode_slot_cursor(rows[-1]) if has_more else None
+    )
+
+
+def stream_slots_response(ordered_query, limit, response_format):
+    """Stream rows straight off the DB cursor as NDJSON or as one chunked JSON document"""
+    logger = logging.getLogger(__name__)
+    
+    def _rows():
+        sent = 0
+        for row in ordered_query.with_entities(*SLOT_JSON_COLUMNS).yield_per(API_DATA_STREAM_BATCH):
+            if limit is not None and sent >= limit:
+                return
+            try:
+                item = slot_row_json(row)
+            except Exception as e:
+                logger.error(f"Error converting slot {row.id} to dict: {e}", exc_info=True)
+                continue
+            sent += 1
+            yield item
+    
+    def _ndjson():
+        for item in _rows():
+            yield item + '\n'
+    
+    def _chunked_json():
+        yield '{"data":['
+        count = 0
+        for item in _rows():
+            yield (',' if count else '') + item
+            count += 1
+        yield '],' + dumps_json({'total_count': count, 'limit': limit if limit is not None else 'unlimited'})[1:]
+    
+    if response_format == 'ndjson':
+        return Response(stream_with_context(_ndjson()), mimetype='application/x-ndjson')
+    return Response(stream_with_context(_chunked_json()), mimetype='application/json')
+
+
+def normalize_city(city):
+    """Map city query values ('New York', 'ny', 'london', ...) to the stored city names"""
+    city_normalized = city.strip()
+    if city_normalized.upper() in ['NEW YORK', 'NY', 'NYC']:
+        return 'NYC'
+    if city_normalized.upper() == 'LONDON':
+        return 'London'
+    return city_normalized
+
+
+def cached_data_response(view):
+    """Serve /api/data from response_cache while the partitions it covers are unchanged.
+
+    Row JSON, columnar and msgpack responses are cached per format and content
+    encoding (compressed bodies are stored as sent); cursor pages and streams pass
+    through. Responses carry an ETag derived from the partition versions, and a
+    matching If-None-Match gets a 304 without rendering anything.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        params = request.args
+        try:
+            response_format = response_formats.negotiate_format(params, request.accept_mimetypes)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 406
+        if params.get('cursor') is not None or response_format in response_formats.STREAM_FORMATS:
+            return view(*args, **kwargs)
+        
+        encoding = response_formats.negotiate_encoding(request.accept_encodings)
+        
+        def _render():
+            response = response_formats.compress_response(make_response(view(*args, **kwargs)), encoding)
+            response.vary.add('Accept')
+            return response
+        
+        if not response_cache.RESPONSE_CACHE_ENABLED:
+            return _render()
+        
+        normalized = [('format', response_format)]
+        for name in sorted(params.keys()):
+            value = params.get(name, '').strip()
+            if not value or name == 'format':
+                continue
+            if name == 'city':
+                value = normalize_city(value)
+            elif name == 'search':
+                value = value.lower()
+            normalized.append((name, value))
+        cache_key = 'data?' + urlencode(normalized) + '#' + (encoding or 'identity')
+        
+        filters = dict(normalized)
+        try:
+            date_from = datetime.strptime(filters['date_from'], "%Y-%m-%d").date() if 'date_from' in filters else None
+            date_to = datetime.strptime(filters['date_to'], "%Y-%m-%d").date() if 'date_to' in filters else None
+            guests = int(filters['guests']) if 'guests' in filters else None
+        except ValueError:
+            return _render()
+        
+        fields = response_cache.partition_fields(filters.get('city'), date_from, date_to, guests)
+        token = response_cache.version_token(fields)
+        if token is None:
+            return _render()
+        etag = response_cache.make_etag(cache_key, token)
+        
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag, weak=True)
+            response.vary.update(('Accept', 'Accept-Encoding'))
+            return response
+        
+        cached = response_cache.response_lru.get(cache_key, token)
+        if cached is not None:
+            body, mimetype, content_encoding = cached
+            response = Response(body, mimetype=mimetype)
+            if content_encoding:
+                response.headers['Content-Encoding'] = content_encoding
+            response.vary.update(('Accept', 'Accept-Encoding'))
+            response.headers['X-Cache'] = 'HIT'
+        else:
+            response = _render()
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            response_cache.response_lru.put(
+                cache_key, token, response.get_data(), response.mimetype,
+                response.headers.get('Content-Encoding')
+            )
+            response.headers['X-Cache'] = 'MISS'
+        
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    
+    return wrapper
+
+
 @app.route('/data')
 @app.route('/api/data')
+@cached_data_response
 def get_data():
-    """Get scraped data from database"""
+    """Get scraped data from database
+
+    Pagination / response modes:
+        limit + offset       classic page with total_available (default)
+        cursor               keyset page; pass cursor= (empty) for the first page, then
+                             the returned next_cursor. limit defaults to API_DATA_PAGE_SIZE
+        format=ndjson        stream one JSON object per line
+        format=stream        stream the usual {"data": [...]} document in chunks
+        format=columnar      dictionary-encoded columns (see response_formats); also
+        format=msgpack       via Accept: application/vnd.slots.columnar+json or
+                             application/msgpack. limit + offset mode only
+
+    time_from / time_to (e.g. 18:00 or 6pm) filter on the parsed start time, inclusive;
+    slots whose time could not be parsed are excluded by them.
+
+    Price filters use the normalized price_amount (slots without a parsed price are
+    excluded by them): price_min, price_max. sort=price orders cheapest first
+    (not available with cursor).
+    """
     try:
         city = request.args.get('city')
         venue_name = request.args.get('venue_name')
@@ -928,6 +2082,20 @@ def get_data():
         guests = request.args.get('guests')
         neighborhood = request.args.get('neighborhood')
         search_term = request.args.get('search', '').lower()
+        sort = request.args.get('sort', '').lower() or None
+        if sort not in (None, 'price'):
+            return jsonify({'error': f'Invalid sort: {sort}. Expected price'}), 400
+        try:
+            price_min = float(request.args['price_min']) if request.args.get('price_min') else None
+            price_max = float(request.args['price_max']) if request.args.get('price_max') else None
+        except ValueError:
+            return jsonify({'error': 'Invalid price_min/price_max. Expected a number'}), 400
+        time_bounds = {}
+        for name in ('time_from', 'time_to'):
+            if request.args.get(name):
+                time_bounds[name] = parse_start_minutes(request.args[name])
+                if time_bounds[name] is None:
+                    return jsonify({'error': f'Invalid {name}: {request.args[name]}. Expected e.g. 18:00 or 6pm'}), 400
         
         limit = request.args.get('limit', type=int)
         offset = request.args.get('offset', type=int, default=0)
@@ -943,25 +2111,11 @@ def get_data():
         print(debug_msg, flush=True)
         logger.info(debug_msg)
         
-        # Force checkpoint WAL before querying to ensure we see latest data
-        # This is important when Celery workers write data while Flask reads
-        try:
-            with db.engine.connect() as conn:
-                conn.execute(text("PRAGMA wal_checkpoint(PASSIVE)"))
-                conn.commit()
-        except Exception as e:
-            logger.warning(f"Could not checkpoint WAL: {e}")
-        
-        query = AvailabilitySlot.query
+        # Slots that dropped out of their venue's latest scrape are kept but hidden
+        query = AvailabilitySlot.query.filter(AvailabilitySlot.removed_at.is_(None))
         
         if city:
-            city_normalized = city.strip()
-            if city_normalized.upper() in ['NEW YORK', 'NY', 'NYC']:
-                query = query.filter(AvailabilitySlot.city == 'NYC')
-            elif city_normalized.upper() == 'LONDON':
-                query = query.filter(AvailabilitySlot.city == 'London')
-            else:
-                query = query.filter(AvailabilitySlot.city == city_normalized)
+            query = query.filter(AvailabilitySlot.city == normalize_city(city))
         
         if venue_name:
             query = query.filter(AvailabilitySlot.venue_name == venue_name)
@@ -985,6 +2139,45 @@ def get_data():
                 pass
         if status_filter:
             query = query.filter(AvailabilitySlot.status.ilike(f'%{status_filter}%'))
+        if neighborhood:
+            query = query.filter(AvailabilitySlot.venue_name.in_(
+                db.session.query(VenueMetadata.venue_name).filter(VenueMetadata.neighborhood == neighborhood)
+            ))
+        if search_term:
+            query = apply_slot_search(query, AvailabilitySlot, search_term)
+        if 'time_from' in time_bounds:
+            query = query.filter(AvailabilitySlot.start_minutes >= time_bounds['time_from'])
+        if 'time_to' in time_bounds:
+            query = query.filter(AvailabilitySlot.start_minutes <= time_bounds['time_to'])
+        if price_min is not None:
+            query = query.filter(AvailabilitySlot.price_amount >= price_min)
+        if price_max is not None:
+            query = query.filter(AvailabilitySlot.price_amount <= price_max)
+        
+        try:
+            response_format = response_formats.negotiate_format(request.args, request.accept_mimetypes)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 406
+        cursor = request.args.get('cursor')
+        if cursor is not None or response_format in ('ndjson', 'stream'):
+            cursor_key = None
+            if cursor:
+                try:
+                    cursor_key = decode_slot_cursor(cursor)
+                except ValueError as e:
+                    return jsonify({'error': str(e)}), 400
+            if cursor is not None and sort:
+                return jsonify({'error': 'sort is not supported with cursor pagination'}), 400
+            
+            ordered = order_slots(query, sort)
+            if cursor_key:
+                ordered = apply_slot_keyset(ordered, cursor_key)
+            elif offset > 0:
+                ordered = ordered.offset(offset)
+            
+            if response_format in ('ndjson', 'stream'):
+                return stream_slots_response(ordered, limit, response_format)
+            return slot_page_response(ordered, limit or API_DATA_PAGE_SIZE)
         
         try:
             total_count = query.count()
@@ -995,241 +2188,69 @@ def get_data():
             logger.warning(f"[API DEBUG] Could not get total count: {count_error}")
             total_count = None
         
-        # Debug: Check what's actually in the database
         if total_count == 0:
-            # Show which database file is being used
-            db_uri = app.config.get('SQLALCHEMY_DATABASE_URI', 'unknown')
-            basedir_debug = os.path.abspath(os.path.dirname(__file__))
-            db_file_debug = os.path.join(basedir_debug, "availability.db")
-            db_exists_debug = os.path.exists(db_file_debug)
-            db_size_debug = os.path.getsize(db_file_debug) if db_exists_debug else 0
-            
-            # Check for WAL and SHM files
-            wal_file = db_file_debug + "-wal"
-            shm_file = db_file_debug + "-shm"
-            wal_exists = os.path.exists(wal_file)
-            shm_exists = os.path.exists(shm_file)
-            wal_size = os.path.getsize(wal_file) if wal_exists else 0
-            shm_size = os.path.getsize(shm_file) if shm_exists else 0
-            
-            debug_db_path_msg = f"[API DEBUG] Database URI: {db_uri}, File path: {db_file_debug}, Exists: {db_exists_debug}, Size: {db_size_debug} bytes, WAL: {wal_exists} ({wal_size} bytes), SHM: {shm_exists} ({shm_size} bytes)"
-            print(debug_db_path_msg, flush=True)
-            logger.info(debug_db_path_msg)
-            
-            # Try direct SQL query to check if data exists
-            try:
-                # Get the actual database file path from the engine
-                engine_url = str(db.engine.url)
-                debug_engine_msg = f"[API DEBUG] SQLAlchemy engine URL: {engine_url}"
-                print(debug_engine_msg, flush=True)
-                logger.info(debug_engine_msg)
-                
-                with db.engine.connect() as conn:
-                    # Force a full WAL checkpoint to merge all WAL data into main database
-                    try:
-                        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
-                        conn.commit()
-                        logger.info("[API DEBUG] WAL checkpoint (TRUNCATE) completed")
-                    except Exception as checkpoint_error:
-                        logger.warning(f"[API DEBUG] WAL checkpoint failed: {checkpoint_error}")
-                    
-                    result = conn.execute(text("SELECT COUNT(*) FROM availability_slots"))
-                    direct_count = result.scalar()
-                    debug_direct_msg = f"[API DEBUG] Direct SQL query count: {direct_count}"
-                    print(debug_direct_msg, flush=True)
-                    logger.info(debug_direct_msg)
-                    
-                    # Check table structure
-                    result2 = conn.execute(text("SELECT name FROM sqlite_master WHERE type='table' AND name='availability_slots'"))
-                    table_exists = result2.fetchone() is not None
-                    debug_table_msg = f"[API DEBUG] Table 'availability_slots' exists: {table_exists}"
-                    print(debug_table_msg, flush=True)
-                    logger.info(debug_table_msg)
-                    
-                    # Check journal mode
-                    result3 = conn.execute(text("PRAGMA journal_mode"))
-                    journal_mode = result3.scalar()
-                    debug_journal_msg = f"[API DEBUG] Journal mode: {journal_mode}"
-                    print(debug_journal_msg, flush=True)
-                    logger.info(debug_journal_msg)
-                    
-                    if direct_count > 0:
-                        # Get sample data
-                        result4 = conn.execute(text("SELECT city, guests, COUNT(*) FROM availability_slots GROUP BY city, guests LIMIT 5"))
-                        samples = result4.fetchall()
-                        debug_samples_msg = f"[API DEBUG] Sample data (city, guests, count): {samples}"
-                        print(debug_samples_msg, flush=True)
-                        logger.info(debug_samples_msg)
-                    else:
-                        # If direct SQL returns 0 but file has data, there's a connection issue
-                        debug_warning_msg = f"[API DEBUG] WARNING: Direct SQL returns 0 but file size is {db_size_debug} bytes - possible database connection mismatch or WAL not checkpointed!"
-                        print(debug_warning_msg, flush=True)
-                        logger.warning(debug_warning_msg)
-            except Exception as sql_error:
-                debug_sql_error_msg = f"[API DEBUG] Error executing direct SQL: {sql_error}"
-                print(debug_sql_error_msg, flush=True)
-                logger.error(debug_sql_error_msg, exc_info=True)
-            
-            all_slots_count = AvailabilitySlot.query.count()
-            debug_all_msg = f"[API DEBUG] Total slots in database (no filters): {all_slots_count}"
-            print(debug_all_msg, flush=True)
-            logger.info(debug_all_msg)
-            
-            # Show sample cities and venue names
-            sample_slots = AvailabilitySlot.query.limit(10).all()
-            if sample_slots:
-                sample_cities = set(s.city for s in sample_slots)
-                sample_venues = set(s.venue_name for s in sample_slots)
-                sample_guests = set(s.guests for s in sample_slots)
-                debug_sample_msg = f"[API DEBUG] Sample cities in DB: {sample_cities}, Sample venues: {list(sample_venues)[:5]}, Sample guests: {sorted(sample_guests)}"
-                print(debug_sample_msg, flush=True)
-                logger.info(debug_sample_msg)
-            
-            # Show what the query filter would match
-            if city:
-                city_filtered = AvailabilitySlot.query.filter(AvailabilitySlot.city == ('NYC' if city.upper() in ['NEW YORK', 'NY', 'NYC'] else 'London' if city.upper() == 'LONDON' else city)).count()
-                debug_city_filter_msg = f"[API DEBUG] Slots matching city filter '{city}': {city_filtered}"
-                print(debug_city_filter_msg, flush=True)
-                logger.info(debug_city_filter_msg)
-            
-            if guests:
-                try:
-                    guests_int = int(guests)
-                    guests_filtered = AvailabilitySlot.query.filter(AvailabilitySlot.guests == guests_int).count()
-                    debug_guests_filter_msg = f"[API DEBUG] Slots matching guests filter '{guests}': {guests_filtered}"
-                    print(debug_guests_filter_msg, flush=True)
-                    logger.info(debug_guests_filter_msg)
-                except ValueError:
-                    pass
+            logger.info("[API DEBUG] No matching slots; see /api/debug/data_diagnostics for database diagnostics")
         
-        slots_query = query.order_by(
-            AvailabilitySlot.date.desc(), 
-            AvailabilitySlot.time,
-            AvailabilitySlot.venue_name
-        )
+        if response_format in response_formats.COMPACT_FORMATS:
+            compact_query = order_slots(query, sort).with_entities(*SLOT_COLUMNAR_COLUMNS)
+            if offset > 0:
+                compact_query = compact_query.offset(offset)
+            if limit is not None:
+                compact_query = compact_query.limit(limit)
+            rows = compact_query.all()
+            meta = {
+                'total_count': len(rows),
+                'limit': limit if limit is not None else 'unlimited',
+                'offset': offset
+            }
+            if total_count is not None:
+                meta['total_available'] = total_count
+            body, mimetype = response_formats.encode_columnar(
+                rows, get_booking_url_for_venue, response_format, **meta
+            )
+            return Response(body, mimetype=mimetype)
+        
+        slots_query = order_slots(query, sort).with_entities(*SLOT_JSON_COLUMNS)
         
         if offset > 0:
             slots_query = slots_query.offset(offset)
         if limit is not None:
             slots_query = slots_query.limit(limit)
         
-        slots = slots_query.all()
+        rows = slots_query.all()
         
-        debug_msg = f"[API DEBUG] Query returned {len(slots)} slots (limit={limit if limit is not None else 'unlimited'}, offset={offset})"
+        debug_msg = f"[API DEBUG] Query returned {len(rows)} slots (limit={limit if limit is not None else 'unlimited'}, offset={offset})"
         print(debug_msg, flush=True)
         logger.info(debug_msg)
         
+        # Rows are emitted as stored JSON fragments; no per-row dict/json round trip
         data = []
-        converted_count = 0
         error_count = 0
-        for slot in slots:
+        for row in rows:
             try:
-                slot_dict = slot.to_dict()
-                if not slot_dict.get('booking_url'):
-                    slot_dict['booking_url'] = get_booking_url_for_venue(slot_dict.get('venue_name'))
-                data.append(slot_dict)
-                converted_count += 1
+                data.append(slot_row_json(row))
             except Exception as e:
-                error_msg = f"Error converting slot {slot.id} to dict: {e}"
+                error_msg = f"Error converting slot {row.id} to dict: {e}"
                 print(error_msg, flush=True)
                 logger.error(error_msg, exc_info=True)
                 error_count += 1
                 continue
         
-        # Neighborhood filtering (after data fetch since neighborhood is not in DB)
-        if neighborhood:
-            # Venue name to neighborhood mapping (simplified version of frontend metadata)
-            venue_neighborhood_map = {
-                # NYC venues
-                'Swingers (Nomad)': 'Midtown',
-                'Electric Shuffle (Nomad)': 'Midtown',
-                'Puttery (Meatpacking)': 'Downtown',
-                'Five Iron Golf (Financial District)': 'Downtown',
-                'Five Iron Golf (Flatiron)': 'Midtown',
-                'Five Iron Golf (Midtown East)': 'Midtown',
-                'Five Iron Golf (Herald Square)': 'Midtown',
-                'Five Iron Golf (Long Island City)': 'Brooklyn/Queens',
-                'Five Iron Golf (Upper East Side)': 'Uptown',
-                'Five Iron Golf (Rockefeller Center)': 'Midtown',
-                'SPIN (Flatiron)': 'Midtown',
-                'SPIN (Midtown East)': 'Midtown',
-                'T-Squared Social (Midtown East)': 'Midtown',
-                'Lucky Strike (Times Square)': 'Midtown',
-                'Lucky Strike (Chelsea Piers)': 'Midtown',
-                'The Lawn Club (Financial District)': 'Downtown',
-                'The Lawn Club (Croquet Lawns)': 'Downtown',
-                'The Lawn Club (Curling Lawns)': 'Downtown',
-                'The Lawn Club (Indoor Gaming)': 'Downtown',
-                'Kick Axe (Brooklyn)': 'Brooklyn/Queens',
-                'Chelsea Piers (Chelsea)': 'Midtown',
-                # London venues
-                'Puttshack (Bank)': 'The City',
-                'Swingers (Oxford Circus)': 'West End',
-                'Flight Club Darts (Shoreditch)': 'The City',
-                'Flight Club Darts (Bloomsbury)': 'West End',
-                'Flight Club Darts (Victoria)': 'Westminster',
-                'Flight Club Darts (Angel)': 'The City',
-                'Electric Shuffle (Canary Wharf)': 'Canary Wharf',
-                'Electric Shuffle (London Bridge)': 'The City',
-                'Electric Shuffle (King\'s Cross)': None,
-                'Clays Bar (Canary Wharf)': 'Canary Wharf',
-                'Clays Bar (The City)': 'The City',
-                'Clays Bar (Soho)': 'West End',
-                'F1 Arcade (St Paul\'s)': 'The City',
-                'Fair Game (Canary Wharf)': 'Canary Wharf',
-                'Fair Game (City)': 'The City',
-                'Bounce (Farringdon)': 'The City',
-                'Bounce (Shoreditch)': 'The City',
-                'All Star Lanes (Holborn)': 'West End',
-                'All Star Lanes (Shoreditch)': 'The City',
-                'Hijingo (Shoreditch)': 'The City',
-                'Topgolf (Chigwell)': None,
-            }
-            
-            # Filter data by neighborhood
-            filtered_data = []
-            for item in data:
-                venue_name = item.get('venue_name', '')
-                item_neighborhood = venue_neighborhood_map.get(venue_name)
-                
-                # Also try partial matching for venue names that might have slight variations
-                if not item_neighborhood:
-                    for mapped_venue, mapped_neighborhood in venue_neighborhood_map.items():
-                        if mapped_venue.lower() in venue_name.lower() or venue_name.lower() in mapped_venue.lower():
-                            item_neighborhood = mapped_neighborhood
-                            break
-                
-                if item_neighborhood == neighborhood:
-                    filtered_data.append(item)
-            
-            data = filtered_data
-        
-        if search_term:
-            data = [
-                item for item in data
-                if search_term in str(item.get('venue_name', '')).lower() or
-                   search_term in str(item.get('date', '')).lower() or
-                   search_term in str(item.get('time', '')).lower() or
-                   search_term in str(item.get('price', '')).lower() or
-                   search_term in str(item.get('status', '')).lower()
-            ]
-        
-        response_data = {
-            'data': data,
+        meta = {
             'total_count': len(data),
             'limit': limit if limit is not None else 'unlimited',
             'offset': offset
         }
         
         if total_count is not None:
-            response_data['total_available'] = total_count
+            meta['total_available'] = total_count
         
         # Debug: Log response summary
         debug_response_msg = f"[API DEBUG] Returning {len(data)} items in response (total_available: {total_count})"
         print(debug_response_msg, flush=True)
         logger.info(debug_response_msg)
         
-        return jsonify(response_data)
+        return slot_json_response(data, **meta)
     except Exception as e:
         import traceback
         error_msg = f"[API ERROR] Exception in get_data: {e}"
@@ -1248,6 +2269,124 @@ def get_data():
             print(f"Error creating JSON response: {json_error}")
             return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
 
+API_CHANGES_PAGE_SIZE = int(os.getenv('API_CHANGES_PAGE_SIZE', '5000'))
+
+
+@app.route('/api/data/changes')
+def get_data_changes():
+    """Slots inserted, updated or removed since a change version
+
+    Query params:
+        since       last version the client has applied (omit to just get the current version)
+        city, guests, venue_name, date_from, date_to   same filters as /api/data
+        limit       max changes per response (whole versions are never split)
+
+    Returns {'changes': [...], 'version': N, 'has_more': bool, 'reset': bool}. Each change
+    is {'op': 'upsert', 'change_version', 'slot': {...}} or {'op': 'remove', 'change_version',
+    'id', 'venue_name', 'date', 'time', 'guests', 'city'}. Pass the returned version as the
+    next since. reset=true means rows were bulk-deleted after since: refetch /api/data.
+    """
+    since = request.args.get('since', type=int)
+    limit = min(request.args.get('limit', type=int) or API_CHANGES_PAGE_SIZE, 50000)
+    
+    # Read the high-water mark before the rows so nothing committed in between is skipped
+    high_water = current_change_version()
+    if since is None or since >= high_water:
+        return slot_json_response([], key='changes', version=high_water if since is None else max(since, high_water),
+                                  has_more=False, reset=False)
+    reset = current_change_version('slots_reset') > since
+    
+    query = AvailabilitySlot.query.filter(
+        AvailabilitySlot.change_version > since,
+        AvailabilitySlot.change_version <= high_water
+    )
+    city = request.args.get('city')
+    if city:
+        query = query.filter(AvailabilitySlot.city == normalize_city(city))
+    guests = request.args.get('guests', type=int)
+    if guests is not None:
+        query = query.filter(AvailabilitySlot.guests == guests)
+    venue_name = request.args.get('venue_name')
+    if venue_name:
+        query = query.filter(AvailabilitySlot.venue_name == venue_name)
+    try:
+        if request.args.get('date_from'):
+            query = query.filter(AvailabilitySlot.date >= datetime.strptime(request.args['date_from'], "%Y-%m-%d").date())
+        if request.args.get('date_to'):
+            query = query.filter(AvailabilitySlot.date <= datetime.strptime(request.args['date_to'], "%Y-%m-%d").date())
+    except ValueError as e:
+        return jsonify({'error': f'Invalid date filter: {e}. Expected YYYY-MM-DD'}), 400
+    
+    columns = SLOT_JSON_COLUMNS + (AvailabilitySlot.guests, AvailabilitySlot.city,
+                                   AvailabilitySlot.removed_at, AvailabilitySlot.change_version)
+    ordered = query.with_entities(*columns).order_by(AvailabilitySlot.change_version, AvailabilitySlot.id)
+    rows = ordered.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    if has_more:
+        # Drop the trailing, possibly partial version; if it is the only one, send all of it
+        cut = rows[-1].change_version
+        rows = [row for row in rows if row.change_version < cut]
+        if not rows:
+            rows = ordered.filter(AvailabilitySlot.change_version == cut).all()
+        version = rows[-1].change_version
+    else:
+        version = high_water
+    
+    changes = []
+    for row in rows:
+        if row.removed_at is not None:
+            changes.append(dumps_json({
+                'op': 'remove',
+                'change_version': row.change_version,
+                'id': row.id,
+                'venue_name': row.venue_name,
+                'date': row.date.isoformat(),
+                'time': row.time,
+                'guests': row.guests,
+                'city': row.city,
+            }))
+        else:
+            changes.append('{"op":"upsert","change_version":%d,"slot":%s}' % (row.change_version, slot_row_json(row)))
+    
+    return slot_json_response(changes, key='changes', version=version, has_more=has_more, reset=reset)
+
+
+@app.route('/api/summary')
+def get_availability_summary():
+    """Venue × date availability overview from the availability_summaries table
+
+    Query params: city, guests, venue_name, date_from, date_to (YYYY-MM-DD),
+    available_only=true to skip venue-days with no available slot.
+    """
+    query = AvailabilitySummary.query
+    city = request.args.get('city')
+    if city:
+        query = query.filter(AvailabilitySummary.city == normalize_city(city))
+    guests = request.args.get('guests', type=int)
+    if guests is not None:
+        query = query.filter(AvailabilitySummary.guests == guests)
+    venue_name = request.args.get('venue_name')
+    if venue_name:
+        query = query.filter(AvailabilitySummary.venue_name == venue_name)
+    try:
+        if request.args.get('date_from'):
+            query = query.filter(AvailabilitySummary.date >= datetime.strptime(request.args['date_from'], "%Y-%m-%d").date())
+        if request.args.get('date_to'):
+            query = query.filter(AvailabilitySummary.date <= datetime.strptime(request.args['date_to'], "%Y-%m-%d").date())
+    except ValueError as e:
+        return jsonify({'error': f'Invalid date filter: {e}. Expected YYYY-MM-DD'}), 400
+    if request.args.get('available_only', '').lower() in ('1', 'true', 'yes'):
+        query = query.filter(AvailabilitySummary.available_count > 0)
+    
+    summaries = query.order_by(
+        AvailabilitySummary.date, AvailabilitySummary.venue_name, AvailabilitySummary.guests
+    ).all()
+    return jsonify({
+        'data': [summary.to_dict() for summary in summaries],
+        'total_count': len(summaries)
+    })
+
+
 @app.route('/clear_data', methods=['POST'])
 def clear_data():
     """Clear scraped data from database"""
@@ -1267,7 +2406,18 @@ def clear_data():
             query = query.filter(AvailabilitySlot.date <= datetime.strptime(date_to, "%Y-%m-%d").date())
         
         count = query.delete()
+        summary_query = AvailabilitySummary.query
+        if city:
+            summary_query = summary_query.filter(AvailabilitySummary.city == city)
+        if date_from:
+            summary_query = summary_query.filter(AvailabilitySummary.date >= datetime.strptime(date_from, "%Y-%m-%d").date())
+        if date_to:
+            summary_query = summary_query.filter(AvailabilitySummary.date <= datetime.strptime(date_to, "%Y-%m-%d").date())
+        summary_query.delete()
+        mark_slots_reset()
         db.session.commit()
+        response_cache.bump_all()
+        slot_events.publish_purge(city, date_from, date_to)
         
         return jsonify({'message': f'Cleared {count} records successfully'})
     except Exception as e:
@@ -1338,7 +2488,8 @@ def scrape_swingers_task(self, guests, target_date, task_id=None):
                 guests,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date]
             )
             
             if task_id:
@@ -1366,7 +2517,8 @@ def scrape_swingers_uk_task(self, guests, target_date, task_id=None):
                 guests,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date]
             )
             
             if task_id:
@@ -1394,7 +2546,8 @@ def scrape_electric_shuffle_task(self, guests, target_date, task_id=None):
                 guests,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date]
             )
             
             if task_id:
@@ -1422,7 +2575,9 @@ def scrape_electric_shuffle_london_task(self, guests, target_date, task_id=None)
                 guests,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date],
+                snapshot_empty=False
             )
             
             if task_id:
@@ -1523,7 +2678,8 @@ def scrape_five_iron_golf_task(self, guests, target_date, task_id=None, location
                 guests,
                 target_date,
                 location,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date]
             )
             
             if task_id:
@@ -1556,7 +2712,8 @@ def scrape_allstarlanes_task(self, guests, target_date, task_id=None, location='
                 guests,
                 target_date,
                 location,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date]
             )
             
             if task_id:
@@ -1587,7 +2744,9 @@ def scrape_lucky_strike_task(self, guests, target_date, task_id=None, location='
                 guests,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date],
+                snapshot_empty=False
             )
             
             if task_id:
@@ -1615,7 +2774,9 @@ def scrape_easybowl_task(self, guests, target_date, task_id=None):
                 guests,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date],
+                snapshot_empty=False
             )
             
             if task_id:
@@ -1672,7 +2833,8 @@ def scrape_hijingo_task(self, guests, target_date, task_id=None):
                 guests,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date]
             )
             
             if task_id:
@@ -1700,7 +2862,8 @@ def scrape_pingpong_task(self, guests, target_date, task_id=None):
                 guests,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date]
             )
             
             if task_id:
@@ -1746,7 +2909,8 @@ def scrape_daysmart_chelsea_task(self, guests, target_date, task_id=None):
                 guests,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date]
             )
             
             if task_id:
@@ -1774,7 +2938,8 @@ def scrape_fair_game_canary_wharf_task(self, guests, target_date, task_id=None):
                 guests,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date]
             )
             
             if task_id:
@@ -1802,7 +2967,8 @@ def scrape_fair_game_city_task(self, guests, target_date, task_id=None):
                 guests,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date]
             )
             
             if task_id:
@@ -1832,7 +2998,9 @@ def scrape_clays_bar_task(self, location, guests, target_date, task_id=None):
                 location,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date],
+                snapshot_empty=False
             )
             
             if task_id:
@@ -1862,7 +3030,9 @@ def scrape_puttshack_task(self, location, guests, target_date, task_id=None):
                 location,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date],
+                snapshot_empty=False
             )
             
             if task_id:
@@ -1893,7 +3063,9 @@ def scrape_flight_club_darts_task(self, guests, target_date, venue_id=None, task
                 guests,
                 target_date,
                 venue_id,  # Pass None to scrape all, or specific venue_id for backward compatibility
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date],
+                snapshot_empty=False
             )
             
             if task_id:
@@ -1979,7 +3151,8 @@ def scrape_puttery_task(self, guests, target_date, task_id=None):
                 guests,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date]
             )
             
             if task_id:
@@ -2007,7 +3180,8 @@ def scrape_kick_axe_task(self, guests, target_date, task_id=None):
                 guests,
                 guests,
                 target_date,
-                task_id=task_id
+                task_id=task_id,
+                snapshot_dates=[target_date]
             )
             
             if task_id:
@@ -2021,9 +3195,24 @@ def scrape_kick_axe_task(self, guests, target_date, task_id=None):
 
 
 @celery_app.task(bind=True, name='app.scrape_venue_task')
-def scrape_venue_task(self, guests, target_date, website, task_id=None, lawn_club_option=None, lawn_club_time=None, lawn_club_duration=None, spin_time=None, clays_location=None, puttshack_location=None, f1_experience=None):
+def scrape_venue_task(self, guests, target_date, website, task_id=None, lawn_club_option=None, lawn_club_time=None, lawn_club_duration=None, spin_time=None, clays_location=None, puttshack_location=None, f1_experience=None, cycle_id=None):
     """Celery task wrapper for scraping a single venue"""
     with app.app_context():
+        # Whole-day scrapes (no selected time) count towards refresh freshness
+        track_refresh = bool(target_date) and not (lawn_club_time or lawn_club_duration or spin_time)
+        changed_dates = refresh_scheduler.start_tracking()
+        lease = None
+        dedup_key = task_dedup.scrape_key(website, target_date, guests, {
+            'lawn_club_option': lawn_club_option,
+            'lawn_club_time': lawn_club_time,
+            'lawn_club_duration': lawn_club_duration,
+            'spin_time': spin_time,
+            'clays_location': clays_location,
+            'puttshack_location': puttshack_location,
+            'f1_experience': f1_experience
+        })
+        owner_id = task_id or self.request.id
+        dedup_claimed = False
         try:
             logger = logging.getLogger(__name__)
             
@@ -2049,6 +3238,33 @@ def scrape_venue_task(self, guests, target_date, website, task_id=None, lawn_clu
                     task.progress = 'Initializing browser...'
                 db.session.commit()
             
+            # Coalesce with an identical scrape that is running or just finished (see task_dedup.py)
+            holder = task_dedup.claim(dedup_key, owner_id)
+            if holder and holder['state'] == 'in_flight' and task_id and not task_dedup.attach(dedup_key, task_id):
+                # The running scrape finished in between
+                holder = task_dedup.claim(dedup_key, owner_id)
+            if holder:
+                slots_found = holder.get('slots_found', 0)
+                if holder['state'] == 'recent':
+                    logger.info(f"[VENUE_TASK] {website}: identical scrape finished {holder['age_seconds']:.0f}s ago (task {holder['task_id']}), skipping")
+                    if task_id:
+                        update_task_status(task_id, status='SUCCESS', progress=f"Reused results from {holder['age_seconds']:.0f}s ago: found {slots_found} slots", total_slots=slots_found)
+                    if track_refresh:
+                        reused_at = datetime.utcfromtimestamp(holder['finished_at']) if holder.get('finished_at') else datetime.utcnow()
+                        record_refresh_results(website, guests, [target_date], changed_dates, success=True, reused_at=reused_at)
+                else:
+                    # The running scrape records this date in RefreshState when it finishes,
+                    # which also ends the dispatcher's in-flight lease on it
+                    logger.info(f"[VENUE_TASK] {website}: identical scrape already running (task {holder['task_id']}), attaching")
+                    if task_id:
+                        update_task_status(task_id, progress=f"Attached to identical scrape in progress (task {holder['task_id']})")
+                record_refresh_cycle_task(cycle_id, success=True)
+                return {'status': 'deduplicated', 'state': holder['state'], 'attached_to': holder['task_id'], 'slots_found': slots_found}
+            dedup_claimed = True
+            
+            # Wait for a slot on this venue's booking platform (see rate_limiter.py)
+            lease = rate_limiter.acquire(website)
+            
             city = 'NYC' if 'nyc' in website or website in NYC_VENUES else 'London'
             venue_name_map = {
                 'swingers_nyc': 'Swingers (Nomad)',
@@ -2238,14 +3454,145 @@ def scrape_venue_task(self, guests, target_date, website, task_id=None, lawn_clu
             if task_id:
                 update_task_status(task_id, status='SUCCESS', progress=f'Scraping completed! Found {slots_found} slots')
             
+            if track_refresh:
+                record_refresh_results(website, guests, [target_date], changed_dates, success=True)
+            rate_limiter.report_success(website)
+            record_refresh_cycle_task(cycle_id, success=True)
+            if dedup_claimed:
+                finish_coalesced_scrape(dedup_key, owner_id, True, slots_found)
+            
             return result
             
+        except rate_limiter.RateLimited as e:
+            logging.getLogger(__name__).info(f"[VENUE_TASK] {website}: {e}")
+            if task_id:
+                update_task_status(task_id, status='PENDING', progress=f'Waiting for {e.platform} rate limit...')
+            if self.request.retries >= rate_limiter.RATE_LIMIT_MAX_RETRIES:
+                if track_refresh:
+                    record_refresh_results(website, guests, [target_date], changed_dates, success=False)
+                record_refresh_cycle_task(cycle_id, success=False)
+                if dedup_claimed:
+                    finish_coalesced_scrape(dedup_key, owner_id, False, error=str(e))
+            raise self.retry(exc=e, countdown=rate_limiter.retry_countdown(e), max_retries=rate_limiter.RATE_LIMIT_MAX_RETRIES)
         except Exception as e:
             logger = logging.getLogger(__name__)
             logger.error(f"[VENUE_TASK] {website}: Error during scraping: {e}", exc_info=True)
+            if rate_limiter.is_throttle_error(e):
+                rate_limiter.report_throttled(website, str(e)[:200])
+            if task_id:
+                update_task_status(task_id, status='FAILURE', error=str(e))
+            if track_refresh:
+                record_refresh_results(website, guests, [target_date], changed_dates, success=False)
+            record_refresh_cycle_task(cycle_id, success=False)
+            if dedup_claimed:
+                finish_coalesced_scrape(dedup_key, owner_id, False, error=str(e))
+            raise e
+        finally:
+            rate_limiter.release(lease)
+            refresh_scheduler.stop_tracking()
+
+
+@celery_app.task(bind=True, name='app.scrape_venue_range_task')
+def scrape_venue_range_task(self, guests, dates, website, task_id=None, cycle_id=None):
+    """Celery task wrapper for scraping a window of dates for one venue in RANGE_SCRAPERS.
+    All dates are harvested in a single scraper run and saved together.
+    """
+    with app.app_context():
+        changed_dates = refresh_scheduler.start_tracking()
+        lease = None
+        owner_id = task_id or self.request.id
+        dedup_keys = {}
+        try:
+            logger = logging.getLogger(__name__)
+            
+            if website not in RANGE_SCRAPERS:
+                raise ValueError(f"Website does not support date ranges: {website}")
+            if isinstance(dates, str):
+                dates = [dates]
+            if not dates:
+                record_refresh_cycle_task(cycle_id, success=True)
+                return {'status': 'success', 'slots_found': 0, 'dates': 0}
+            
+            # Take the same per-date leases as scrape_venue_task (see task_dedup.py), so a
+            # single-date scrape of one of these dates attaches to this task instead of
+            # running alongside it. Dates another task is already scraping are left to it.
+            for day in dates:
+                dedup_key = task_dedup.scrape_key(website, day, guests)
+                if not task_dedup.claim(dedup_key, owner_id, use_recent=False):
+                    dedup_keys[day] = dedup_key
+            if len(dedup_keys) < len(dates):
+                # Their scrapes record them in RefreshState when they finish
+                logger.info(f"[RANGE_TASK] {website}: {len(dates) - len(dedup_keys)} of {len(dates)} dates already being scraped by other tasks, skipping them")
+                dates = [day for day in dates if day in dedup_keys]
+            if not dates:
+                if task_id:
+                    update_task_status(task_id, status='SUCCESS', progress='All dates are already being scraped by other tasks', total_slots=0)
+                record_refresh_cycle_task(cycle_id, success=True)
+                return {'status': 'deduplicated', 'state': 'in_flight', 'slots_found': 0, 'dates': 0}
+            
+            # Clean up old slots before scraping (only once per task)
+            cleanup_old_slots()
+            
+            # Wait for a slot on this venue's booking platform (see rate_limiter.py)
+            lease = rate_limiter.acquire(website)
+            
+            scraper_func, venue_name, city = RANGE_SCRAPERS[website]
+            logger.info(f"[RANGE_TASK] Starting scrape for {website} ({len(dates)} dates: {min(dates)} to {max(dates)}, guests: {guests})")
+            
+            if task_id:
+                update_task_status(task_id, status='STARTED', progress=f'Scraping {venue_name} for {len(dates)} dates...', current_venue=venue_name)
+            
+            slots_saved = run_scraper_and_save_to_db(
+                scraper_func,
+                venue_name,
+                city,
+                guests,
+                guests,
+                dates,
+                task_id=task_id,
+                snapshot_dates=dates
+            )
+            
+            logger.info(f"[RANGE_TASK] {website}: Completed scraping, found {slots_saved} slots across {len(dates)} dates")
+            
+            if task_id:
+                update_task_status(task_id, status='SUCCESS', progress=f'Found {slots_saved} slots', total_slots=slots_saved)
+            
+            record_refresh_results(website, guests, dates, changed_dates, success=True)
+            rate_limiter.report_success(website)
+            record_refresh_cycle_task(cycle_id, success=True)
+            if dedup_keys:
+                slot_counts = count_slots_by_date(venue_name, guests, list(dedup_keys))
+                for day, dedup_key in dedup_keys.items():
+                    finish_coalesced_scrape(dedup_key, owner_id, True, slot_counts.get(day, 0))
+            
+            return {'status': 'success', 'slots_found': slots_saved, 'dates': len(dates)}
+        except rate_limiter.RateLimited as e:
+            logging.getLogger(__name__).info(f"[RANGE_TASK] {website}: {e}")
+            if task_id:
+                update_task_status(task_id, status='PENDING', progress=f'Waiting for {e.platform} rate limit...')
+            if self.request.retries >= rate_limiter.RATE_LIMIT_MAX_RETRIES:
+                record_refresh_results(website, guests, dates, changed_dates, success=False)
+                record_refresh_cycle_task(cycle_id, success=False)
+                for dedup_key in dedup_keys.values():
+                    finish_coalesced_scrape(dedup_key, owner_id, False, error=str(e))
+            raise self.retry(exc=e, countdown=rate_limiter.retry_countdown(e), max_retries=rate_limiter.RATE_LIMIT_MAX_RETRIES)
+        except Exception as e:
+            logger = logging.getLogger(__name__)
+            logger.error(f"[RANGE_TASK] {website}: Error during scraping: {e}", exc_info=True)
+            if rate_limiter.is_throttle_error(e):
+                rate_limiter.report_throttled(website, str(e)[:200])
             if task_id:
                 update_task_status(task_id, status='FAILURE', error=str(e))
+            if website in RANGE_SCRAPERS and dates:
+                record_refresh_results(website, guests, dates, changed_dates, success=False)
+            record_refresh_cycle_task(cycle_id, success=False)
+            for dedup_key in dedup_keys.values():
+                finish_coalesced_scrape(dedup_key, owner_id, False, error=str(e))
             raise e
+        finally:
+            rate_limiter.release(lease)
+            refresh_scheduler.stop_tracking()
 
 
 @celery_app.task(bind=True, name='app.scrape_all_venues_task')
@@ -2434,12 +3781,53 @@ def update_parent_task_duration(self, results, parent_task_id=None, total_tasks=
             logger.error(f"[DURATION_CALLBACK] Error updating parent task duration: {e}", exc_info=True)
 
 
+def select_refresh_venues(venues_filter=None):
+    """Venues covered by background refreshes: venues_filter (name or list) if it
+    names known venues, else CELERY_VENUES_FILTER, else every NYC and London venue"""
+    logger = logging.getLogger(__name__)
+    # Combine all venues from both cities
+    all_venues = NYC_VENUES + LONDON_VENUES
+    
+    # Filter venues if filter is provided
+    if venues_filter:
+        if isinstance(venues_filter, str):
+            venues_filter = [venues_filter]  # Convert single string to list
+        # Validate that all filtered venues exist
+        valid_venues = []
+        invalid_venues = []
+        for venue in venues_filter:
+            if venue in all_venues:
+                valid_venues.append(venue)
+            else:
+                invalid_venues.append(venue)
+    
+        if invalid_venues:
+            logger.warning(f"[REFRESH] Invalid venues in filter (will be ignored): {invalid_venues}")
+    
+        if valid_venues:
+            all_venues = valid_venues
+            logger.info(f"[REFRESH] Venue filter applied: {len(valid_venues)} venues selected: {valid_venues}")
+        else:
+            logger.error(f"[REFRESH] No valid venues in filter! Using all venues instead.")
+            all_venues = NYC_VENUES + LONDON_VENUES
+    else:
+        # Check for environment variable as fallback
+        env_filter = os.getenv('CELERY_VENUES_FILTER')
+        if env_filter:
+            env_venues = [v.strip() for v in env_filter.split(',')]
+            valid_venues = [v for v in env_venues if v in all_venues]
+            if valid_venues:
+                all_venues = valid_venues
+                logger.info(f"[REFRESH] Venue filter from environment variable: {len(valid_venues)} venues selected: {valid_venues}")
+    return all_venues
+
+
 @celery_app.task(bind=True, name='app.trigger_next_refresh_cycle')
 def trigger_next_refresh_cycle(self, results=None, venues_filter=None):
-    """Callback task to trigger the next refresh cycle after current cycle completes
+    """Task to trigger the next refresh cycle once the current one is (mostly) done
     
     Args:
-        results: Results from the previous cycle (unused but required by chord callback)
+        results: Results from the previous cycle (unused; kept for the chord fallback)
         venues_filter: Optional list of venue names to filter for next cycle
     """
     with app.app_context():
@@ -2454,13 +3842,33 @@ def trigger_next_refresh_cycle(self, results=None, venues_filter=None):
             # Don't raise - we don't want to break the chain if there's an error
 
 
+@celery_app.task(bind=True, name='app.check_refresh_cycle_task')
+def check_refresh_cycle_task(self):
+    """Periodic task (REFRESH_MODE=sweep): start the next cycle if the current one
+    has run past REFRESH_CYCLE_MAX_SECONDS, e.g. because tasks were lost or stuck"""
+    with app.app_context():
+        logger = logging.getLogger(__name__)
+        status = refresh_cycles.overdue_cycle()
+        if not status:
+            return {'status': 'ok'}
+        logger.warning(
+            f"[REFRESH] Cycle {status['cycle_id']} still has {status['total'] - status['done'] - status['failed']} "
+            f"of {status['total']} tasks outstanding after {status['age_seconds']:.0f}s. Starting next cycle..."
+        )
+        trigger_next_refresh_cycle.delay(venues_filter=status['venues_filter'])
+        return {'status': 'next_cycle_started', 'cycle_id': status['cycle_id']}
+
+
 @celery_app.task(bind=True, name='app.refresh_all_venues_task')
 def refresh_all_venues_task(self, venues_filter=None):
     """Periodic task to refresh all venues for guests 2-8, for 30 days in one cycle.
-    Creates tasks at venue × guest × date level.
+    Creates tasks at venue × guest × date level, except for venues in RANGE_SCRAPERS,
+    which get one task per venue × guest × RANGE_WINDOW_DAYS window.
     Note: daysmart_chelsea only supports 2 guests, so tasks for guests 3-8 are skipped for that venue.
     Tasks are shuffled to interleave different venues and reduce IP blocking risk.
-    Automatically triggers the next cycle when all tasks complete.
+    Progress is counted in Redis (see refresh_cycles.py) and the next cycle starts once
+    REFRESH_CYCLE_NEXT_AT of the tasks have finished, or after REFRESH_CYCLE_MAX_SECONDS.
+    Used when REFRESH_MODE=sweep; the default adaptive mode runs dispatch_stale_refreshes_task instead.
     
     Args:
         venues_filter: Optional list of venue names to filter. If provided, only these venues will be scraped.
@@ -2477,53 +3885,24 @@ def refresh_all_venues_task(self, venues_filter=None):
             dates_to_refresh = [today + timedelta(days=i) for i in range(30)]
             date_strings = [d.isoformat() for d in dates_to_refresh]
             
-            # Combine all venues from both cities
-            all_venues = NYC_VENUES + LONDON_VENUES
+            # Rows from before json_fragment / the summary table existed; normally no-ops
+            backfill_slot_json_fragments()
+            rebuild_availability_summaries()
             
-            # Filter venues if filter is provided
-            if venues_filter:
-                if isinstance(venues_filter, str):
-                    venues_filter = [venues_filter]  # Convert single string to list
-                # Validate that all filtered venues exist
-                valid_venues = []
-                invalid_venues = []
-                for venue in venues_filter:
-                    if venue in all_venues:
-                        valid_venues.append(venue)
-                    else:
-                        invalid_venues.append(venue)
-                
-                if invalid_venues:
-                    logger.warning(f"[REFRESH] Invalid venues in filter (will be ignored): {invalid_venues}")
-                
-                if valid_venues:
-                    all_venues = valid_venues
-                    logger.info(f"[REFRESH] Venue filter applied: {len(valid_venues)} venues selected: {valid_venues}")
-                else:
-                    logger.error(f"[REFRESH] No valid venues in filter! Using all venues instead.")
-                    all_venues = NYC_VENUES + LONDON_VENUES
-            else:
-                # Check for environment variable as fallback
-                import os
-                env_filter = os.getenv('CELERY_VENUES_FILTER')
-                if env_filter:
-                    env_venues = [v.strip() for v in env_filter.split(',')]
-                    valid_venues = [v for v in env_venues if v in all_venues]
-                    if valid_venues:
-                        all_venues = valid_venues
-                        logger.info(f"[REFRESH] Venue filter from environment variable: {len(valid_venues)} venues selected: {valid_venues}")
+            all_venues = select_refresh_venues(venues_filter)
             logger.info(f"[REFRESH] Total venues: {len(all_venues)} (NYC: {len(NYC_VENUES)}, London: {len(LONDON_VENUES)})")
             logger.info(f"[REFRESH] NYC venues: {NYC_VENUES}")
             logger.info(f"[REFRESH] London venues: {LONDON_VENUES}")
             
             # Scrape for guests 2 through 8
-            guest_counts = list(range(2, 9))  # [2, 3, 4, 5, 6, 7, 8]
+            guest_counts = list(REFRESH_GUEST_COUNTS)
             
-            # Venues that only support specific guest counts
-            # daysmart_chelsea only supports 2 guests
-            VENUE_GUEST_RESTRICTIONS = {
-                'daysmart_chelsea': [2]  # Only scrape for 2 guests
-            }
+            # Range-capable venues get one task per window of dates
+            window_days = max(1, RANGE_WINDOW_DAYS)
+            date_windows = [date_strings[i:i + window_days] for i in range(0, len(date_strings), window_days)]
+            
+            # Tasks report completion to this cycle's counters instead of a chord
+            cycle_id = refresh_cycles.new_cycle_id()
             
             # Create tasks at venue × guest × date level (not grouped by venue)
             all_tasks = []
@@ -2539,6 +3918,20 @@ def refresh_all_venues_task(self, venues_filter=None):
                     if guests not in allowed_guests:
                         continue
                     
+                    if venue in RANGE_SCRAPERS:
+                        for window in date_windows:
+                            all_tasks.append(
+                                scrape_venue_range_task.s(
+                                    guests=guests,
+                                    dates=window,
+                                    website=venue,
+                                    task_id=None,
+                                    cycle_id=cycle_id
+                                ).set(ignore_result=True)
+                            )
+                            venue_task_counts[venue] += 1
+                        continue
+                    
                     for date_str in date_strings:
                         all_tasks.append(
                             scrape_venue_task.s(
@@ -2552,8 +3945,9 @@ def refresh_all_venues_task(self, venues_filter=None):
                                 spin_time=None,
                                 clays_location=None,
                                 puttshack_location=None,
-                                f1_experience=None
-                            )
+                                f1_experience=None,
+                                cycle_id=cycle_id
+                            ).set(ignore_result=True)
                         )
                         venue_task_counts[venue] += 1
             
@@ -2602,18 +3996,18 @@ def refresh_all_venues_task(self, venues_filter=None):
             total_operations = total_tasks  # Each task is one operation
             
             # Calculate expected distribution
-            # Most venues support all guest counts, but daysmart_chelsea only supports 2
-            venues_with_all_guests = len(all_venues) - len(VENUE_GUEST_RESTRICTIONS)
-            venues_with_restrictions = len(VENUE_GUEST_RESTRICTIONS)
-            expected_per_guest_all_venues = venues_with_all_guests * len(date_strings)
-            expected_per_guest_restricted = sum(
-                len(restricted_guests) * len(date_strings)
-                for restricted_guests in VENUE_GUEST_RESTRICTIONS.values()
-            )
-            expected_total = expected_per_guest_all_venues * len(guest_counts) + expected_per_guest_restricted
+            # Most venues support all guest counts, but daysmart_chelsea only supports 2;
+            # range-capable venues need one task per window instead of one per date
+            expected_total = 0
+            for venue in all_venues:
+                venue_guests = [g for g in guest_counts if g in VENUE_GUEST_RESTRICTIONS.get(venue, guest_counts)]
+                per_guest = len(date_windows) if venue in RANGE_SCRAPERS else len(date_strings)
+                expected_total += len(venue_guests) * per_guest
+            range_venues = [v for v in all_venues if v in RANGE_SCRAPERS]
             
             logger.info(f"[REFRESH] Venue guest restrictions: {VENUE_GUEST_RESTRICTIONS}")
-            logger.info(f"[REFRESH] Expected tasks: {expected_total} (most venues: {venues_with_all_guests} × {len(guest_counts)} guests × {len(date_strings)} dates = {expected_per_guest_all_venues * len(guest_counts)}, restricted venues: {expected_per_guest_restricted})")
+            logger.info(f"[REFRESH] Range venues ({len(range_venues)}, {len(date_windows)} window(s) of up to {window_days} days): {range_venues}")
+            logger.info(f"[REFRESH] Expected tasks: {expected_total}")
             
             # Verify task creation and counts
             logger.info(f"[REFRESH] Total scraping operations: {total_operations}")
@@ -2624,12 +4018,17 @@ def refresh_all_venues_task(self, venues_filter=None):
                 logger.info(f"[REFRESH] Task count matches expected: {total_tasks}")
             logger.info(f"[REFRESH] IMPORTANT: All tasks are shuffled before submission. Execution order depends on worker concurrency and queue processing.")
             
-            # Use chord to wait for all tasks to complete, then trigger next cycle
-            # Pass venues_filter to callback so next cycle uses same filter
-            callback = trigger_next_refresh_cycle.s(venues_filter=venues_filter)
-            job = chord(all_tasks)(callback)
-            
-            logger.info(f"[REFRESH] All {total_tasks} tasks submitted (shuffled). Next cycle will start automatically when this cycle completes.")
+            if refresh_cycles.start_cycle(cycle_id, total_tasks, venues_filter=venues_filter):
+                # Results live in the database; each task only bumps the cycle counters.
+                # The next cycle (same filter) starts from the task that finishes the cycle.
+                for task in all_tasks:
+                    task.apply_async()
+                logger.info(f"[REFRESH] Cycle {cycle_id}: all {total_tasks} tasks submitted (shuffled). Next cycle will start automatically when this cycle completes.")
+            else:
+                # No Redis for the counters: fall back to a chord (results kept for the callback)
+                logger.warning(f"[REFRESH] Could not register cycle counters; falling back to a chord over {total_tasks} tasks")
+                callback = trigger_next_refresh_cycle.s(venues_filter=venues_filter)
+                chord([task.set(ignore_result=False) for task in all_tasks])(callback)
             
             return {
                 'status': 'submitted', 
@@ -2639,6 +4038,7 @@ def refresh_all_venues_task(self, venues_filter=None):
                 'tasks_created': total_tasks,
                 'total_operations': total_operations,
                 'shuffled': True,
+                'cycle_id': cycle_id,
                 'next_cycle': 'will_start_automatically'
             }
         except Exception as e:
@@ -2647,6 +4047,123 @@ def refresh_all_venues_task(self, venues_filter=None):
             raise e
 
 
+@celery_app.task(bind=True, name='app.dispatch_stale_refreshes_task')
+def dispatch_stale_refreshes_task(self, venues_filter=None):
+    """Periodic task (REFRESH_MODE=adaptive) that enqueues the most overdue
+    (website, date, guests) keys instead of sweeping every venue × guest × date.
+    
+    Each key is scored by refresh_scheduler.staleness (age / freshness target, so
+    near dates and venues whose slots change often come first). Keys already in
+    flight or backing off after failures are skipped, and at most
+    refresh_scheduler.dispatch_budget() tasks are enqueued per run. Range venues
+    get one scrape_venue_range_task per venue × guests carrying all their overdue
+    dates, which counts as one task.
+    """
+    with app.app_context():
+        try:
+            from datetime import date
+            logger = logging.getLogger(__name__)
+            
+            today = date.today()
+            now = datetime.utcnow()
+            days = [today + timedelta(days=i) for i in range(refresh_scheduler.REFRESH_HORIZON_DAYS)]
+            
+            # Rows from before json_fragment / the summary table existed; normally no-ops
+            backfill_slot_json_fragments()
+            rebuild_availability_summaries()
+            
+            all_venues = select_refresh_venues(venues_filter)
+            
+            def _load_states():
+                RefreshState.query.filter(RefreshState.date < today).delete(synchronize_session=False)
+                db.session.commit()
+                return {
+                    (state.website, state.date, state.guests): state
+                    for state in RefreshState.query.filter(RefreshState.date >= today, RefreshState.website.in_(all_venues))
+                }
+            states = retry_db_operation(_load_states)
+            
+            # In-flight tasks: range keys of one venue × guests share a task
+            in_flight_keys = [key for key, state in states.items() if refresh_scheduler.is_in_flight(state, now)]
+            in_flight = len({(website, guests) if website in RANGE_SCRAPERS else (website, day, guests) for website, day, guests in in_flight_keys})
+            budget = refresh_scheduler.dispatch_budget(in_flight)
+            
+            candidates = []
+            for venue in all_venues:
+                allowed_guests = VENUE_GUEST_RESTRICTIONS.get(venue, REFRESH_GUEST_COUNTS)
+                for guests in REFRESH_GUEST_COUNTS:
+                    if guests not in allowed_guests:
+                        continue
+                    for day in days:
+                        state = states.get((venue, day, guests))
+                        if refresh_scheduler.is_in_flight(state, now) or refresh_scheduler.is_backing_off(state, now):
+                            continue
+                        score = refresh_scheduler.staleness(state, day, today, now)
+                        if score >= 1:
+                            candidates.append((score, venue, day, guests))
+            candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+            
+            # Take the most stale keys until the budget is spent; range venues
+            # already being dispatched keep collecting dates for free
+            single_keys = []
+            range_groups = {}
+            for score, venue, day, guests in candidates:
+                if venue in RANGE_SCRAPERS:
+                    group = range_groups.get((venue, guests))
+                    if group is None:
+                        if len(single_keys) + len(range_groups) >= budget:
+                            continue
+                        group = range_groups[(venue, guests)] = []
+                    if len(group) < max(1, RANGE_WINDOW_DAYS):
+                        group.append(day)
+                elif len(single_keys) + len(range_groups) < budget:
+                    single_keys.append((venue, day, guests))
+            
+            dispatched_keys = single_keys + [(venue, day, guests) for (venue, guests), group in range_groups.items() for day in group]
+            
+            def _mark_dispatched():
+                try:
+                    for key in dispatched_keys:
+                        state = states.get(key)
+                        if state is None:
+                            website, day, guests = key
+                            state = states[key] = RefreshState(website=website, date=day, guests=guests, scrape_count=0, failure_count=0)
+                            db.session.add(state)
+                        state.dispatched_at = now
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    raise
+            retry_db_operation(_mark_dispatched)
+            
+            for venue, day, guests in single_keys:
+                scrape_venue_task.apply_async(
+                    kwargs={'guests': guests, 'target_date': day.isoformat(), 'website': venue, 'task_id': None},
+                    ignore_result=True
+                )
+            for (venue, guests), group in range_groups.items():
+                scrape_venue_range_task.apply_async(
+                    kwargs={'guests': guests, 'dates': [day.isoformat() for day in sorted(group)], 'website': venue, 'task_id': None},
+                    ignore_result=True
+                )
+            
+            logger.info(
+                f"[REFRESH] Dispatched {len(single_keys) + len(range_groups)} tasks covering {len(dispatched_keys)} keys "
+                f"({len(candidates)} overdue, {in_flight} in flight, budget {budget})"
+            )
+            return {
+                'status': 'dispatched',
+                'tasks': len(single_keys) + len(range_groups),
+                'keys': len(dispatched_keys),
+                'overdue': len(candidates),
+                'in_flight': in_flight,
+                'budget': budget
+            }
+        except Exception as e:
+            logger = logging.getLogger(__name__)
+            logger.error(f"[REFRESH] Error in dispatch_stale_refreshes_task: {e}", exc_info=True)
+            raise e
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=8010)
 
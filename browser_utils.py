@@ -2,11 +2,14 @@
 Playwright browser management utilities
 Replaces Selenium driver creation with Playwright browser instances
 """
+import os
+import re
 import threading
 import platform
 import logging
 from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
 from typing import Optional
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +27,9 @@ logger = logging.getLogger(__name__)
 #   - CPU saturation
 _browser_semaphore = threading.Semaphore(15)  
 
+# User agent for browser contexts (also reused by HTTP scrapers that bootstrap cookies from a browser)
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
 # Global Playwright instance (one per process)
 _playwright_instance = None
 _playwright_lock = threading.Lock()
@@ -104,12 +110,225 @@ def create_browser(headless: bool = None, **kwargs) -> Browser:
         raise
 
 
-def create_browser_context(browser: Browser, **kwargs) -> BrowserContext:
+# ---------------------------------------------------------------------------
+# Network resource blocking
+# ---------------------------------------------------------------------------
+#
+# Scrapers only read DOM text or JSON, so images, fonts, media, analytics and
+# chat widgets are pure overhead. A blocking profile aborts those requests via
+# context.route() before they leave the browser.
+#
+# Profile keys:
+#   resource_types  - Playwright resource types to abort (image, font, media, stylesheet, ...)
+#   blocked_domains - third-party domains to abort (suffix match, e.g. "hotjar.com")
+#   url_patterns    - regexes matched against the full request URL
+#   allowed_domains - optional allowlist; when set, any non-document request to a
+#                     domain not on the list is aborted
+#
+# Set BROWSER_BLOCKING_REPORT=1 to log requests/bytes saved for every scrape.
+
+BROWSER_BLOCKING_REPORT = os.getenv('BROWSER_BLOCKING_REPORT', '0').lower() in ('1', 'true', 'yes')
+
+# Analytics, ads, tag managers and chat/popup widgets seen on the venue sites
+TRACKER_DOMAINS = [
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googleadservices.com',
+    'googlesyndication.com', 'facebook.net', 'facebook.com', 'connect.facebook.net',
+    'hotjar.com', 'hotjar.io', 'clarity.ms', 'bing.com', 'segment.com', 'segment.io',
+    'mixpanel.com', 'hubspot.com', 'hs-scripts.com', 'hs-analytics.net', 'hsforms.net',
+    'intercom.io', 'intercomcdn.com', 'zendesk.com', 'zdassets.com', 'drift.com',
+    'getsitecontrol.com', 'klaviyo.com', 'tiktok.com', 'analytics.tiktok.com',
+    'snapchat.com', 'sc-static.net', 'pinterest.com', 'pinimg.com', 'twitter.com',
+    'ads-twitter.com', 'linkedin.com', 'licdn.com', 'criteo.com', 'taboola.com',
+    'onetrust.com', 'cookielaw.org', 'cookiebot.com', 'trustpilot.com', 'newrelic.com',
+    'nr-data.net', 'fullstory.com', 'quantserve.com', 'adsrvr.org', 'yandex.ru',
+]
+
+BLOCKING_PROFILES = {
+    # No interception at all
+    'none': {},
+    # Heavy static assets only - safe for any DOM-text scraper
+    'minimal': {
+        'resource_types': {'image', 'media', 'font'},
+    },
+    # Static assets plus analytics/ads/chat widgets
+    'standard': {
+        'resource_types': {'image', 'media', 'font'},
+        'blocked_domains': TRACKER_DOMAINS,
+        'url_patterns': [r'/gtag/js', r'/analytics\.js', r'/fbevents\.js', r'\.(?:mp4|webm|gif)(?:\?|$)'],
+    },
+    # Also drop stylesheets - only for scrapers that never rely on visibility/layout
+    'aggressive': {
+        'resource_types': {'image', 'media', 'font', 'stylesheet', 'manifest', 'texttrack', 'eventsource'},
+        'blocked_domains': TRACKER_DOMAINS,
+        'url_patterns': [r'/gtag/js', r'/analytics\.js', r'/fbevents\.js'],
+    },
+}
+
+# Rough average transfer sizes used to estimate bytes saved for aborted requests
+_ESTIMATED_RESOURCE_BYTES = {
+    'image': 60_000,
+    'media': 500_000,
+    'font': 40_000,
+    'stylesheet': 30_000,
+    'script': 50_000,
+    'xhr': 2_000,
+    'fetch': 2_000,
+    'other': 5_000,
+}
+
+
+def _domain_matches(host: str, domains) -> bool:
+    return any(host == d or host.endswith('.' + d) for d in domains)
+
+
+class ResourceBlockStats:
+    """Per-context counters for blocked and allowed requests"""
+
+    def __init__(self, profile_name: str):
+        self.profile_name = profile_name
+        self.blocked_requests = 0
+        self.allowed_requests = 0
+        self.estimated_bytes_saved = 0
+        self.allowed_bytes = 0
+        self.blocked_by_reason = {}
+        self.blocked_by_type = {}
+
+    def record_blocked(self, resource_type: str, reason: str):
+        self.blocked_requests += 1
+        self.estimated_bytes_saved += _ESTIMATED_RESOURCE_BYTES.get(resource_type, _ESTIMATED_RESOURCE_BYTES['other'])
+        self.blocked_by_reason[reason] = self.blocked_by_reason.get(reason, 0) + 1
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            'profile': self.profile_name,
+            'blocked_requests': self.blocked_requests,
+            'allowed_requests': self.allowed_requests,
+            'estimated_bytes_saved': self.estimated_bytes_saved,
+            'allowed_bytes': self.allowed_bytes,
+            'blocked_by_reason': dict(self.blocked_by_reason),
+            'blocked_by_type': dict(self.blocked_by_type),
+        }
+
+
+def resolve_blocking_profile(profile):
+    """
+    Resolve a profile name or dict into (name, compiled profile).
+
+    Returns:
+        Tuple of (name, dict) or (name, None) when nothing should be blocked
+    """
+    if profile is None:
+        profile = os.getenv('BROWSER_BLOCKING_PROFILE', 'none')
+    if isinstance(profile, str):
+        name = profile
+        if name not in BLOCKING_PROFILES:
+            logger.warning(f"[BROWSER] Unknown blocking profile '{name}', not blocking anything")
+            return name, None
+        spec = BLOCKING_PROFILES[name]
+    else:
+        name = profile.get('name', 'custom')
+        spec = profile
+
+    compiled = {
+        'resource_types': set(spec.get('resource_types') or ()),
+        'blocked_domains': tuple(spec.get('blocked_domains') or ()),
+        'url_patterns': [re.compile(p) for p in spec.get('url_patterns') or ()],
+        'allowed_domains': tuple(spec.get('allowed_domains') or ()),
+    }
+    if not any(compiled.values()):
+        return name, None
+    return name, compiled
+
+
+def install_resource_blocking(context: BrowserContext, profile, report: bool = None) -> Optional[ResourceBlockStats]:
+    """
+    Install a request interception route on a context according to a blocking profile.
+
+    Args:
+        context: BrowserContext to install the route on
+        profile: Profile name from BLOCKING_PROFILES or a custom profile dict
+        report: Also count allowed requests/bytes (defaults to BROWSER_BLOCKING_REPORT)
+
+    Returns:
+        ResourceBlockStats for the context, or None if the profile blocks nothing
+    """
+    name, spec = resolve_blocking_profile(profile)
+    if spec is None:
+        return None
+
+    if report is None:
+        report = BROWSER_BLOCKING_REPORT
+
+    stats = ResourceBlockStats(name)
+    resource_types = spec['resource_types']
+    blocked_domains = spec['blocked_domains']
+    url_patterns = spec['url_patterns']
+    allowed_domains = spec['allowed_domains']
+
+    def block_reason(request):
+        resource_type = request.resource_type
+        if resource_type in resource_types:
+            return f'type:{resource_type}'
+        url = request.url
+        host = (urlsplit(url).hostname or '').lower()
+        if blocked_domains and _domain_matches(host, blocked_domains):
+            return 'domain'
+        if allowed_domains and resource_type != 'document' and not _domain_matches(host, allowed_domains):
+            return 'not_allowed'
+        for pattern in url_patterns:
+            if pattern.search(url):
+                return 'pattern'
+        return None
+
+    def handle_route(route, request):
+        try:
+            reason = block_reason(request)
+        except Exception:
+            reason = None
+        if reason:
+            stats.record_blocked(request.resource_type, reason)
+            route.abort()
+        else:
+            stats.allowed_requests += 1
+            route.continue_()
+
+    context.route('**/*', handle_route)
+
+    if report:
+        def on_response(response):
+            try:
+                length = response.headers.get('content-length')
+                if length:
+                    stats.allowed_bytes += int(length)
+            except Exception:
+                pass
+        context.on('response', on_response)
+
+    return stats
+
+
+def log_resource_block_stats(context: Optional[BrowserContext], label: str = ''):
+    """Log what a context's blocking profile saved (reporting mode only)"""
+    stats = getattr(context, 'resource_block_stats', None) if context is not None else None
+    if stats is None or not BROWSER_BLOCKING_REPORT:
+        return
+    prefix = f"[BROWSER BLOCKING] {label} " if label else "[BROWSER BLOCKING] "
+    logger.info(
+        f"{prefix}profile={stats.profile_name} blocked={stats.blocked_requests} "
+        f"allowed={stats.allowed_requests} est_saved={stats.estimated_bytes_saved / 1024:.0f}KB "
+        f"downloaded={stats.allowed_bytes / 1024:.0f}KB by_type={stats.blocked_by_type}"
+    )
+
+
+def create_browser_context(browser: Browser, blocking_profile=None, **kwargs) -> BrowserContext:
     """
     Create a browser context with default settings.
     
     Args:
         browser: Browser instance
+        blocking_profile: Name from BLOCKING_PROFILES or a custom profile dict
+            (None = BROWSER_BLOCKING_PROFILE env var, default no blocking)
         **kwargs: Additional context options
     
     Returns:
@@ -117,12 +336,13 @@ def create_browser_context(browser: Browser, **kwargs) -> BrowserContext:
     """
     context_options = {
         'viewport': {'width': 1920, 'height': 1080},
-        'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'user_agent': DEFAULT_USER_AGENT,
     }
     context_options.update(kwargs)
     
     logger.info("[BROWSER] Creating browser context...")
     context = browser.new_context(**context_options)
+    context.resource_block_stats = install_resource_blocking(context, blocking_profile)
     logger.info("[BROWSER] Browser context created")
     
     return context
@@ -146,6 +366,17 @@ def create_page(context: BrowserContext, timeout: int = 30000) -> Page:
     return page
 
 
+# Known context options that should not be passed to browser.launch()
+_CONTEXT_ONLY_KEYS = {'user_agent', 'viewport', 'locale', 'timezone_id', 'geolocation',
+                      'permissions', 'color_scheme', 'reduced_motion', 'forced_colors',
+                      'accept_downloads', 'has_touch', 'is_mobile', 'device_scale_factor',
+                      'screen', 'extra_http_headers', 'http_credentials', 'ignore_https_errors',
+                      'bypass_csp', 'java_script_enabled', 'record_video',
+                      'record_har_path', 'storage_state', 'base_url', 'tracing',
+                      # Handled by create_browser_context() itself
+                      'blocking_profile'}
+
+
 def create_browser_with_context(headless: bool = None, **kwargs):
     """
     Convenience function to create both browser and context.
@@ -163,19 +394,11 @@ def create_browser_with_context(headless: bool = None, **kwargs):
     context_options = {}
     browser_options = {}
     
-    # Known context options that should not be passed to browser.launch()
-    context_only_keys = {'user_agent', 'viewport', 'locale', 'timezone_id', 'geolocation', 
-                        'permissions', 'color_scheme', 'reduced_motion', 'forced_colors',
-                        'accept_downloads', 'has_touch', 'is_mobile', 'device_scale_factor',
-                        'screen', 'extra_http_headers', 'http_credentials', 'ignore_https_errors',
-                        'bypass_csp', 'java_script_enabled', 'bypass_csp', 'record_video',
-                        'record_har_path', 'storage_state', 'base_url', 'tracing'}
-    
     for key, value in kwargs.items():
         # Skip None values
         if value is None:
             continue
-        if key in context_only_keys:
+        if key in _CONTEXT_ONLY_KEYS:
             context_options[key] = value
         else:
             browser_options[key] = value
@@ -184,3 +407,257 @@ def create_browser_with_context(headless: bool = None, **kwargs):
     context = create_browser_context(browser, **context_options)
     return browser, context
 
+
+# ---------------------------------------------------------------------------
+# Browser pool
+# ---------------------------------------------------------------------------
+#
+# Launching Chromium costs ~1-2s (plus the Linux settle sleep above) and a
+# refresh cycle runs thousands of scrapes. Each worker process therefore keeps
+# a few warm browsers and hands out a fresh, isolated BrowserContext per
+# scrape. Contexts never share cookies/storage, so scrapers behave exactly as
+# they did with a dedicated browser.
+#
+# Tuning (environment variables):
+#   BROWSER_POOL_ENABLED   - set to "0" to fall back to one browser per scrape
+#   BROWSER_POOL_SIZE      - warm browsers kept per worker process (default 2)
+#   BROWSER_POOL_MAX_USES  - contexts served before a browser is recycled (default 50)
+#
+# Pooled browsers still count against _browser_semaphore while they are alive.
+
+BROWSER_POOL_ENABLED = os.getenv('BROWSER_POOL_ENABLED', '1').lower() not in ('0', 'false', 'no')
+BROWSER_POOL_SIZE = int(os.getenv('BROWSER_POOL_SIZE', '2'))
+BROWSER_POOL_MAX_USES = int(os.getenv('BROWSER_POOL_MAX_USES', '50'))
+
+
+class _PooledBrowser:
+    """Bookkeeping for one warm browser owned by the pool"""
+
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.uses = 0
+        self.active_leases = 0
+        self.retiring = False
+        self.crashed = False
+        browser.on('disconnected', self._on_disconnected)
+
+    def _on_disconnected(self, *args):
+        self.crashed = True
+
+    def is_healthy(self) -> bool:
+        if self.crashed or self.retiring:
+            return False
+        try:
+            return self.browser.is_connected()
+        except Exception:
+            return False
+
+
+class BrowserPool:
+    """
+    Per-process pool of warm Chromium browsers.
+
+    Scrapers lease a new BrowserContext via lease() and hand it back with
+    release(). Browsers are health-checked on every lease, recycled after
+    max_uses contexts, and relaunched transparently if they crash.
+    """
+
+    def __init__(self, headless: bool = None, size: int = BROWSER_POOL_SIZE, max_uses: int = BROWSER_POOL_MAX_USES):
+        self.headless = headless
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self._browsers = []
+        self._lock = threading.Lock()
+
+    def _launch(self) -> _PooledBrowser:
+        logger.info(f"[BROWSER POOL] Launching warm browser ({len(self._browsers) + 1}/{self.size})")
+        entry = _PooledBrowser(create_browser(headless=self.headless))
+        self._browsers.append(entry)
+        return entry
+
+    def _discard(self, entry: _PooledBrowser):
+        if entry in self._browsers:
+            self._browsers.remove(entry)
+        try:
+            entry.browser.close()
+        except Exception as e:
+            logger.warning(f"[BROWSER POOL] Error closing browser: {e}")
+
+    def _prune(self):
+        """Drop crashed browsers and close retiring ones that are no longer leased"""
+        for entry in list(self._browsers):
+            if entry.crashed or (entry.retiring and entry.active_leases == 0):
+                if entry.crashed:
+                    logger.warning("[BROWSER POOL] Browser crashed or disconnected, removing from pool")
+                else:
+                    logger.info(f"[BROWSER POOL] Recycling browser after {entry.uses} uses")
+                self._discard(entry)
+
+    def _pick(self) -> _PooledBrowser:
+        self._prune()
+        healthy = [b for b in self._browsers if b.is_healthy()]
+        idle = [b for b in healthy if b.active_leases == 0]
+        if idle:
+            return idle[0]
+        if len(self._browsers) < self.size:
+            return self._launch()
+        if healthy:
+            # Pool is full and every browser is busy - share the least loaded one
+            return min(healthy, key=lambda b: b.active_leases)
+        # Everything is retiring but still leased; launch an extra browser
+        return self._launch()
+
+    def lease(self, **context_options):
+        """
+        Lease a fresh BrowserContext from a warm browser.
+
+        Returns:
+            Tuple of (Browser, BrowserContext)
+        """
+        with self._lock:
+            last_error = None
+            for attempt in range(2):
+                entry = self._pick()
+                try:
+                    context = create_browser_context(entry.browser, **context_options)
+                except Exception as e:
+                    # Crash recovery: drop the broken browser and retry on a new one
+                    last_error = e
+                    logger.warning(f"[BROWSER POOL] Could not create context (attempt {attempt + 1}): {e}")
+                    entry.crashed = True
+                    continue
+
+                entry.uses += 1
+                entry.active_leases += 1
+                if entry.uses >= self.max_uses:
+                    entry.retiring = True
+                return entry.browser, context
+            raise last_error
+
+    def release(self, browser: Browser, context: BrowserContext = None):
+        """Close a leased context and return its browser to the pool"""
+        if context is not None:
+            try:
+                context.close()
+            except Exception as e:
+                logger.warning(f"[BROWSER POOL] Error closing context: {e}")
+
+        with self._lock:
+            for entry in self._browsers:
+                if entry.browser is browser:
+                    entry.active_leases = max(0, entry.active_leases - 1)
+                    break
+            self._prune()
+
+    def close_all(self):
+        """Close every browser in the pool (worker shutdown)"""
+        with self._lock:
+            for entry in list(self._browsers):
+                self._discard(entry)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'size': self.size,
+                'max_uses': self.max_uses,
+                'browsers': [
+                    {
+                        'uses': b.uses,
+                        'active_leases': b.active_leases,
+                        'retiring': b.retiring,
+                        'healthy': b.is_healthy(),
+                    }
+                    for b in self._browsers
+                ],
+            }
+
+
+# One pool per (process, headless mode). The pid check matters under Celery
+# prefork: a pool inherited through fork() holds a Playwright connection that
+# belongs to the parent process and must not be reused.
+_browser_pools = {}
+_browser_pools_pid = None
+_browser_pools_lock = threading.Lock()
+
+
+def get_browser_pool(headless: bool = None) -> BrowserPool:
+    """Get (or lazily create) this process's browser pool"""
+    global _browser_pools, _browser_pools_pid, _playwright_instance
+
+    if headless is None:
+        headless = platform.system() == 'Linux'
+
+    with _browser_pools_lock:
+        if _browser_pools_pid != os.getpid():
+            if _browser_pools_pid is not None:
+                _playwright_instance = None
+            _browser_pools = {}
+            _browser_pools_pid = os.getpid()
+        pool = _browser_pools.get(headless)
+        if pool is None:
+            pool = BrowserPool(headless=headless)
+            _browser_pools[headless] = pool
+        return pool
+
+
+def shutdown_browser_pools():
+    """Close all pooled browsers owned by this process"""
+    with _browser_pools_lock:
+        if _browser_pools_pid != os.getpid():
+            return
+        pools = list(_browser_pools.values())
+    for pool in pools:
+        pool.close_all()
+
+
+def lease_browser_context(headless: bool = None, **kwargs):
+    """
+    Drop-in replacement for create_browser_with_context() backed by the pool.
+
+    Browser launch options cannot be applied to an already running browser, so
+    if any are given (or the pool is disabled) a dedicated browser is launched
+    instead. Always hand the result back with release_browser_context().
+
+    Returns:
+        Tuple of (Browser, BrowserContext)
+    """
+    has_launch_options = any(
+        value is not None and key not in _CONTEXT_ONLY_KEYS
+        for key, value in kwargs.items()
+    )
+    if not BROWSER_POOL_ENABLED or has_launch_options:
+        return create_browser_with_context(headless=headless, **kwargs)
+
+    context_options = {k: v for k, v in kwargs.items() if v is not None}
+    return get_browser_pool(headless).lease(**context_options)
+
+
+def release_browser_context(browser: Optional[Browser], context: Optional[BrowserContext] = None, label: str = ''):
+    """Release a (Browser, BrowserContext) pair obtained from lease_browser_context()"""
+    log_resource_block_stats(context, label)
+
+    if browser is None:
+        if context is not None:
+            try:
+                context.close()
+            except Exception as e:
+                logger.warning(f"[BROWSER] Error closing context: {e}")
+        return
+
+    with _browser_pools_lock:
+        pools = list(_browser_pools.values()) if _browser_pools_pid == os.getpid() else []
+    for pool in pools:
+        if any(entry.browser is browser for entry in pool._browsers):
+            pool.release(browser, context)
+            return
+
+    # Not pooled - dedicated browser from create_browser_with_context()
+    if context is not None:
+        try:
+            context.close()
+        except Exception as e:
+            logger.warning(f"[BROWSER] Error closing context: {e}")
+    try:
+        browser.close()
+    except Exception as e:
+        logger.warning(f"[BROWSER] Error closing browser: {e}")
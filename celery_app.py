@@ -38,6 +38,61 @@ else:
     worker_pool = 'prefork'
     worker_concurrency = 4
 
+# Task routing: venues whose scrapers only make HTTP calls go to a lightweight
+# high-concurrency queue (threads pool), Playwright venues to a memory-bounded
+# prefork queue, and orchestration tasks (refresh cycles, chord callbacks) stay
+# on the default queue. A worker started without -Q consumes all three, so a
+# single worker keeps working; see CONCURRENCY_GUIDE.md for split workers.
+from kombu import Queue
+
+DEFAULT_QUEUE = 'celery'
+HTTP_QUEUE = os.getenv('CELERY_HTTP_QUEUE', 'scrape_http')
+BROWSER_QUEUE = os.getenv('CELERY_BROWSER_QUEUE', 'scrape_browser')
+
+# Website prefixes of venues whose scrapers never start Playwright. Sync
+# Playwright objects are bound to the thread that created them, so anything
+# that opens a browser (even just for page.request.get, like five_iron_golf)
+# must stay off the threads pool.
+HTTP_VENUE_PREFIXES = tuple(
+    v.strip() for v in os.getenv('CELERY_HTTP_VENUES', 'allstarlanes_,daysmart_,pingpong').split(',') if v.strip()
+)
+HTTP_TASKS = {
+    'app.scrape_allstarlanes_task',
+    'app.scrape_daysmart_chelsea_task',
+    'app.scrape_pingpong_task',
+}
+# Positional index of `website` in the generic venue tasks
+VENUE_TASK_WEBSITE_ARG = {
+    'app.scrape_venue_task': 2,  # (guests, target_date, website, ...)
+    'app.scrape_venue_range_task': 2,  # (guests, dates, website, ...)
+}
+
+
+def is_http_venue(website):
+    return bool(website) and website.startswith(HTTP_VENUE_PREFIXES)
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """Pick the queue for a task from its name and, for venue tasks, its website"""
+    if name in VENUE_TASK_WEBSITE_ARG:
+        position = VENUE_TASK_WEBSITE_ARG[name]
+        website = (kwargs or {}).get('website')
+        if website is None and args and len(args) > position:
+            website = args[position]
+        return {'queue': HTTP_QUEUE if is_http_venue(website) else BROWSER_QUEUE}
+    if name in HTTP_TASKS:
+        return {'queue': HTTP_QUEUE}
+    if name.startswith('app.scrape_') and name != 'app.scrape_all_venues_task':
+        return {'queue': BROWSER_QUEUE}
+    return {'queue': DEFAULT_QUEUE}
+
+
+celery_app.conf.update(
+    task_queues=(Queue(DEFAULT_QUEUE), Queue(HTTP_QUEUE), Queue(BROWSER_QUEUE)),
+    task_default_queue=DEFAULT_QUEUE,
+    task_routes=(route_task,),
+)
+
 celery_app.conf.update(
     task_serializer='json',
     accept_content=['json'],
@@ -51,10 +106,35 @@ celery_app.conf.update(
     worker_pool=worker_pool,
     worker_concurrency=worker_concurrency,
     worker_max_tasks_per_child=10 if worker_pool != 'solo' else None,
+    # Recycle a prefork child once its resident memory passes this (KB); 0 = no limit
+    worker_max_memory_per_child=int(os.getenv('CELERY_MAX_MEMORY_PER_CHILD_KB', '0')) or None,
 )
 
 # Celery Beat schedule for periodic tasks
-# DISABLED: Automatic refresh is disabled - task will only run when manually triggered
+# REFRESH_MODE=adaptive (default): Beat runs the freshness dispatcher every
+# REFRESH_DISPATCH_INTERVAL seconds (see refresh_scheduler.py).
+# REFRESH_MODE=sweep: the full venue × guest × date sweep is started on Beat
+# startup and chains itself; Beat only runs a watchdog for stalled cycles (the
+# fixed 30-minute sweep below stays disabled).
+from refresh_scheduler import REFRESH_MODE, REFRESH_DISPATCH_INTERVAL
+
+if REFRESH_MODE == 'adaptive':
+    celery_app.conf.beat_schedule = {
+        'dispatch-stale-refreshes': {
+            'task': 'app.dispatch_stale_refreshes_task',
+            'schedule': REFRESH_DISPATCH_INTERVAL,
+        },
+    }
+else:
+    # Starts the next sweep cycle if the current one stalls (see refresh_cycles.py)
+    from refresh_cycles import REFRESH_CYCLE_CHECK_INTERVAL
+    celery_app.conf.beat_schedule = {
+        'check-refresh-cycle': {
+            'task': 'app.check_refresh_cycle_task',
+            'schedule': REFRESH_CYCLE_CHECK_INTERVAL,
+        },
+    }
+
 # celery_app.conf.beat_schedule = {
 #     'refresh-all-venues': {
 #         'task': 'app.refresh_all_venues_task',
@@ -77,6 +157,19 @@ def on_worker_ready(sender=None, **kwargs):
         import warnings
         warnings.warn(f"Could not clean up old slots on worker startup: {e}")
 
+# Close pooled browsers when a worker child exits (max_tasks_per_child recycle or shutdown)
+from celery.signals import worker_process_shutdown
+
+@worker_process_shutdown.connect
+def on_worker_process_shutdown(sender=None, **kwargs):
+    """Close this process's warm browsers so Chromium processes are not orphaned"""
+    try:
+        from browser_utils import shutdown_browser_pools
+        shutdown_browser_pools()
+    except Exception as e:
+        import warnings
+        warnings.warn(f"Could not shut down browser pool: {e}")
+
 # Trigger task immediately when Beat starts (only once on startup)
 from celery.signals import beat_init
 
@@ -85,13 +178,19 @@ def on_beat_init(sender=None, **kwargs):
     """Trigger initial refresh cycle immediately when Beat starts.
     The cycle will automatically trigger the next cycle when it completes.
     Can filter venues using CELERY_VENUES_FILTER environment variable (comma-separated list).
+    In adaptive mode the dispatcher is run once right away instead (it reads the same filter).
     
     To hardcode specific venues, uncomment and modify the venues_filter line below.
     """
     try:
-        from app import refresh_all_venues_task
+        from app import refresh_all_venues_task, dispatch_stale_refreshes_task
         import os
         
+        if REFRESH_MODE == 'adaptive':
+            result = dispatch_stale_refreshes_task.delay()
+            print(f"[Beat Startup] ✓ Adaptive refresh: dispatched stale keys (ID: {result.id}); dispatcher runs every {REFRESH_DISPATCH_INTERVAL:g}s")
+            return
+        
         # OPTION 1: Use environment variable (recommended for flexibility)
         venues_filter = None
         env_filter = os.getenv('CELERY_VENUES_FILTER')
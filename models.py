@@ -3,9 +3,63 @@ from datetime import datetime
 from sqlalchemy import Index, UniqueConstraint
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 db = SQLAlchemy()
 
 
+def dumps_json(obj):
+    """Compact JSON text, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def slot_api_fields(venue_name, date, time, price, status, guests, city, booking_url=None,
+                    venue_specific_data=None, timestamp=None, last_updated=None, price_amount=None,
+                    price_currency=None, price_basis=None, start_minutes=None, **_ignored):
+    """API representation of a slot from its column values (everything but id)"""
+    venue_specific = None
+    if venue_specific_data:
+        try:
+            venue_specific = json.loads(venue_specific_data)
+        except (json.JSONDecodeError, TypeError):
+            # If JSON parsing fails, return as string or None
+            venue_specific = None
+    
+    return {
+        'venue_name': venue_name,
+        'date': date.isoformat() if date else None,
+        'time': time,
+        'start_minutes': start_minutes,
+        'price': price,
+        'price_amount': price_amount,
+        'price_currency': price_currency,
+        'price_basis': price_basis,
+        'status': status,
+        'timestamp': timestamp.isoformat() if timestamp else None,
+        'last_updated': last_updated.isoformat() if last_updated else None,
+        'guests': guests,
+        'city': city,
+        'booking_url': booking_url,
+        'venue_specific_data': venue_specific,
+        'website': venue_name  # Add website field for compatibility
+    }
+
+
+def slot_json_fragment(**columns):
+    """Pre-serialized JSON object of slot_api_fields(**columns), stored in json_fragment"""
+    return dumps_json(slot_api_fields(**columns))
+
+
+def slot_json(slot_id, fragment):
+    """Full API JSON for a slot: its stored fragment with the id spliced in front"""
+    return '{"id":%d,%s' % (slot_id, fragment[1:])
+
+
 class AvailabilitySlot(db.Model):
     """Model for storing availability slot data"""
     __tablename__ = 'availability_slots'
@@ -13,8 +67,12 @@ class AvailabilitySlot(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     venue_name = db.Column(db.String(200), nullable=False, index=True)
     date = db.Column(db.Date, nullable=False, index=True)
-    time = db.Column(db.String(50), nullable=False)
-    price = db.Column(db.String(200))
+    time = db.Column(db.String(50), nullable=False)  # Raw label as scraped
+    start_minutes = db.Column(db.Integer)  # Minutes after midnight, parsed from time at ingest (None if unparseable)
+    price = db.Column(db.String(200))  # Raw label as scraped
+    price_amount = db.Column(db.Float, index=True)  # Parsed from price at ingest (slot_normalization)
+    price_currency = db.Column(db.String(3))
+    price_basis = db.Column(db.String(20))  # per_person, per_lane, ... or None if not stated
     status = db.Column(db.String(100), nullable=False, index=True)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -22,39 +80,44 @@ class AvailabilitySlot(db.Model):
     city = db.Column(db.String(50), nullable=False, index=True)
     venue_specific_data = db.Column(db.Text)  # JSON string for options like lawn_club_option, clays_location, etc.
     booking_url = db.Column(db.String(500))
+    removed_at = db.Column(db.DateTime, index=True)  # Set when a scrape snapshot no longer contains the slot
+    json_fragment = db.Column(db.Text)  # to_dict() minus id, serialized at write time for the data API
+    change_version = db.Column(db.Integer, index=True)  # DataVersion 'slots' value of the last write to this row
     
     # Composite unique constraint to prevent duplicates
     __table_args__ = (
         UniqueConstraint('venue_name', 'date', 'time', 'guests', name='uq_venue_date_time_guests'),
         Index('idx_venue_city_date', 'venue_name', 'city', 'date'),
+        Index('idx_city_guests_date_start', 'city', 'guests', 'date', 'start_minutes'),
     )
     
-    def to_dict(self):
-        """Convert model instance to dictionary"""
-        venue_specific = None
-        if self.venue_specific_data:
-            try:
-                venue_specific = json.loads(self.venue_specific_data)
-            except (json.JSONDecodeError, TypeError):
-                # If JSON parsing fails, return as string or None
-                venue_specific = None
-        
+    def _column_values(self):
         return {
-            'id': self.id,
             'venue_name': self.venue_name,
-            'date': self.date.isoformat() if self.date else None,
+            'date': self.date,
             'time': self.time,
+            'start_minutes': self.start_minutes,
             'price': self.price,
+            'price_amount': self.price_amount,
+            'price_currency': self.price_currency,
+            'price_basis': self.price_basis,
             'status': self.status,
-            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
-            'last_updated': self.last_updated.isoformat() if self.last_updated else None,
             'guests': self.guests,
             'city': self.city,
             'booking_url': self.booking_url,
-            'venue_specific_data': venue_specific,
-            'website': self.venue_name  # Add website field for compatibility
+            'venue_specific_data': self.venue_specific_data,
+            'timestamp': self.timestamp,
+            'last_updated': self.last_updated,
         }
     
+    def to_dict(self):
+        """Convert model instance to dictionary"""
+        return {'id': self.id, **slot_api_fields(**self._column_values())}
+    
+    def refresh_json_fragment(self):
+        """Recompute json_fragment from the current column values (call after changing them)"""
+        self.json_fragment = slot_json_fragment(**self._column_values())
+    
     def set_venue_specific_data(self, data):
         """Set venue-specific data as JSON string"""
         if data:
@@ -69,6 +132,101 @@ class AvailabilitySlot(db.Model):
         return None
 
 
+class VenueMetadata(db.Model):
+    """Per-venue attributes used for filtering slots in SQL (joined on venue_name)"""
+    __tablename__ = 'venue_metadata'
+    
+    venue_name = db.Column(db.String(200), primary_key=True)
+    neighborhood = db.Column(db.String(100), index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def to_dict(self):
+        """Convert model instance to dictionary"""
+        return {
+            'venue_name': self.venue_name,
+            'neighborhood': self.neighborhood,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class AvailabilitySummary(db.Model):
+    """Per venue × date × guests aggregate of visible slots, kept in step with slot writes"""
+    __tablename__ = 'availability_summaries'
+    
+    venue_name = db.Column(db.String(200), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    guests = db.Column(db.Integer, primary_key=True)
+    city = db.Column(db.String(50), nullable=False)
+    slot_count = db.Column(db.Integer, nullable=False, default=0)
+    available_count = db.Column(db.Integer, nullable=False, default=0)
+    earliest_time = db.Column(db.String(50))
+    earliest_minutes = db.Column(db.Integer)
+    latest_time = db.Column(db.String(50))
+    latest_minutes = db.Column(db.Integer)
+    min_price = db.Column(db.Float)
+    min_price_label = db.Column(db.String(200))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        Index('idx_summary_city_guests_date', 'city', 'guests', 'date'),
+    )
+    
+    def to_dict(self):
+        """Convert model instance to dictionary"""
+        return {
+            'venue_name': self.venue_name,
+            'date': self.date.isoformat() if self.date else None,
+            'guests': self.guests,
+            'city': self.city,
+            'slot_count': self.slot_count,
+            'available_count': self.available_count,
+            'earliest_time': self.earliest_time,
+            'latest_time': self.latest_time,
+            'min_price': self.min_price,
+            'min_price_label': self.min_price_label,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class RefreshState(db.Model):
+    """Scrape freshness of one (website, date, guests) key, used by refresh_scheduler"""
+    __tablename__ = 'refresh_states'
+    
+    website = db.Column(db.String(100), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    guests = db.Column(db.Integer, primary_key=True)
+    last_scraped_at = db.Column(db.DateTime)  # Last successful scrape
+    last_changed_at = db.Column(db.DateTime)  # Last scrape that changed stored slots
+    last_attempt_at = db.Column(db.DateTime)  # Last scrape, successful or not
+    dispatched_at = db.Column(db.DateTime)  # Last time the scheduler enqueued this key
+    change_rate = db.Column(db.Float)  # EWMA share of scrapes that found changes
+    scrape_count = db.Column(db.Integer, default=0, nullable=False)
+    failure_count = db.Column(db.Integer, default=0, nullable=False)  # Consecutive failures
+    
+    def to_dict(self):
+        """Convert model instance to dictionary"""
+        return {
+            'website': self.website,
+            'date': self.date.isoformat() if self.date else None,
+            'guests': self.guests,
+            'last_scraped_at': self.last_scraped_at.isoformat() if self.last_scraped_at else None,
+            'last_changed_at': self.last_changed_at.isoformat() if self.last_changed_at else None,
+            'last_attempt_at': self.last_attempt_at.isoformat() if self.last_attempt_at else None,
+            'dispatched_at': self.dispatched_at.isoformat() if self.dispatched_at else None,
+            'change_rate': self.change_rate,
+            'scrape_count': self.scrape_count,
+            'failure_count': self.failure_count
+        }
+
+
+class DataVersion(db.Model):
+    """Named monotonic counters (e.g. 'slots': the slot change version)"""
+    __tablename__ = 'data_versions'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+
 class ScrapingTask(db.Model):
     """Model for tracking scraping tasks"""
     __tablename__ = 'scraping_tasks'
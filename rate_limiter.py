@@ -0,0 +1,289 @@
+"""
+Per-platform rate limits for scrape tasks, shared by all workers through Redis.
+
+Venues are grouped by the booking platform their scraper talks to (SevenRooms,
+Tock, DesignMyNight, ...). Each platform has a token bucket (scrapes started per
+minute, with a small burst) and a cap on scrapes running at once, so shuffling
+tasks is no longer the only thing standing between 15 browsers and one booking
+site. When a platform answers with 429s or a Cloudflare challenge, scrapers call
+report_throttled() and the platform is paused with exponential backoff;
+report_success() clears the strikes.
+
+scrape_venue_task / scrape_venue_range_task call acquire() before scraping and
+release() when done. Short waits are slept through; longer ones raise
+RateLimited so the task can be retried later instead of holding a worker.
+
+Limits are best-effort: without Redis, scrapes run unthrottled.
+"""
+import os
+import re
+import time
+import uuid
+import random
+import logging
+
+from redis_utils import get_redis, mark_redis_failed
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv('SCRAPE_RATE_LIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+RATE_LIMIT_PREFIX = os.getenv('SCRAPE_RATE_LIMIT_PREFIX', 'ratelimit')
+# Waits up to this long are slept in the task; longer ones raise RateLimited
+RATE_LIMIT_MAX_SLEEP = float(os.getenv('SCRAPE_RATE_LIMIT_MAX_SLEEP', '15'))
+# A concurrency slot is freed after this long even if release() never ran (killed worker)
+RATE_LIMIT_LEASE_SECONDS = int(os.getenv('SCRAPE_RATE_LIMIT_LEASE_SECONDS', '1800'))
+# Rate-limited tasks are retried this many times before failing
+RATE_LIMIT_MAX_RETRIES = int(os.getenv('SCRAPE_RATE_LIMIT_MAX_RETRIES', '20'))
+THROTTLE_BACKOFF_BASE = float(os.getenv('SCRAPE_THROTTLE_BACKOFF_BASE', '60'))
+THROTTLE_BACKOFF_MAX = float(os.getenv('SCRAPE_THROTTLE_BACKOFF_MAX', '1800'))
+
+DEFAULT_RATE_PER_MINUTE = float(os.getenv('SCRAPE_DEFAULT_RATE', '30'))
+DEFAULT_CONCURRENCY = int(os.getenv('SCRAPE_DEFAULT_CONCURRENCY', '4'))
+
+# platform -> (scrapes started per minute, scrapes running at once)
+PLATFORM_LIMITS = {
+    'sevenrooms': (30.0, 4),
+    'exploretock': (6.0, 2),  # Cloudflare-protected, goes through FlareSolverr
+    'designmynight': (30.0, 4),
+    'opentable': (10.0, 2),
+    'daysmart': (30.0, 4),
+    'fiveiron': (30.0, 4),
+}
+
+# (website prefix, platform), first match wins; other venues are their own platform
+VENUE_PLATFORMS = (
+    ('electric_shuffle_nyc', 'sevenrooms'),
+    ('lawn_club_', 'sevenrooms'),
+    ('fair_game_', 'sevenrooms'),
+    ('topgolf_chigwell', 'sevenrooms'),
+    ('puttery_', 'exploretock'),
+    ('kick_axe_', 'exploretock'),
+    ('pingpong', 'designmynight'),
+    ('allstarlanes_', 'designmynight'),
+    ('tsquaredsocial_', 'opentable'),
+    ('daysmart_', 'daysmart'),
+    ('five_iron_golf_', 'fiveiron'),
+)
+
+_THROTTLE_RE = re.compile(
+    r'\b429\b|too many requests|rate.?limit|cloudflare|just a moment|captcha|attention required',
+    re.IGNORECASE
+)
+
+# Token bucket + concurrency leases + throttle pause, atomically.
+# KEYS: bucket hash, lease zset, pause key
+# ARGV: tokens per ms, burst capacity, max concurrent, lease id, lease ttl (ms)
+# Returns 0 when acquired, else the suggested wait in ms.
+_ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local max_concurrent = tonumber(ARGV[3])
+local lease_ttl = tonumber(ARGV[5])
+
+local paused_until = tonumber(redis.call('GET', KEYS[3]) or '0')
+if paused_until > now then
+    return paused_until - now
+end
+
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+if max_concurrent > 0 and redis.call('ZCARD', KEYS[2]) >= max_concurrent then
+    return 1000
+end
+
+local tokens = capacity
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+if state[1] then
+    tokens = math.min(capacity, tonumber(state[1]) + (now - tonumber(state[2])) * rate)
+end
+if tokens < 1 then
+    return math.ceil((1 - tokens) / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens - 1, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate) + 60000)
+redis.call('ZADD', KEYS[2], now + lease_ttl, ARGV[4])
+redis.call('PEXPIRE', KEYS[2], lease_ttl + 60000)
+return 0
+"""
+
+
+class RateLimited(Exception):
+    """The platform's limit will not free up soon; retry the task after `wait` seconds"""
+
+    def __init__(self, platform, wait):
+        super().__init__(platform, wait)
+        self.platform = platform
+        self.wait = wait
+
+    def __str__(self):
+        return f"Rate limit for {self.platform}: retry in {self.wait:.0f}s"
+
+
+def platform_for(website):
+    for prefix, platform in VENUE_PLATFORMS:
+        if website.startswith(prefix):
+            return platform
+    return website
+
+
+def _parse_overrides(raw):
+    """'sevenrooms=20/3,exploretock=4/1' -> {platform: (rate, concurrency)}"""
+    overrides = {}
+    for item in filter(None, (part.strip() for part in raw.split(','))):
+        try:
+            platform, limits = item.split('=', 1)
+            rate, _, concurrency = limits.partition('/')
+            overrides[platform.strip()] = (float(rate), int(concurrency) if concurrency else None)
+        except ValueError:
+            logger.warning(f"[RATE_LIMIT] Ignoring invalid SCRAPE_RATE_LIMITS entry: {item!r}")
+    return overrides
+
+
+_OVERRIDES = _parse_overrides(os.getenv('SCRAPE_RATE_LIMITS', ''))
+
+
+def platform_limits(platform):
+    """(rate per minute, max concurrent) for a platform; 0 disables that limit"""
+    rate, concurrency = PLATFORM_LIMITS.get(platform, (DEFAULT_RATE_PER_MINUTE, DEFAULT_CONCURRENCY))
+    override_rate, override_concurrency = _OVERRIDES.get(platform, (None, None))
+    return (
+        rate if override_rate is None else override_rate,
+        concurrency if override_concurrency is None else override_concurrency,
+    )
+
+
+def _keys(platform):
+    base = f"{RATE_LIMIT_PREFIX}:{platform}"
+    return f"{base}:bucket", f"{base}:leases", f"{base}:paused", f"{base}:strikes"
+
+
+def _try_acquire(client, platform, lease_id):
+    rate, concurrency = platform_limits(platform)
+    bucket, leases, paused, _ = _keys(platform)
+    if rate <= 0:
+        # Only the concurrency cap (and throttle pauses) apply
+        rate, capacity = 1e9, 1e9
+    else:
+        capacity = max(1.0, rate / 10.0)  # burst of ~6 seconds' worth
+    wait_ms = client.eval(
+        _ACQUIRE_SCRIPT, 3, bucket, leases, paused,
+        rate / 60000.0, capacity, concurrency, lease_id, RATE_LIMIT_LEASE_SECONDS * 1000
+    )
+    return int(wait_ms) / 1000.0
+
+
+def acquire(website):
+    """Take a rate-limit slot for website's platform.
+
+    Returns a lease to pass to release(), or None when limiting is disabled or
+    Redis is unavailable. Raises RateLimited if the wait exceeds
+    RATE_LIMIT_MAX_SLEEP.
+    """
+    if not RATE_LIMIT_ENABLED:
+        return None
+    platform = platform_for(website)
+    lease_id = uuid.uuid4().hex
+    deadline = time.monotonic() + RATE_LIMIT_MAX_SLEEP
+    waited = False
+    while True:
+        client = get_redis()
+        if client is None:
+            return None
+        try:
+            wait = _try_acquire(client, platform, lease_id)
+        except Exception as e:
+            mark_redis_failed(e)
+            return None
+        if wait <= 0:
+            if waited:
+                logger.info(f"[RATE_LIMIT] {website}: acquired {platform} slot after waiting")
+            return (platform, lease_id)
+        if time.monotonic() + wait > deadline:
+            raise RateLimited(platform, max(wait, RATE_LIMIT_MAX_SLEEP))
+        waited = True
+        time.sleep(min(wait, 5.0))
+
+
+def retry_countdown(error):
+    """Seconds until a RateLimited task should retry, jittered so retries don't arrive together"""
+    return max(1.0, error.wait) * random.uniform(1.0, 1.5)
+
+
+def release(lease):
+    if not lease:
+        return
+    platform, lease_id = lease
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.zrem(_keys(platform)[1], lease_id)
+    except Exception as e:
+        mark_redis_failed(e)
+
+
+def is_throttle_error(error):
+    """Whether an exception looks like a 429 / Cloudflare / captcha response"""
+    return bool(error) and (type(error).__name__.endswith('Blocked') or bool(_THROTTLE_RE.search(str(error))))
+
+
+def report_throttled(website_or_platform, reason=''):
+    """Pause a platform: 1st strike THROTTLE_BACKOFF_BASE seconds, doubling up to THROTTLE_BACKOFF_MAX"""
+    platform = platform_for(website_or_platform)
+    client = get_redis()
+    if client is None:
+        return None
+    _, _, paused, strikes_key = _keys(platform)
+    try:
+        strikes = client.incr(strikes_key)
+        client.expire(strikes_key, int(THROTTLE_BACKOFF_MAX * 4))
+        backoff = min(THROTTLE_BACKOFF_BASE * (2 ** (strikes - 1)), THROTTLE_BACKOFF_MAX)
+        now_seconds, now_micros = client.time()
+        paused_until = now_seconds * 1000 + now_micros // 1000 + int(backoff * 1000)
+        client.set(paused, paused_until, px=int(backoff * 1000))
+    except Exception as e:
+        mark_redis_failed(e)
+        return None
+    logger.warning(f"[RATE_LIMIT] {platform} throttled ({reason or 'blocked'}); pausing for {backoff:.0f}s (strike {strikes})")
+    return backoff
+
+
+def report_success(website_or_platform):
+    """Clear throttle strikes after a scrape that got through"""
+    platform = platform_for(website_or_platform)
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.delete(_keys(platform)[3])
+    except Exception as e:
+        mark_redis_failed(e)
+
+
+def stats():
+    """Current leases, tokens and pauses per configured platform"""
+    client = get_redis()
+    if client is None:
+        return None
+    platforms = sorted(set(PLATFORM_LIMITS) | set(_OVERRIDES))
+    result = {}
+    try:
+        now_seconds, now_micros = client.time()
+        now = now_seconds * 1000 + now_micros // 1000
+        for platform in platforms:
+            bucket, leases, paused, strikes = _keys(platform)
+            rate, concurrency = platform_limits(platform)
+            paused_until = int(client.get(paused) or 0)
+            result[platform] = {
+                'rate_per_minute': rate,
+                'max_concurrent': concurrency,
+                'running': client.zcount(leases, now, '+inf'),
+                'paused_seconds': max(0, paused_until - now) / 1000.0,
+                'strikes': int(client.get(strikes) or 0),
+            }
+    except Exception as e:
+        mark_redis_failed(e)
+        return None
+    return result
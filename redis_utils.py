@@ -0,0 +1,58 @@
+"""
+Shared Redis client for app-level coordination (cache versions, events, limits).
+
+Uses the same REDIS_URL as the Celery broker. The client is created lazily per
+process (and recreated after fork). If Redis is unreachable, callers get None
+for REDIS_RETRY_SECONDS instead of paying a connection timeout on every call.
+"""
+import os
+import time
+import threading
+import logging
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+REDIS_RETRY_SECONDS = float(os.getenv('REDIS_RETRY_SECONDS', '30'))
+
+_client = None
+_client_pid = None
+_unavailable_until = 0.0
+_lock = threading.Lock()
+
+
+def get_redis():
+    """Return a connected Redis client, or None if Redis is unavailable"""
+    global _client, _client_pid, _unavailable_until
+    if redis is None:
+        return None
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            return _client
+        if time.monotonic() < _unavailable_until:
+            return None
+        try:
+            client = redis.Redis.from_url(REDIS_URL, socket_connect_timeout=1, socket_timeout=2)
+            client.ping()
+        except Exception as e:
+            _unavailable_until = time.monotonic() + REDIS_RETRY_SECONDS
+            logger.warning(f"[REDIS] Unavailable at {REDIS_URL}: {e}")
+            return None
+        _client = client
+        _client_pid = os.getpid()
+        return _client
+
+
+def mark_redis_failed(error=None):
+    """Drop the client after a failed command so the next call reconnects (after the back-off)"""
+    global _client, _unavailable_until
+    with _lock:
+        _client = None
+        _unavailable_until = time.monotonic() + REDIS_RETRY_SECONDS
+    if error is not None:
+        logger.warning(f"[REDIS] Command failed: {error}")
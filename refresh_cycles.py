@@ -0,0 +1,163 @@
+"""
+Progress tracking for sweep-mode refresh cycles (REFRESH_MODE=sweep).
+
+A cycle used to be one chord over every venue × guest × date task (~7,000
+signatures): the result backend held every result, the chord unlock polled,
+and one lost task meant the next cycle never started. Now each cycle is a
+Redis hash of counters:
+
+    refresh-cycle:<id>        total, done, failed, started_at, venues_filter
+    refresh-cycle:current     id of the newest cycle
+
+Scrape tasks carrying a cycle_id call record_task_done() as they finish. When
+REFRESH_CYCLE_NEXT_AT of the cycle's tasks have finished, the next cycle is
+started exactly once (a SET NX claim), so stragglers overlap with the next
+cycle instead of holding it back. check_refresh_cycle_task (run by Beat) also
+starts it once the cycle is older than REFRESH_CYCLE_MAX_SECONDS.
+"""
+import os
+import json
+import math
+import time
+import uuid
+import logging
+
+from redis_utils import get_redis, mark_redis_failed
+
+logger = logging.getLogger(__name__)
+
+CYCLE_KEY_PREFIX = os.getenv('REFRESH_CYCLE_PREFIX', 'refresh-cycle')
+# Share of a cycle's tasks that must finish before the next cycle starts
+REFRESH_CYCLE_NEXT_AT = float(os.getenv('REFRESH_CYCLE_NEXT_AT', '1.0'))
+# Start the next cycle after this long even if tasks are still outstanding
+REFRESH_CYCLE_MAX_SECONDS = int(os.getenv('REFRESH_CYCLE_MAX_SECONDS', '7200'))
+REFRESH_CYCLE_CHECK_INTERVAL = float(os.getenv('REFRESH_CYCLE_CHECK_INTERVAL', '60'))
+# Counters are kept this long after a cycle starts
+REFRESH_CYCLE_TTL = int(os.getenv('REFRESH_CYCLE_TTL', str(2 * 24 * 3600)))
+
+
+def _cycle_key(cycle_id):
+    return f"{CYCLE_KEY_PREFIX}:{cycle_id}"
+
+
+def _current_key():
+    return f"{CYCLE_KEY_PREFIX}:current"
+
+
+def new_cycle_id():
+    return uuid.uuid4().hex
+
+
+def start_cycle(cycle_id, total, venues_filter=None):
+    """Register a cycle before its tasks are sent; returns False if Redis is unavailable"""
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        pipe = client.pipeline()
+        pipe.hset(_cycle_key(cycle_id), mapping={
+            'total': total,
+            'done': 0,
+            'failed': 0,
+            'started_at': time.time(),
+            'venues_filter': json.dumps(venues_filter),
+        })
+        pipe.expire(_cycle_key(cycle_id), REFRESH_CYCLE_TTL)
+        pipe.set(_current_key(), cycle_id, ex=REFRESH_CYCLE_TTL)
+        pipe.execute()
+        return True
+    except Exception as e:
+        mark_redis_failed(e)
+        return False
+
+
+def _decode(raw):
+    return {
+        (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+        for k, v in raw.items()
+    }
+
+
+def cycle_status(cycle_id=None):
+    """Counters for a cycle (default: the current one), or None"""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        if cycle_id is None:
+            cycle_id = client.get(_current_key())
+            if cycle_id is None:
+                return None
+            cycle_id = cycle_id.decode() if isinstance(cycle_id, bytes) else cycle_id
+        raw = client.hgetall(_cycle_key(cycle_id))
+        next_started = client.exists(_cycle_key(cycle_id) + ':next')
+    except Exception as e:
+        mark_redis_failed(e)
+        return None
+    if not raw:
+        return None
+    fields = _decode(raw)
+    started_at = float(fields.get('started_at') or 0)
+    return {
+        'cycle_id': cycle_id,
+        'total': int(fields.get('total') or 0),
+        'done': int(fields.get('done') or 0),
+        'failed': int(fields.get('failed') or 0),
+        'started_at': started_at,
+        'age_seconds': max(0.0, time.time() - started_at) if started_at else None,
+        'venues_filter': json.loads(fields.get('venues_filter') or 'null'),
+        'next_started': bool(next_started),
+    }
+
+
+def claim_next_cycle(cycle_id):
+    """True for exactly one caller per cycle; that caller starts the next cycle"""
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        return bool(client.set(_cycle_key(cycle_id) + ':next', 1, nx=True, ex=REFRESH_CYCLE_TTL))
+    except Exception as e:
+        mark_redis_failed(e)
+        return False
+
+
+def record_task_done(cycle_id, success=True):
+    """Count a finished task. Returns the cycle status if this call claimed the
+    start of the next cycle (the caller should trigger it), else None."""
+    if not cycle_id:
+        return None
+    client = get_redis()
+    if client is None:
+        return None
+    key = _cycle_key(cycle_id)
+    try:
+        pipe = client.pipeline()
+        pipe.hincrby(key, 'done' if success else 'failed', 1)
+        pipe.hmget(key, 'total', 'done', 'failed')
+        pipe.expire(key, REFRESH_CYCLE_TTL)
+        _, (total, done, failed), _ = pipe.execute()
+    except Exception as e:
+        mark_redis_failed(e)
+        return None
+    if total is None:
+        return None
+    finished = int(done or 0) + int(failed or 0)
+    if finished < math.ceil(int(total) * REFRESH_CYCLE_NEXT_AT):
+        return None
+    if not claim_next_cycle(cycle_id):
+        return None
+    return cycle_status(cycle_id)
+
+
+def overdue_cycle():
+    """Current cycle status if it ran past REFRESH_CYCLE_MAX_SECONDS and this call
+    claimed the start of the next cycle, else None"""
+    status = cycle_status()
+    if not status or status['next_started']:
+        return None
+    if status['age_seconds'] is None or status['age_seconds'] < REFRESH_CYCLE_MAX_SECONDS:
+        return None
+    if not claim_next_cycle(status['cycle_id']):
+        return None
+    return status
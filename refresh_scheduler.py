@@ -0,0 +1,135 @@
+"""
+Freshness-driven refresh scheduling.
+
+Instead of sweeping every venue × guests × date each cycle, every key
+(website, date, guests) has a freshness target: short for tonight, longer for
+dates weeks out, and shorter or longer again depending on how often scrapes of
+that key actually find changes (an exponentially weighted change rate). A
+dispatcher runs every REFRESH_DISPATCH_INTERVAL seconds and enqueues the keys
+that are most overdue relative to their target, within a global throughput
+budget and a cap on scrapes in flight.
+
+This module holds the scheduling math and the bookkeeping hooks; the state
+rows (RefreshState) and the dispatcher task live in models.py / app.py.
+"""
+import os
+import math
+import threading
+from datetime import timedelta
+
+REFRESH_MODE = os.getenv('REFRESH_MODE', 'adaptive').lower()  # 'adaptive' or 'sweep'
+REFRESH_HORIZON_DAYS = int(os.getenv('REFRESH_HORIZON_DAYS', '30'))
+REFRESH_DISPATCH_INTERVAL = float(os.getenv('REFRESH_DISPATCH_INTERVAL', '60'))
+# Scrape tasks started per minute across all venues
+REFRESH_BUDGET_PER_MINUTE = float(os.getenv('REFRESH_BUDGET_PER_MINUTE', '20'))
+# Dispatched keys not yet reported back; stops the queue growing when workers fall behind
+REFRESH_MAX_IN_FLIGHT = int(os.getenv('REFRESH_MAX_IN_FLIGHT', '100'))
+# A dispatched key is considered lost (and may be re-dispatched) after this long
+REFRESH_DISPATCH_LEASE = timedelta(seconds=int(os.getenv('REFRESH_DISPATCH_LEASE', '2400')))
+REFRESH_CHANGE_ALPHA = float(os.getenv('REFRESH_CHANGE_ALPHA', '0.3'))
+# Targets are divided by up to sqrt(spread) for keys that always change and
+# multiplied by up to sqrt(spread) for keys that never do
+REFRESH_VOLATILITY_SPREAD = float(os.getenv('REFRESH_VOLATILITY_SPREAD', '4'))
+
+# (max days ahead, freshness target in minutes), checked in order
+_DEFAULT_TARGETS = '0:20,1:40,3:90,7:180,14:360,30:720'
+FRESHNESS_TARGETS = sorted(
+    (int(days), float(minutes))
+    for days, minutes in (pair.split(':') for pair in os.getenv('REFRESH_TARGETS', _DEFAULT_TARGETS).split(','))
+)
+
+FAILURE_BACKOFF_BASE = timedelta(minutes=5)
+FAILURE_BACKOFF_MAX = timedelta(hours=6)
+
+
+def horizon_target_minutes(days_ahead):
+    for max_days, minutes in FRESHNESS_TARGETS:
+        if days_ahead <= max_days:
+            return minutes
+    return FRESHNESS_TARGETS[-1][1]
+
+
+def target_interval(days_ahead, change_rate):
+    """Freshness target for a key; change_rate is the EWMA share of scrapes that found changes"""
+    rate = min(max(change_rate if change_rate is not None else 0.5, 0.0), 1.0)
+    factor = REFRESH_VOLATILITY_SPREAD ** (0.5 - rate)
+    return timedelta(minutes=horizon_target_minutes(days_ahead) * factor)
+
+
+def staleness(state, day, today, now):
+    """Age / target for a key (>= 1 means overdue); state may be None for never-scraped keys"""
+    days_ahead = (day - today).days
+    target = target_interval(days_ahead, state.change_rate if state else None)
+    if state is None or state.last_scraped_at is None:
+        # Never scraped: overdue, nearer dates first
+        return 1000.0 / (1 + days_ahead)
+    return (now - state.last_scraped_at) / target
+
+
+def is_in_flight(state, now):
+    return bool(
+        state and state.dispatched_at
+        and (state.last_attempt_at is None or state.dispatched_at > state.last_attempt_at)
+        and now - state.dispatched_at < REFRESH_DISPATCH_LEASE
+    )
+
+
+def is_backing_off(state, now):
+    if not state or not state.failure_count or not state.last_attempt_at:
+        return False
+    backoff = min(FAILURE_BACKOFF_BASE * (2 ** (state.failure_count - 1)), FAILURE_BACKOFF_MAX)
+    return now - state.last_attempt_at < backoff
+
+
+def dispatch_budget(in_flight):
+    per_tick = math.ceil(REFRESH_BUDGET_PER_MINUTE * REFRESH_DISPATCH_INTERVAL / 60.0)
+    return max(0, min(per_tick, REFRESH_MAX_IN_FLIGHT - in_flight))
+
+
+def apply_outcome(state, changed, now):
+    """Fold one successful scrape into a state row"""
+    if state.last_scraped_at is not None:
+        previous = state.change_rate if state.change_rate is not None else 0.5
+        state.change_rate = (1 - REFRESH_CHANGE_ALPHA) * previous + REFRESH_CHANGE_ALPHA * (1.0 if changed else 0.0)
+    elif state.change_rate is None:
+        state.change_rate = 0.5
+    state.last_scraped_at = now
+    state.last_attempt_at = now
+    if changed:
+        state.last_changed_at = now
+    state.scrape_count = (state.scrape_count or 0) + 1
+    state.failure_count = 0
+
+
+def apply_reused(state, scraped_at, now):
+    """Fold a reused result (an identical scrape that finished at scraped_at) into a state
+    row; the change rate was already updated by that scrape"""
+    if state.last_scraped_at is None or state.last_scraped_at < scraped_at:
+        state.last_scraped_at = scraped_at
+    state.last_attempt_at = now
+    state.failure_count = 0
+
+
+def apply_failure(state, now):
+    state.last_attempt_at = now
+    state.failure_count = (state.failure_count or 0) + 1
+
+
+# Changed dates reported by run_scraper_and_save_to_db while a scrape task runs
+_tracking = threading.local()
+
+
+def start_tracking():
+    """Start collecting the dates whose slots change in this thread; returns the set"""
+    _tracking.changed = set()
+    return _tracking.changed
+
+
+def stop_tracking():
+    _tracking.changed = None
+
+
+def note_changed_dates(dates):
+    changed = getattr(_tracking, 'changed', None)
+    if changed is not None:
+        changed.update(day.isoformat() if hasattr(day, 'isoformat') else str(day) for day in dates)
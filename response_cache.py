@@ -0,0 +1,152 @@
+"""
+Response cache for /api/data with write-driven invalidation.
+
+Rendered responses are kept in an in-process LRU keyed by the normalized query
+string. Validity is tracked per (city, date, guests) partition with version
+counters in a Redis hash shared by the web and Celery processes: a scrape that
+commits changes bumps the counters of the partitions it touched, and a cached
+response is only served while every partition it covers still has the version
+it was rendered with. The same version token yields the ETag, so repeat callers
+get a 304 without the response being rendered or even looked up.
+
+Without Redis there is no cross-process invalidation, so caching is skipped.
+"""
+import os
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from datetime import timedelta
+
+from redis_utils import get_redis, mark_redis_failed
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '256'))
+RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRY_BYTES', str(32 * 1024 * 1024)))
+# Date windows longer than this depend on the whole city instead of per-date partitions
+RESPONSE_CACHE_MAX_DATE_SPAN = int(os.getenv('RESPONSE_CACHE_MAX_DATE_SPAN', '92'))
+
+VERSIONS_KEY = 'slotcache:versions'
+GLOBAL_FIELD = 'all'
+ANY = '*'
+
+
+def _field(city, date, guests):
+    return f"{city}|{date}|{guests}"
+
+
+def partition_fields(city=None, date_from=None, date_to=None, guests=None):
+    """Version fields a query over the given filters depends on (None = unfiltered)"""
+    city_key = city or ANY
+    guests_key = str(guests) if guests is not None else ANY
+    fields = [GLOBAL_FIELD]
+    if date_from and date_to and 0 <= (date_to - date_from).days <= RESPONSE_CACHE_MAX_DATE_SPAN:
+        day = date_from
+        while day <= date_to:
+            fields.append(_field(city_key, day.isoformat(), guests_key))
+            day += timedelta(days=1)
+    else:
+        fields.append(_field(city_key, ANY, ANY))
+    return fields
+
+
+def _fields_for_partition(city, date, guests):
+    date_key = date.isoformat() if hasattr(date, 'isoformat') else str(date)
+    fields = set()
+    for city_key in (city, ANY):
+        fields.add(_field(city_key, date_key, guests))
+        fields.add(_field(city_key, date_key, ANY))
+        fields.add(_field(city_key, ANY, ANY))
+    return fields
+
+
+def bump_partitions(partitions):
+    """Invalidate cached responses covering any of the (city, date, guests) partitions"""
+    fields = set()
+    for city, date, guests in partitions:
+        fields |= _fields_for_partition(city, date, guests)
+    return _bump(fields)
+
+
+def bump_all():
+    """Invalidate every cached response (bulk deletes, manual clears)"""
+    return _bump({GLOBAL_FIELD})
+
+
+def _bump(fields):
+    if not fields:
+        return False
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        pipe = client.pipeline(transaction=False)
+        for field in fields:
+            pipe.hincrby(VERSIONS_KEY, field, 1)
+        pipe.execute()
+        return True
+    except Exception as e:
+        mark_redis_failed(e)
+        return False
+
+
+def version_token(fields):
+    """Hash of the current versions of fields, or None when Redis is unavailable"""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        versions = client.hmget(VERSIONS_KEY, fields)
+    except Exception as e:
+        mark_redis_failed(e)
+        return None
+    raw = ','.join((v.decode() if isinstance(v, bytes) else str(v or 0)) for v in versions)
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def make_etag(cache_key, token):
+    return hashlib.sha1(f"{cache_key}#{token}".encode()).hexdigest()[:20]
+
+
+class ResponseLRU:
+    """Thread-safe LRU of rendered responses: key -> (token, body, mimetype, content_encoding)"""
+
+    def __init__(self, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, token):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != token:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2], entry[3]
+
+    def put(self, key, token, body, mimetype, content_encoding=None):
+        if len(body) > RESPONSE_CACHE_MAX_ENTRY_BYTES:
+            return
+        with self._lock:
+            self._entries[key] = (token, body, mimetype, content_encoding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': sum(len(entry[1]) for entry in self._entries.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+response_lru = ResponseLRU()
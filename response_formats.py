@@ -0,0 +1,174 @@
+"""
+Compact encodings for /api/data.
+
+The default response is a list of row objects, and big city-wide views repeat
+the venue name, city, booking URL and website on every row. Clients can ask for:
+
+    format=columnar   one array per field; venue, booking URL, status and
+                      venue_specific_data are integer references into tables
+                      that list each distinct value once
+    format=msgpack    the same columnar document as MessagePack (needs msgpack)
+
+or send Accept: application/vnd.slots.columnar+json / application/msgpack.
+Non-streamed responses are compressed with brotli (when installed) or gzip if
+Accept-Encoding allows it.
+"""
+import os
+import gzip
+import json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from models import dumps_json
+
+JSON_MIMETYPE = 'application/json'
+COLUMNAR_MIMETYPE = 'application/vnd.slots.columnar+json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+ROW_FORMATS = ('json', 'ndjson', 'stream')
+COMPACT_FORMATS = ('columnar', 'msgpack')
+STREAM_FORMATS = ('ndjson', 'stream')
+
+_ACCEPT_FORMATS = {
+    JSON_MIMETYPE: 'json',
+    COLUMNAR_MIMETYPE: 'columnar',
+    MSGPACK_MIMETYPE: 'msgpack',
+    'application/x-msgpack': 'msgpack',
+}
+
+RESPONSE_COMPRESS_MIN_BYTES = int(os.getenv('RESPONSE_COMPRESS_MIN_BYTES', '1024'))
+RESPONSE_GZIP_LEVEL = int(os.getenv('RESPONSE_GZIP_LEVEL', '6'))
+RESPONSE_BROTLI_QUALITY = int(os.getenv('RESPONSE_BROTLI_QUALITY', '5'))
+
+
+def negotiate_format(args, accept_mimetypes):
+    """Response format from ?format=, else from the Accept header (default 'json').
+
+    Unknown format values fall back to 'json'. Raises ValueError if msgpack was
+    requested but is not installed.
+    """
+    response_format = (args.get('format') or '').strip().lower()
+    if not response_format:
+        best = accept_mimetypes.best_match(list(_ACCEPT_FORMATS), default=JSON_MIMETYPE)
+        response_format = _ACCEPT_FORMATS.get(best, 'json')
+    if response_format not in ROW_FORMATS + COMPACT_FORMATS:
+        response_format = 'json'
+    if response_format == 'msgpack' and msgpack is None:
+        raise ValueError('format=msgpack is not available on this server (msgpack not installed)')
+    return response_format
+
+
+def negotiate_encoding(accept_encodings):
+    """'br', 'gzip' or None for the client's Accept-Encoding"""
+    if brotli is not None and accept_encodings['br'] > 0:
+        return 'br'
+    if accept_encodings['gzip'] > 0:
+        return 'gzip'
+    return None
+
+
+def compress_body(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL)
+
+
+def compress_response(response, encoding):
+    """Compress a buffered response in place when it is worth it"""
+    response.vary.add('Accept-Encoding')
+    if (not encoding or response.is_streamed or response.status_code != 200
+            or 'Content-Encoding' in response.headers):
+        return response
+    body = response.get_data()
+    if len(body) < RESPONSE_COMPRESS_MIN_BYTES:
+        return response
+    response.set_data(compress_body(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+class _Table:
+    """Distinct values in first-seen order, referenced by index"""
+
+    def __init__(self):
+        self.index = {}
+        self.values = []
+
+    def ref(self, value):
+        if value is None:
+            return None
+        position = self.index.get(value)
+        if position is None:
+            position = self.index[value] = len(self.values)
+            self.values.append(value)
+        return position
+
+
+def encode_columnar(rows, resolve_booking_url, response_format='columnar', **meta):
+    """Encode slot rows as a dictionary-encoded columnar document.
+
+    rows need id, venue_name, city, date, time, start_minutes, price, price_amount,
+    price_currency, price_basis, status, guests, booking_url,
+    venue_specific_data (the stored JSON text), timestamp and last_updated.
+    resolve_booking_url(venue_name) fills rows without a stored booking URL,
+    once per venue.
+
+    Returns (body bytes, mimetype).
+    """
+    venues, booking_urls, statuses, venue_specific = _Table(), _Table(), _Table(), _Table()
+    fallback_urls = {}
+    columns = {name: [] for name in (
+        'id', 'venue', 'date', 'time', 'start_minutes', 'price', 'price_amount', 'price_currency', 'price_basis',
+        'status', 'guests', 'booking_url', 'venue_specific_data', 'timestamp', 'last_updated'
+    )}
+
+    for row in rows:
+        booking_url = row.booking_url
+        if not booking_url:
+            if row.venue_name not in fallback_urls:
+                fallback_urls[row.venue_name] = resolve_booking_url(row.venue_name)
+            booking_url = fallback_urls[row.venue_name]
+        columns['id'].append(row.id)
+        columns['venue'].append(venues.ref((row.venue_name, row.city)))
+        columns['date'].append(row.date.isoformat() if row.date else None)
+        columns['time'].append(row.time)
+        columns['start_minutes'].append(row.start_minutes)
+        columns['price'].append(row.price)
+        columns['price_amount'].append(row.price_amount)
+        columns['price_currency'].append(row.price_currency)
+        columns['price_basis'].append(row.price_basis)
+        columns['status'].append(statuses.ref(row.status))
+        columns['guests'].append(row.guests)
+        columns['booking_url'].append(booking_urls.ref(booking_url))
+        columns['venue_specific_data'].append(venue_specific.ref(row.venue_specific_data or None))
+        columns['timestamp'].append(row.timestamp.isoformat() if row.timestamp else None)
+        columns['last_updated'].append(row.last_updated.isoformat() if row.last_updated else None)
+
+    specific_values = []
+    for raw in venue_specific.values:
+        try:
+            specific_values.append(json.loads(raw))
+        except (json.JSONDecodeError, TypeError):
+            specific_values.append(None)
+
+    document = {
+        'format': 'columnar',
+        # website is the venue name, as in the row format
+        'venues': [{'venue_name': name, 'city': city} for name, city in venues.values],
+        'booking_urls': booking_urls.values,
+        'statuses': statuses.values,
+        'venue_specific_data': specific_values,
+        'columns': columns,
+        **meta,
+    }
+    if response_format == 'msgpack':
+        return msgpack.packb(document, use_bin_type=True), MSGPACK_MIMETYPE
+    return dumps_json(document).encode('utf-8'), COLUMNAR_MIMETYPE
@@ -5,7 +5,9 @@ Provides common functionality for all scrapers
 from typing import Optional
 from playwright.sync_api import Browser, BrowserContext, Page
 import logging
-from browser_utils import create_browser, create_browser_context, create_page, create_browser_with_context
+import re
+import time
+from browser_utils import create_page, lease_browser_context, release_browser_context
 
 logger = logging.getLogger(__name__)
 
@@ -13,22 +15,39 @@ logger = logging.getLogger(__name__)
 class BaseScraper:
     """Base scraper utility class for Playwright-based scrapers"""
     
-    def __init__(self, headless: bool = None):
+    def __init__(self, headless: bool = None, blocking_profile=None, name: str = ''):
         """
         Initialize the scraper
         
         Args:
             headless: Whether to run browser in headless mode (None = auto-detect)
+            blocking_profile: Network blocking profile name (see browser_utils.BLOCKING_PROFILES)
+                or custom profile dict. None = BROWSER_BLOCKING_PROFILE env var.
+            name: Label used in log output (e.g. venue name)
         """
         self.headless = headless
+        self.blocking_profile = blocking_profile
+        self.name = name
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        # One entry per condition wait: what we waited for, how long, and whether it was met
+        self.wait_log = []
+        # In-flight requests (request -> start time) and time of last network activity
+        self._inflight = {}
+        self._last_network_activity = time.monotonic()
+        # JSON response capture: URL matchers and matching responses (parsed lazily)
+        self._capture_matchers = []
+        self._captured = []
         
     def __enter__(self):
         """Context manager entry - creates browser and context"""
-        self.browser, self.context = create_browser_with_context(headless=self.headless)
+        self.browser, self.context = lease_browser_context(
+            headless=self.headless,
+            blocking_profile=self.blocking_profile
+        )
         self.page = create_page(self.context)
+        self._track_network()
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -37,6 +56,13 @@ class BaseScraper:
         
     def cleanup(self):
         """Clean up browser resources"""
+        if self.wait_log:
+            timed_out = sum(1 for entry in self.wait_log if not entry['satisfied'])
+            logger.info(
+                f"[SCRAPER] {self.name or 'scraper'}: {len(self.wait_log)} condition waits, "
+                f"{self.total_wait_ms()}ms total, {timed_out} hit their budget"
+            )
+
         try:
             if self.page:
                 self.page.close()
@@ -44,19 +70,15 @@ class BaseScraper:
         except Exception as e:
             logger.warning(f"Error closing page: {e}")
         
+        # Return the context's browser to the pool (or close it if dedicated)
         try:
-            if self.context:
-                self.context.close()
-                self.context = None
+            if self.browser or self.context:
+                release_browser_context(self.browser, self.context, label=self.name)
         except Exception as e:
-            logger.warning(f"Error closing context: {e}")
-        
-        try:
-            if self.browser:
-                self.browser.close()
-                self.browser = None
-        except Exception as e:
-            logger.warning(f"Error closing browser: {e}")
+            logger.warning(f"Error releasing browser: {e}")
+        finally:
+            self.context = None
+            self.browser = None
     
     # def goto(self, url: str, timeout: int = 60000, wait_until: str = "networkidle"):
     #     """
@@ -93,8 +115,8 @@ class BaseScraper:
 
         # ❌ REMOVE networkidle — SevenRooms NEVER reaches it
         # ❌ REMOVE load-state waits — page stays pending forever
-        # ✔ Instead wait a tiny amount to stabilize DOM
-        self.page.wait_for_timeout(800)
+        # ✔ Instead give the DOM up to 800ms to stabilize (returns early once requests settle)
+        self.wait_for_network_quiet(quiet_ms=300, timeout=800)
 
         logger.info("[SCRAPER] goto() completed (no networkidle wait)")
 
@@ -111,9 +133,9 @@ class BaseScraper:
         if not self.page:
             raise RuntimeError("Page not initialized.")
         element = self.page.wait_for_selector(selector, timeout=timeout, state=state)
-        # Additional wait to ensure element is stable
+        # Let follow-up requests settle (booking widgets often never reach networkidle)
         if element:
-            self.page.wait_for_load_state("networkidle", timeout=5000)
+            self.wait_for_network_quiet(quiet_ms=300, timeout=5000)
         return element
     
     def wait_for_timeout(self, milliseconds: int):
@@ -121,6 +143,229 @@ class BaseScraper:
         if not self.page:
             raise RuntimeError("Page not initialized.")
         self.page.wait_for_timeout(milliseconds)
+
+    # ------------------------------------------------------------------
+    # Condition-based waits
+    #
+    # Each wait has a timeout budget, returns as soon as its condition holds,
+    # never raises on timeout (returns False/None instead) and appends an
+    # entry to self.wait_log with the time actually spent.
+    # ------------------------------------------------------------------
+
+    def _track_network(self):
+        """Track in-flight requests so wait_for_network_quiet() can tell when the page is idle"""
+        def on_request(request):
+            self._inflight[request] = time.monotonic()
+            self._last_network_activity = time.monotonic()
+
+        def on_done(request):
+            self._inflight.pop(request, None)
+            self._last_network_activity = time.monotonic()
+
+        self.page.on("request", on_request)
+        self.page.on("requestfinished", on_done)
+        self.page.on("requestfailed", on_done)
+
+    def _record_wait(self, kind: str, target: str, started: float, budget_ms: int, satisfied: bool):
+        waited_ms = int((time.monotonic() - started) * 1000)
+        self.wait_log.append({
+            'wait': kind,
+            'target': target,
+            'waited_ms': waited_ms,
+            'budget_ms': budget_ms,
+            'satisfied': satisfied,
+        })
+        logger.debug(f"[SCRAPER] {kind}({target}) {'met' if satisfied else 'timed out'} after {waited_ms}ms (budget {budget_ms}ms)")
+
+    def total_wait_ms(self) -> int:
+        """Total time spent in condition waits so far"""
+        return sum(entry['waited_ms'] for entry in self.wait_log)
+
+    def wait_for_network_quiet(self, quiet_ms: int = 500, timeout: int = 10000, long_poll_ms: int = 5000) -> bool:
+        """
+        Wait until no requests have started or finished for quiet_ms.
+
+        Requests outstanding for longer than long_poll_ms are treated as long-polling /
+        websocket-style connections and ignored (SevenRooms keeps these open forever,
+        which is why networkidle never fires there).
+
+        Returns:
+            True if the network went quiet within the timeout
+        """
+        if not self.page:
+            raise RuntimeError("Page not initialized.")
+        started = time.monotonic()
+        deadline = started + timeout / 1000
+        satisfied = False
+        while True:
+            now = time.monotonic()
+            active = [t for t in self._inflight.values() if (now - t) * 1000 < long_poll_ms]
+            if not active and (now - self._last_network_activity) * 1000 >= quiet_ms:
+                satisfied = True
+                break
+            if now >= deadline:
+                break
+            self.page.wait_for_timeout(min(100, quiet_ms))
+        self._record_wait('network_quiet', f'{quiet_ms}ms', started, timeout, satisfied)
+        return satisfied
+
+    def wait_for_dom_stable(self, selector: str, stable_ms: int = 500, timeout: int = 10000,
+                            min_count: int = 1, frame=None) -> bool:
+        """
+        Wait until the number of nodes matching selector stops changing for stable_ms
+        (and is at least min_count). Useful for slot grids that render in batches.
+
+        Args:
+            selector: CSS selector of the repeated element (e.g. a slot button)
+            stable_ms: How long the count must stay unchanged
+            timeout: Overall budget in milliseconds
+            min_count: Minimum number of nodes required (0 = an empty result is fine)
+            frame: Optional Frame to evaluate in instead of the main page
+
+        Returns:
+            True if the count stabilised within the timeout
+        """
+        if not self.page:
+            raise RuntimeError("Page not initialized.")
+        target = frame or self.page
+        started = time.monotonic()
+        satisfied = False
+        # Count history is kept per call, so a later wait on the same selector
+        # does not settle on the count left behind by an earlier one
+        state_key = f"{selector}#{time.monotonic_ns()}"
+        try:
+            target.wait_for_function(
+                """([sel, key, stableMs, minCount]) => {
+                    const n = document.querySelectorAll(sel).length;
+                    const now = performance.now();
+                    const state = (window.__domStable = window.__domStable || {});
+                    const prev = state[key];
+                    if (!prev || prev.n !== n) {
+                        state[key] = { n: n, t: now };
+                        return false;
+                    }
+                    if (n >= minCount && now - prev.t >= stableMs) {
+                        delete state[key];
+                        return true;
+                    }
+                    return false;
+                }""",
+                arg=[selector, state_key, stable_ms, min_count],
+                polling=100,
+                timeout=timeout,
+            )
+            satisfied = True
+        except Exception as e:
+            logger.debug(f"[SCRAPER] wait_for_dom_stable({selector}) did not settle: {e}")
+        self._record_wait('dom_stable', selector, started, timeout, satisfied)
+        return satisfied
+
+    def wait_for_text_change(self, selector: str, previous_text: str = None, timeout: int = 10000, frame=None) -> bool:
+        """
+        Wait until the text of the first node matching selector differs from previous_text
+        (e.g. a calendar header after clicking "next month").
+
+        Args:
+            selector: CSS selector of the element to watch
+            previous_text: Text to compare against (None = read the current text first)
+            timeout: Overall budget in milliseconds
+            frame: Optional Frame to evaluate in instead of the main page
+
+        Returns:
+            True if the text changed within the timeout
+        """
+        if not self.page:
+            raise RuntimeError("Page not initialized.")
+        target = frame or self.page
+        started = time.monotonic()
+        satisfied = False
+        try:
+            if previous_text is None:
+                previous_text = target.evaluate(
+                    "sel => { const el = document.querySelector(sel); return el ? el.textContent.trim() : null; }",
+                    selector,
+                )
+            target.wait_for_function(
+                """([sel, prev]) => {
+                    const el = document.querySelector(sel);
+                    const text = el ? el.textContent.trim() : null;
+                    return text !== null && text !== prev;
+                }""",
+                arg=[selector, previous_text],
+                polling=100,
+                timeout=timeout,
+            )
+            satisfied = True
+        except Exception as e:
+            logger.debug(f"[SCRAPER] wait_for_text_change({selector}) did not change: {e}")
+        self._record_wait('text_change', selector, started, timeout, satisfied)
+        return satisfied
+
+    def wait_for_results(self, selector: str, timeout: int = 15000, quiet_ms: int = 800,
+                         stable_ms: int = 500, frame=None) -> bool:
+        """
+        Wait for a results grid after a search: first for the network to go quiet,
+        then for the number of result nodes to stop changing. An empty grid is a
+        valid outcome, so this never waits the full budget just because there are
+        no slots.
+
+        Returns:
+            True if both conditions were met within the timeout
+        """
+        started = time.monotonic()
+        quiet = self.wait_for_network_quiet(quiet_ms=quiet_ms, timeout=timeout)
+        remaining = max(1000, timeout - int((time.monotonic() - started) * 1000))
+        stable = self.wait_for_dom_stable(selector, stable_ms=stable_ms, timeout=remaining,
+                                          min_count=0, frame=frame)
+        return quiet and stable
+
+    @staticmethod
+    def _url_matcher(url_pattern):
+        """Build a predicate from a substring, compiled regex or callable"""
+        if callable(url_pattern):
+            return url_pattern
+        if isinstance(url_pattern, re.Pattern):
+            return lambda url: bool(url_pattern.search(url))
+        return lambda url: url_pattern in url
+
+    def expect_response(self, url_pattern, timeout: int = 15000):
+        """
+        Context manager that waits for a matching response triggered by the wrapped action:
+
+            with scraper.expect_response("/availability") as info:
+                scraper.click("button.search")
+            data = info.value.json()
+
+        Raises Playwright's TimeoutError if nothing matches; use wait_for_response()
+        for a non-raising variant.
+        """
+        if not self.page:
+            raise RuntimeError("Page not initialized.")
+        matches = self._url_matcher(url_pattern)
+        return self.page.expect_response(lambda response: matches(response.url), timeout=timeout)
+
+    def wait_for_response(self, url_pattern, timeout: int = 15000, ok_only: bool = True):
+        """
+        Wait for the next response whose URL matches url_pattern (substring, regex or callable).
+
+        Returns:
+            The matching Response, or None on timeout
+        """
+        if not self.page:
+            raise RuntimeError("Page not initialized.")
+        matches = self._url_matcher(url_pattern)
+        started = time.monotonic()
+        response = None
+        try:
+            response = self.page.wait_for_event(
+                "response",
+                predicate=lambda r: matches(r.url) and (r.ok or not ok_only),
+                timeout=timeout,
+            )
+        except Exception as e:
+            logger.debug(f"[SCRAPER] wait_for_response({url_pattern}) timed out: {e}")
+        self._record_wait('response', str(getattr(url_pattern, 'pattern', url_pattern)), started, timeout, response is not None)
+        return response
     
     def click(self, selector: str, timeout: int = 30000):
         """Click an element"""
@@ -166,6 +411,82 @@ class BaseScraper:
                     raise
             raise
     
+    # ------------------------------------------------------------------
+    # JSON response capture
+    #
+    # Most booking widgets render their slot grid from a JSON API call. Register
+    # the API's URL pattern before navigating, then read the payloads directly
+    # instead of serialising the page with get_content() and re-parsing it.
+    # ------------------------------------------------------------------
+
+    def capture_json(self, *url_patterns):
+        """
+        Start collecting responses whose URL matches any of url_patterns
+        (substring, compiled regex or callable). Call before goto().
+        """
+        if not self.page:
+            raise RuntimeError("Page not initialized.")
+        if not self._capture_matchers:
+            self.page.on("response", self._on_capture_response)
+        self._capture_matchers.extend(self._url_matcher(p) for p in url_patterns)
+
+    def _on_capture_response(self, response):
+        try:
+            url = response.url
+            if response.request.method == "OPTIONS" or not any(m(url) for m in self._capture_matchers):
+                return
+            # Keep the Response and parse on demand - bodies are fetched lazily by Playwright
+            self._captured.append({'url': url, 'status': response.status, 'response': response, 'data': None})
+        except Exception as e:
+            logger.debug(f"[SCRAPER] capture_json listener error: {e}")
+
+    def captured_json(self, url_pattern=None) -> list:
+        """
+        Parsed JSON payloads captured so far, oldest first.
+
+        Args:
+            url_pattern: Optional extra filter (substring, regex or callable)
+
+        Returns:
+            List of dicts: {'url', 'status', 'data'}; responses that are not valid JSON are skipped
+        """
+        matches = self._url_matcher(url_pattern) if url_pattern is not None else None
+        payloads = []
+        for entry in self._captured:
+            if matches and not matches(entry['url']):
+                continue
+            if entry['data'] is None:
+                try:
+                    entry['data'] = entry['response'].json()
+                except Exception as e:
+                    logger.debug(f"[SCRAPER] Captured response is not JSON ({entry['url']}): {e}")
+                    entry['data'] = False
+            if entry['data'] is not False:
+                payloads.append({'url': entry['url'], 'status': entry['status'], 'data': entry['data']})
+        return payloads
+
+    def wait_for_captured_json(self, url_pattern=None, timeout: int = 15000, min_count: int = 1) -> list:
+        """
+        Wait until at least min_count matching JSON responses have been captured.
+
+        Returns:
+            The captured payloads (possibly fewer than min_count on timeout)
+        """
+        if not self.page:
+            raise RuntimeError("Page not initialized.")
+        matches = self._url_matcher(url_pattern) if url_pattern is not None else None
+        started = time.monotonic()
+        deadline = started + timeout / 1000
+        while True:
+            count = sum(1 for entry in self._captured if not matches or matches(entry['url']))
+            if count >= min_count or time.monotonic() >= deadline:
+                break
+            self.page.wait_for_timeout(100)
+        payloads = self.captured_json(url_pattern)
+        self._record_wait('captured_json', str(getattr(url_pattern, 'pattern', url_pattern)), started, timeout,
+                          len(payloads) >= min_count)
+        return payloads
+
     def query_selector(self, selector: str):
         """Query a single element"""
         if not self.page:
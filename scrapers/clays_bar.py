@@ -30,10 +30,15 @@ def scrape_clays_bar(location, guests, target_date):
     print(f"[DEBUG] target_date_label = {target_date_label}")
 
     try:
-        with BaseScraper() as scraper:
+        with BaseScraper(blocking_profile='standard', name='clays_bar') as scraper:
             print("[DEBUG] Opening site...")
             scraper.goto("https://clays.bar/", timeout=60000, wait_until="domcontentloaded")
-            scraper.wait_for_timeout(3000)
+            try:
+                scraper.page.wait_for_selector(
+                    "button[class*='SearchBarDesktop__Section-sc-1kwt1gr-2']", timeout=15000
+                )
+            except Exception:
+                print("[DEBUG] Search bar not rendered yet.")
 
             # ---------------------------
             # ACCEPT COOKIES
@@ -44,7 +49,7 @@ def scrape_clays_bar(location, guests, target_date):
             except:
                 print("[DEBUG] No cookie popup shown.")
 
-            scraper.wait_for_timeout(1500)
+            scraper.wait_for_network_quiet(quiet_ms=300, timeout=1500)
 
             # ---------------------------
             # GET SEARCH BAR SECTIONS
@@ -60,22 +65,28 @@ def scrape_clays_bar(location, guests, target_date):
             # -----------------------------------------------
             print("\n--- LOCATION SECTION ---")
             sections[0].evaluate("el => el.click()")
-            scraper.wait_for_timeout(2000)
 
             loc_btn = scraper.page.locator(
                 f"//span[contains(text(),'{location}')]"
             ).last
+            try:
+                loc_btn.wait_for(state="attached", timeout=5000)
+            except Exception:
+                print("[DEBUG] Location option not rendered yet.")
 
             print("[DEBUG] Clicking location")
             loc_btn.evaluate("el => el.click()")
-            scraper.wait_for_timeout(1500)
+            scraper.wait_for_network_quiet(quiet_ms=300, timeout=1500)
 
             # -----------------------------------------------
             # DATE SECTION
             # -----------------------------------------------
             print("\n--- DATE SECTION ---")
             sections[1].evaluate("el => el.click()")
-            scraper.wait_for_timeout(800)
+            try:
+                scraper.page.wait_for_selector('.react-calendar', state="attached", timeout=800)
+            except Exception:
+                pass
 
             # ---- ENSURE CALENDAR OPEN ----
             def ensure_calendar_open():
@@ -91,8 +102,7 @@ def scrape_clays_bar(location, guests, target_date):
                 return False
 
             if not ensure_calendar_open():
-                print("[ERROR] Calendar did not open.")
-                return results
+                raise Exception("Calendar did not open.")
 
             # ---- GET MONTH HEADER ----
             def get_header():
@@ -121,7 +131,9 @@ def scrape_clays_bar(location, guests, target_date):
                     let n = document.querySelector('.react-calendar__navigation__next-button');
                     if (n) n.click();
                 }""")
-                scraper.wait_for_timeout(500)
+                scraper.wait_for_text_change(
+                    '.react-calendar__navigation__label span span', previous_text=header, timeout=3000
+                )
                 header = get_header()
 
             print(f"[DEBUG] Calendar at correct month: {header}")
@@ -156,7 +168,7 @@ def scrape_clays_bar(location, guests, target_date):
             """)
 
             print("[DEBUG] tile-text click result:", clicked)
-            scraper.wait_for_timeout(800)
+            scraper.wait_for_network_quiet(quiet_ms=300, timeout=800)
 
             # -----------------------------------------
             # VERIFY SELECTION
@@ -193,7 +205,7 @@ def scrape_clays_bar(location, guests, target_date):
             except Exception as e:
                 print("❌ Time selection error:", e)
 
-            scraper.wait_for_timeout(1500)
+            scraper.wait_for_network_quiet(quiet_ms=300, timeout=1500)
 
             # -----------------------------------------------
             # GUESTS (1 → target)
@@ -201,7 +213,12 @@ def scrape_clays_bar(location, guests, target_date):
             print("\n--- GUESTS SECTION ---")
 
             sections[2].evaluate("el => el.click()")
-            scraper.wait_for_timeout(800)
+            try:
+                scraper.page.wait_for_selector(
+                    'input.WhoContent__CountInput-sc-fm3zg1-3', state="attached", timeout=800
+                )
+            except Exception:
+                pass
 
             # ensure popup visible
             for i in range(10):
@@ -247,7 +264,7 @@ def scrape_clays_bar(location, guests, target_date):
                 }
             """)
 
-            scraper.wait_for_timeout(1000)
+            scraper.wait_for_network_quiet(quiet_ms=300, timeout=1000)
 
             # -----------------------------------------------------------
             # OCCASION SECTION
@@ -256,7 +273,12 @@ def scrape_clays_bar(location, guests, target_date):
 
             # Open the occasion dropdown
             sections[3].evaluate("el => el.click()")
-            scraper.wait_for_timeout(600)
+            try:
+                scraper.page.wait_for_selector(
+                    'label.OccasionContent__RadioButtonContainer-sc-3wa38i-0', state="attached", timeout=600
+                )
+            except Exception:
+                pass
 
             # Ensure the popup stays open
             def ensure_occasion_open():
@@ -289,7 +311,7 @@ def scrape_clays_bar(location, guests, target_date):
             """)
 
             print("[DEBUG] Occasion click success:", success)
-            scraper.wait_for_timeout(500)
+            scraper.wait_for_network_quiet(quiet_ms=200, timeout=500)
 
 
             # -----------------------------------------------
@@ -303,7 +325,8 @@ def scrape_clays_bar(location, guests, target_date):
                 }
             """)
 
-            scraper.wait_for_timeout(7000)
+            # Results render from XHR - wait for requests to settle and the slot grid to stop growing
+            scraper.wait_for_results("button[class*='TimeSelect__TimeSelectWrapper']", timeout=10000)
 
             # -----------------------------------------------
             # PARSE RESULTS (NEW STRUCTURE)
@@ -334,7 +357,7 @@ def scrape_clays_bar(location, guests, target_date):
                 # Log all available places for debugging
                 for span in place_spans:
                     print(f"[DEBUG] Available place: {span.get_text(strip=True)}")
-                return results
+                raise Exception(f"Location '{location}' not found in place names")
 
             # 2. Find the parent container that holds slots for this place
             # Navigate up the DOM to find the container with slots
@@ -400,4 +423,4 @@ def scrape_clays_bar(location, guests, target_date):
 
     except Exception as e:
         print("[ERROR]", e)
-        return results
+        raise e
@@ -68,7 +68,7 @@ def scrape_easybowl(guests, target_date):
 
         url = "https://www.easybowl.com/bc/LET/booking"
 
-        with BaseScraper() as scraper:
+        with BaseScraper(blocking_profile='standard', name='easybowl') as scraper:
             scraper.page.set_default_timeout(60000)
 
             print("[DEBUG] Loading Easybowl...")
@@ -4,11 +4,11 @@ Electric Shuffle scraper (NYC and London) using Playwright
 from datetime import datetime
 from bs4 import BeautifulSoup
 from scrapers.base_scraper import BaseScraper
+from scrapers.sevenrooms import scrape_sevenrooms_venue, scrape_sevenrooms_range
 import logging
 
 logger = logging.getLogger(__name__)
 
-
 # def scrape_electric_shuffle(guests, target_date):
 #     """Electric Shuffle NYC scraper function"""
 #     results = []
@@ -68,99 +68,18 @@ logger = logging.getLogger(__name__)
 
 
 def scrape_electric_shuffle(guests, target_date):
-    """Electric Shuffle NYC scraper function"""
-    results = []
-
+    """Electric Shuffle NYC scraper function (SevenRooms venue 'electricshufflenyc')"""
     try:
-        url = (
-            f"https://www.sevenrooms.com/explore/electricshufflenyc/"
-            f"reservations/create/search/?date={str(target_date)}&halo=120&"
-            f"party_size={str(guests)}&start_time=ALL"
-        )
-
-        with BaseScraper() as scraper:
-
-            # ---- LOAD PAGE (FORCED STOP AFTER 4 SEC) ----
-            try:
-                scraper.goto(url, timeout=5000, wait_until="domcontentloaded")
-            except:
-                pass  # page still loads in background
-
-            # scraper.page.evaluate("window.stop()")   # STOP loading
-
-            # Wait for slots container
-            try:
-                scraper.wait_for_selector(
-                    'div[data-test="reservation-availability-grid-primary"]',
-                    timeout=15000
-                )
-            except:
-                logger.info("No slots available on Electric Shuffle NYC")
-                return results
-
-            scraper.wait_for_timeout(2000)  # allow JS to populate
-
-            # ---- PARSE SLOTS ----
-            content = scraper.get_content()
-            soup = BeautifulSoup(content, "html.parser")
-
-            container = soup.find("div", {
-                "data-test": "reservation-availability-grid-primary"
-            })
-            if not container:
-                logger.info("Slots container not found")
-                return results
-
-            # Each slot wrapper
-            slots = container.find_all("div", {"class": "sc-imWYAI cTOWnZ"})
-
-            if not slots:
-                logger.info("No slots found inside container")
-                return results
-
-            logger.info(f"Found {len(slots)} slot containers")
-
-            # OPTIONAL: skip first slot
-            # slots = slots[1:]
-
-            for slot in slots:
-                btn = slot.find("button")
-                if not btn:
-                    continue
-
-                # Extract time
-                time_el = btn.find("span", {
-                    "data-test": "reservation-timeslot-button-time"
-                })
-                time_str = time_el.get_text(strip=True) if time_el else "None"
-
-                # Extract description (Brunch Social / Classic Shuffle)
-                desc_el = btn.find("span", {
-                    "data-test": "reservation-timeslot-button-description"
-                })
-                desc_str = desc_el.get_text(strip=True) if desc_el else "None"
-
-                # Construct booking URL with date and party_size
-                booking_url = (
-                    f"https://www.sevenrooms.com/explore/electricshufflenyc/"
-                    f"reservations/create/search/?date={target_date}&halo=120&"
-                    f"party_size={guests}&start_time=ALL"
-                )
-
-                slot_data = {
-                    "date": target_date,
-                    "time": time_str,
-                    "price": desc_str,      # Using description as price/value
-                    "status": "Available",
-                    "timestamp": datetime.now().isoformat(),
-                    "website": "Electric Shuffle (Nomad)",
-                    "booking_url": booking_url
-                }
-
-                results.append(slot_data)
+        return scrape_sevenrooms_venue('electricshufflenyc', guests, str(target_date))
+    except Exception as e:
+        logger.error(f"Error scraping Electric Shuffle NYC: {e}", exc_info=True)
+        raise e
 
-        return results
 
+def scrape_electric_shuffle_range(guests, dates):
+    """Electric Shuffle NYC scraper for a window of dates"""
+    try:
+        return scrape_sevenrooms_range('electricshufflenyc', guests, [str(d) for d in dates])
     except Exception as e:
         logger.error(f"Error scraping Electric Shuffle NYC: {e}", exc_info=True)
         raise e
@@ -232,7 +151,7 @@ def scrape_electric_shuffle_london(guests, target_date):
             f"preferedvenue=7&preferedtime=23%3A00&guestQuantity={guests}&date={target_date}"
         )
 
-        with BaseScraper() as scraper:
+        with BaseScraper(blocking_profile='standard', name='electric_shuffle') as scraper:
 
             # ---- LOAD PAGE QUICKLY + FORCE STOP ----
             try:
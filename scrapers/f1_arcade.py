@@ -32,12 +32,15 @@ def scrape_f1_arcade(guests, target_date, f1_experience):
     xp_xpath = xp_map.get(f1_experience)
 
     try:
-        with BaseScraper() as scraper:
+        with BaseScraper(blocking_profile='standard', name='f1_arcade') as scraper:
 
             # Open home page
             scraper.goto("https://f1arcade.com/uk/booking/venue/london",
                          timeout=60000, wait_until="domcontentloaded")
-            scraper.wait_for_timeout(4000)
+            try:
+                scraper.page.wait_for_selector("#adults-group-size", state="attached", timeout=10000)
+            except Exception:
+                print("[DEBUG] Guest input not rendered yet")
 
             # -----------------------------------------------------------------
             # 1️⃣ SET GUEST COUNT
@@ -54,7 +57,7 @@ def scrape_f1_arcade(guests, target_date, f1_experience):
                 }}
             """)
 
-            scraper.wait_for_timeout(800)
+            scraper.wait_for_network_quiet(quiet_ms=300, timeout=800)
 
             # -----------------------------------------------------------------
             # 2️⃣ SELECT EXPERIENCE
@@ -65,12 +68,11 @@ def scrape_f1_arcade(guests, target_date, f1_experience):
                 xp_btn = scraper.page.locator(xp_xpath)
                 if xp_btn.count() > 0:
                     xp_btn.first.evaluate("el => el.scrollIntoView()")
-                    scraper.wait_for_timeout(600)
                     xp_btn.first.evaluate("el => el.click()")
                 else:
                     print(f"[WARN] Experience not found: {f1_experience}")
 
-            scraper.wait_for_timeout(1500)
+            scraper.wait_for_network_quiet(quiet_ms=300, timeout=1500)
 
             # -----------------------------------------------------------------
             # 3️⃣ CLICK CONTINUE
@@ -91,7 +93,6 @@ def scrape_f1_arcade(guests, target_date, f1_experience):
 
             # Scroll into view for safety
             first_btn.evaluate("el => el.scrollIntoView({ behavior: 'smooth', block: 'center' })")
-            scraper.wait_for_timeout(500)
 
             # JS click – avoids strict mode and overlay issues
             clicked = scraper.page.evaluate("""
@@ -103,10 +104,12 @@ def scrape_f1_arcade(guests, target_date, f1_experience):
             """)
 
             print("[DEBUG] Continue clicked:", clicked)
-            scraper.wait_for_timeout(2000)
 
-
-            scraper.wait_for_timeout(4000)
+            # Wait for the date picker to replace the experience step (old budget: 6s)
+            try:
+                scraper.page.wait_for_selector('#date-picker h2', state="attached", timeout=6000)
+            except Exception:
+                print("[DEBUG] Date picker not rendered yet")
 
             # -----------------------------------------------------------------
             # 4️⃣ CALENDAR LOGIC
@@ -119,13 +122,17 @@ def scrape_f1_arcade(guests, target_date, f1_experience):
 
             # Reset calendar backwards first
             for _ in range(6):
-                scraper.page.evaluate("""
+                previous_header = scraper.page.evaluate("""
                     () => {
+                        let h = document.querySelector('#date-picker h2');
                         let b = document.getElementById("prev-month-btn");
                         if (b) b.click();
+                        return h ? h.textContent.trim() : "";
                     }
                 """)
-                scraper.wait_for_timeout(180)
+                if not scraper.wait_for_text_change('#date-picker h2', previous_text=previous_header, timeout=500):
+                    # Header stopped changing - already at the earliest bookable month
+                    break
 
             # Move forward to target month
             while True:
@@ -145,7 +152,7 @@ def scrape_f1_arcade(guests, target_date, f1_experience):
                     }
                 """)
 
-                scraper.wait_for_timeout(250)
+                scraper.wait_for_text_change('#date-picker h2', previous_text=header, timeout=2000)
 
             # Select day
             print("[DEBUG] Clicking day:", day)
@@ -171,7 +178,8 @@ def scrape_f1_arcade(guests, target_date, f1_experience):
                 print(f"❌ Day {day} unavailable")
                 return results
 
-            scraper.wait_for_timeout(8000)
+            # Time options load via XHR after the day click (old flat wait: 8s)
+            scraper.wait_for_results('div[data-target="time-picker-option"]', timeout=8000)
 
             # -----------------------------------------------------------------
             # 5️⃣ PRICE HEADER PARSING
@@ -50,7 +50,7 @@ def scrape_five_iron_golf(guests, target_date, location='fidi'):
         dt = datetime.strptime(target_date, "%Y-%m-%d")
         api_date = dt.strftime("%Y-%m-%d")
 
-        with BaseScraper() as scraper:
+        with BaseScraper(blocking_profile='aggressive', name='five_iron_golf') as scraper:
             page = scraper.page
 
             # try:
@@ -58,11 +58,18 @@ def scrape_flight_club_darts(guests, target_date, venue_id=None):
     print("[DEBUG] URL =", url)
 
     try:
-        with BaseScraper() as scraper:
+        with BaseScraper(blocking_profile='standard', name='flight_club_darts') as scraper:
 
             print("[DEBUG] Opening booking page...")
             scraper.goto(url, timeout=60000, wait_until="domcontentloaded")
-            scraper.wait_for_timeout(10000)
+
+            # Availability sections are injected by the booking widget; wait for them
+            # (up to the old 10s budget) instead of sleeping unconditionally
+            try:
+                scraper.page.wait_for_selector("div.fc_dmnbook-availability", state="attached", timeout=10000)
+            except Exception:
+                print("[DEBUG] Availability sections did not appear within 10s")
+            scraper.wait_for_results("div.fc_dmnbook-availability-tablecell", timeout=5000)
 
             # -------------------------------------------------------
             # PARSE PAGE
@@ -157,5 +164,5 @@ def scrape_flight_club_darts(guests, target_date, venue_id=None):
     except Exception as e:
         print("[ERROR] Flight Club Darts scraper failed:", e)
         logger.error(f"Error scraping Flight Club Darts: {e}", exc_info=True)
-        return results
+        raise e
 
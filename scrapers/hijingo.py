@@ -2,7 +2,7 @@ from playwright.sync_api import Browser, BrowserContext, Page
 import time
 import logging
 from datetime import datetime
-from browser_utils import create_browser, create_browser_context, create_page, create_browser_with_context
+from browser_utils import create_page, lease_browser_context, release_browser_context
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +19,9 @@ class HijingoBookingBot:
         self.page = None
         
         # Create browser with context
-        self.browser, self.context = create_browser_with_context(
+        self.browser, self.context = lease_browser_context(
             headless=headless,
+            blocking_profile='standard',
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         )
         
@@ -147,6 +148,119 @@ class HijingoBookingBot:
             traceback.print_exc()
             return False
 
+    def _parse_slot_item(self, item):
+        """Parse one slot list item, returning None for empty or sold out items"""
+        # Check if this slot contains a date card (actual slot) vs empty list item
+        date_card = item.locator('.date-card')
+        if date_card.count() == 0:
+            return None
+
+        # Check if slot is sold out
+        date_card_classes = date_card.first.get_attribute('class') or ''
+        is_sold_out = 'date-card--sold-out' in date_card_classes
+        if is_sold_out:
+            print(f"⊗ Skipping sold out slot")
+            return None
+
+        # Extract time from span.item-dates
+        time_element = item.locator('span.item-dates')
+        if time_element.count() == 0:
+            # Try alternative selector
+            time_element = item.locator('.item-dates')
+        if time_element.count() > 0:
+            time_text = time_element.first.inner_text().strip()
+            # Extract just the start time if format is "HH:MM - HH:MM"
+            if ' - ' in time_text:
+                time_text = time_text.split(' - ')[0].strip()
+        else:
+            print(f"⚠️ Could not find time element for slot")
+            return None
+
+        # Extract price
+        try:
+            price_element = item.locator('.js-price-string-price')
+            if price_element.count() > 0:
+                price_text = price_element.first.inner_text().strip()
+            else:
+                price_text = "Price not available"
+        except:
+            price_text = "Price not available"
+
+        # Get event type (X.MAS, Hijingo OG, etc.)
+        try:
+            event_element = item.locator('.p--xsmall.weight-bold')
+            if event_element.count() > 0:
+                event_text = event_element.first.inner_text().strip()
+            else:
+                event_text = "Standard"
+        except:
+            event_text = "Standard"
+
+        # Check for special badge (free cocktail offer, etc.)
+        try:
+            badge_element = item.locator('.date-card__badge.override-badge')
+            if badge_element.count() > 0:
+                badge_text = badge_element.first.inner_text().strip()
+            else:
+                badge_text = None
+        except:
+            badge_text = None
+
+        # Check for "Last few" or other badges
+        availability_status = "Available"
+        try:
+            low_stock_badge = item.locator('.date-card__badge.low-stock')
+            if low_stock_badge.count() > 0:
+                availability_status = low_stock_badge.first.inner_text().strip()
+        except:
+            pass
+
+        slot_info = {
+            'time': time_text,
+            'price': price_text,
+            'event': event_text,
+            'availability': availability_status
+        }
+
+        if badge_text:
+            slot_info['special_offer'] = badge_text
+
+        return slot_info
+
+    def scrape_slots_by_date(self, wanted_dates=None):
+        """
+        Walk the whole slot list once and group slots under their date headers.
+        :param wanted_dates: Optional set of "YYYY-MM-DD" dates to parse; others are skipped
+        :return: Dict of date -> list of slot dicts, with an entry for every date header seen
+        """
+        slots_by_date = {}
+        current_date = None
+
+        all_list_items = self.page.locator('.slot-search__list > li')
+        count = all_list_items.count()
+
+        for i in range(count):
+            item = all_list_items.nth(i)
+
+            item_classes = item.get_attribute('class') or ''
+            if 'slot-search__item--date' in item_classes:
+                current_date = item.get_attribute('data-date')
+                slots_by_date.setdefault(current_date, [])
+                continue
+
+            if current_date is None or (wanted_dates is not None and current_date not in wanted_dates):
+                continue
+
+            try:
+                slot_info = self._parse_slot_item(item)
+            except Exception as e:
+                print(f"⚠️ Could not extract data for slot: {str(e)}")
+                continue
+            if slot_info:
+                slots_by_date[current_date].append(slot_info)
+
+        return slots_by_date
+
     def scrape_slots(self, target_date):
         """Scrape available time slots for ONLY the specific target date (excluding sold out)"""
         try:
@@ -163,121 +277,7 @@ class HijingoBookingBot:
                 date_header.wait_for(state="visible", timeout=10000)
                 print(f"✓ Found date header for {target_date}")
 
-                # Get all list items
-                all_list_items = self.page.locator('.slot-search__list > li')
-                count = all_list_items.count()
-
-                slots_data = []
-                collecting = False
-
-                for i in range(count):
-                    item = all_list_items.nth(i)
-                    
-                    # Check if this is a date header
-                    item_classes = item.get_attribute('class') or ''
-                    is_date_header = 'slot-search__item--date' in item_classes
-
-                    if is_date_header:
-                        # Get the data-date attribute
-                        item_date = item.get_attribute('data-date')
-
-                        # Start collecting when we reach our target date
-                        if item_date == target_date:
-                            collecting = True
-                            print(f"✓ Started collecting slots for {target_date}")
-                            continue
-                        # Stop collecting when we reach the next date
-                        elif collecting:
-                            print(f"✓ Reached next date ({item_date}), stopping collection")
-                            break
-                        else:
-                            continue
-
-                    # Only process slots when we're collecting for our target date
-                    if not collecting:
-                        continue
-
-                    try:
-                        # Check if this slot contains a date card (actual slot) vs empty list item
-                        date_card = item.locator('.date-card')
-                        if date_card.count() == 0:
-                            continue
-
-                        # Check if slot is sold out
-                        date_card_classes = date_card.first.get_attribute('class') or ''
-                        is_sold_out = 'date-card--sold-out' in date_card_classes
-                        if is_sold_out:
-                            print(f"⊗ Skipping sold out slot")
-                            continue
-
-                        # Extract time from span.item-dates
-                        time_element = item.locator('span.item-dates')
-                        if time_element.count() == 0:
-                            # Try alternative selector
-                            time_element = item.locator('.item-dates')
-                        if time_element.count() > 0:
-                            time_text = time_element.first.inner_text().strip()
-                            # Extract just the start time if format is "HH:MM - HH:MM"
-                            if ' - ' in time_text:
-                                time_text = time_text.split(' - ')[0].strip()
-                        else:
-                            print(f"⚠️ Could not find time element for slot")
-                            continue
-
-                        # Extract price
-                        try:
-                            price_element = item.locator('.js-price-string-price')
-                            if price_element.count() > 0:
-                                price_text = price_element.first.inner_text().strip()
-                            else:
-                                price_text = "Price not available"
-                        except:
-                            price_text = "Price not available"
-
-                        # Get event type (X.MAS, Hijingo OG, etc.)
-                        try:
-                            event_element = item.locator('.p--xsmall.weight-bold')
-                            if event_element.count() > 0:
-                                event_text = event_element.first.inner_text().strip()
-                            else:
-                                event_text = "Standard"
-                        except:
-                            event_text = "Standard"
-
-                        # Check for special badge (free cocktail offer, etc.)
-                        try:
-                            badge_element = item.locator('.date-card__badge.override-badge')
-                            if badge_element.count() > 0:
-                                badge_text = badge_element.first.inner_text().strip()
-                            else:
-                                badge_text = None
-                        except:
-                            badge_text = None
-
-                        # Check for "Last few" or other badges
-                        availability_status = "Available"
-                        try:
-                            low_stock_badge = item.locator('.date-card__badge.low-stock')
-                            if low_stock_badge.count() > 0:
-                                availability_status = low_stock_badge.first.inner_text().strip()
-                        except:
-                            pass
-
-                        slot_info = {
-                            'time': time_text,
-                            'price': price_text,
-                            'event': event_text,
-                            'availability': availability_status
-                        }
-
-                        if badge_text:
-                            slot_info['special_offer'] = badge_text
-
-                        slots_data.append(slot_info)
-
-                    except Exception as e:
-                        print(f"⚠️ Could not extract data for slot: {str(e)}")
-                        continue
+                slots_data = self.scrape_slots_by_date({target_date}).get(target_date, [])
 
                 print(f"✓ Found {len(slots_data)} available time slots for {target_date}")
                 return slots_data
@@ -329,117 +329,128 @@ class HijingoBookingBot:
         except Exception as e:
             logger.warning(f"Error closing page: {e}")
 
+        # Return the context's browser to the pool (or close it if dedicated)
         try:
-            if self.context:
-                self.context.close()
-                self.context = None
+            if self.browser or self.context:
+                release_browser_context(self.browser, self.context, label='hijingo')
         except Exception as e:
-            logger.warning(f"Error closing context: {e}")
+            logger.warning(f"Error releasing browser: {e}")
+        finally:
+            self.context = None
+            self.browser = None
+
+
+def _normalize_date(target_date):
+    """Convert MM/DD/YYYY or legacy MM/DD dates to YYYY-MM-DD"""
+    if '/' in target_date:
+        # Handle MM/DD/YYYY format
+        parts = target_date.split('/')
+        if len(parts) == 3:
+            month, day, year = parts
+            return f"{year}-{int(month):02d}-{int(day):02d}"
+        # Legacy MM/DD format - assume current year
+        month, day = parts
+        year = datetime.now().year
+        return f"{year}-{int(month):02d}-{int(day):02d}"
+    elif '-' in target_date:
+        # Already in YYYY-MM-DD format
+        return target_date
+    raise ValueError(f"Invalid date format: {target_date}. Use YYYY-MM-DD or MM/DD/YYYY")
+
+
+def _to_app_slot(slot, date_str, guests):
+    """Convert a slot dict from HijingoBookingBot to app format"""
+    # Low stock ("Last few") slots are still bookable
+    result_item = {
+        'date': date_str,
+        'time': slot.get('time', ''),
+        'price': slot.get('price', 'Price not available'),
+        'status': 'Available',
+        'website': 'Hijingo (Shoreditch)',
+        'guests': guests,
+        'timestamp': datetime.now().isoformat(),
+    }
+
+    # Add event type if available
+    if slot.get('event'):
+        result_item['description'] = slot.get('event')
+
+    # Add special offer if available
+    if slot.get('special_offer'):
+        if 'description' in result_item:
+            result_item['description'] += f" - {slot.get('special_offer')}"
+        else:
+            result_item['description'] = slot.get('special_offer')
 
-        try:
-            if self.browser:
-                self.browser.close()
-                self.browser = None
-        except Exception as e:
-            logger.warning(f"Error closing browser: {e}")
+    return result_item
 
 
-def scrape_hijingo(guests, target_date):
+def scrape_hijingo_range(guests, dates):
     """
-    Scrape Hijingo availability slots
+    Scrape Hijingo availability for a window of dates.
+
+    The booking list opened at ?depart=<date> shows consecutive date headers from
+    that date onward, so one page load covers every requested date up to the last
+    header listed (dates with no header have no sessions). Further loads are only
+    made for requested dates beyond that.
     :param guests: Number of guests (e.g., 6)
-    :param target_date: Date in format "YYYY-MM-DD" (e.g., "2025-12-25")
+    :param dates: Iterable of dates in format "YYYY-MM-DD" or "MM/DD/YYYY"
     :return: List of slot dictionaries in app format
     """
     bot = None
     results = []
-    
+    wanted = sorted({_normalize_date(d) for d in dates})
+    covered = set()
+
     try:
-        logger.info(f"[Hijingo] Starting scrape for {guests} guests on {target_date}")
+        logger.info(f"[Hijingo] Starting scrape for {guests} guests on {len(wanted)} date(s)")
         bot = HijingoBookingBot(headless=True)
-        
-        # Convert target_date to YYYY-MM-DD format if needed
-        if '/' in target_date:
-            # Handle MM/DD/YYYY format
-            parts = target_date.split('/')
-            if len(parts) == 3:
-                month, day, year = parts
-                target_date_str = f"{year}-{int(month):02d}-{int(day):02d}"
-            else:
-                # Legacy MM/DD format - assume current year
-                month, day = parts
-                year = datetime.now().year
-                target_date_str = f"{year}-{int(month):02d}-{int(day):02d}"
-        elif '-' in target_date:
-            # Already in YYYY-MM-DD format
-            target_date_str = target_date
-        else:
-            raise ValueError(f"Invalid date format: {target_date}. Use YYYY-MM-DD or MM/DD/YYYY")
-        
-        # Construct URL with date and guests
-        url = f"https://www.hijingo.com/book?depart={target_date_str}&guests={guests}"
-        logger.info(f"[Hijingo] Opening URL: {url}")
-        bot.page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        time.sleep(4)
-        
-        # Handle cookie consent
-        bot.handle_cookie_consent()
-        time.sleep(2)
-        
-        # Check if date is available
-        date_available = bot.check_date_availability(target_date_str)
-        
-        if not date_available:
-            logger.warning(f"[Hijingo] Date {target_date_str} is not available")
-            return results
-        
-        # Scrape slots
-        slots_data = bot.scrape_slots(target_date_str)
-        
-        if not slots_data:
-            logger.info(f"[Hijingo] No available slots for date {target_date_str}")
-            return results
-        
-        # Convert to app format
-        for slot in slots_data:
-            # Map availability status
-            status = slot.get('availability', 'Available')
-            if status == 'Available':
-                status = 'Available'
-            elif 'Last few' in status or 'Low stock' in status:
-                status = 'Available'  # Still available, just low stock
-            else:
-                status = 'Available'  # Default to Available
-            
-            result_item = {
-                'date': target_date_str,
-                'time': slot.get('time', ''),
-                'price': slot.get('price', 'Price not available'),
-                'status': status,
-                'website': 'Hijingo (Shoreditch)',
-                'guests': guests,
-                'timestamp': datetime.now().isoformat(),
-            }
-            
-            # Add event type if available
-            if slot.get('event'):
-                result_item['description'] = slot.get('event')
-            
-            # Add special offer if available
-            if slot.get('special_offer'):
-                if 'description' in result_item:
-                    result_item['description'] += f" - {slot.get('special_offer')}"
-                else:
-                    result_item['description'] = slot.get('special_offer')
-            
-            results.append(result_item)
-        
-        logger.info(f"[Hijingo] Found {len(results)} available slots")
+        consent_handled = False
+        page_loads = 0
+
+        while True:
+            pending = [d for d in wanted if d not in covered]
+            if not pending:
+                break
+            depart = pending[0]
+            covered.add(depart)
+
+            url = f"https://www.hijingo.com/book?depart={depart}&guests={guests}"
+            logger.info(f"[Hijingo] Opening URL: {url}")
+            bot.page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            page_loads += 1
+
+            if not consent_handled:
+                bot.handle_cookie_consent()
+                consent_handled = True
+
+            try:
+                bot.page.locator('li.slot-search__item--date').first.wait_for(state="visible", timeout=10000)
+            except Exception as e:
+                # A rendered list without date headers means nothing is bookable from
+                # depart; no list at all means the page did not load
+                if bot.page.locator('.slot-search__list').count() == 0:
+                    raise RuntimeError(f"Booking list did not load for {depart}") from e
+                logger.info(f"[Hijingo] No dates listed from {depart}")
+                continue
+            time.sleep(2)
+
+            slots_by_date = bot.scrape_slots_by_date(set(pending))
+            listed = [d for d in slots_by_date if d]
+            if listed:
+                last_listed = max(listed)
+                covered.update(d for d in pending if d <= last_listed)
+
+            for date_str in pending:
+                for slot in slots_by_date.get(date_str, []):
+                    results.append(_to_app_slot(slot, date_str, guests))
+
+        logger.info(f"[Hijingo] Found {len(results)} available slots across {len(wanted)} date(s) in {page_loads} page load(s)")
         return results
-        
+
     except Exception as e:
         logger.error(f"[Hijingo] Error during scraping: {str(e)}", exc_info=True)
-        return results
+        raise e
     finally:
         if bot:
             try:
@@ -448,6 +459,16 @@ def scrape_hijingo(guests, target_date):
                 pass
 
 
+def scrape_hijingo(guests, target_date):
+    """
+    Scrape Hijingo availability slots
+    :param guests: Number of guests (e.g., 6)
+    :param target_date: Date in format "YYYY-MM-DD" (e.g., "2025-12-25")
+    :return: List of slot dictionaries in app format
+    """
+    return scrape_hijingo_range(guests, [target_date])
+
+
 # Usage example
 if __name__ == "__main__":
     bot = HijingoBookingBot(headless=True)  # Change to True for headless mode
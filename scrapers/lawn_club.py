@@ -2,6 +2,7 @@
 from datetime import datetime
 from bs4 import BeautifulSoup
 from scrapers.base_scraper import BaseScraper
+from scrapers.sevenrooms import fetch_availability, parse_shifts, build_slot, SevenRoomsError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -263,9 +264,71 @@ LAWN_CLUB_VENUE_NAMES = {
 
 
 
+# Keywords identifying each option in SevenRooms slot descriptions / seating areas / shift names
+LAWN_CLUB_OPTION_KEYWORDS = {
+    'indoor_gaming': ('indoor',),
+    'curling_lawns': ('curling',),
+    'croquet_lawns': ('croquet',),
+}
+
+
+def _lawn_club_slot_option(slot):
+    """Which Lawn Club option a SevenRooms API slot belongs to (or None)"""
+    text = " ".join(
+        str(slot.get(key) or '') for key in ('description', 'seating_area', 'shift')
+    ).lower()
+    for option, keywords in LAWN_CLUB_OPTION_KEYWORDS.items():
+        if any(keyword in text for keyword in keywords):
+            return option
+    return None
+
+
+def scrape_lawn_club_api(guests, target_date, option='indoor_gaming'):
+    """
+    Lawn Club via the shared SevenRooms engine.
+
+    All three options live under the single 'lawnclubnyc' SevenRooms venue, so
+    slots are split by keyword. The API result is only trusted when at least one
+    slot on that date maps to a known option; otherwise None is returned and the
+    caller should use the browser flow.
+    """
+    venue_name = LAWN_CLUB_VENUE_NAMES.get(option, 'The Lawn Club (Indoor Gaming)')
+    availability = fetch_availability('lawnclubnyc', target_date, guests)
+    slots = parse_shifts(availability.get(target_date), bookable_only=False)
+    if not any(_lawn_club_slot_option(slot) for slot in slots):
+        return None
+
+    results = [
+        build_slot('lawnclubnyc', venue_name, guests, target_date, slot['time'], slot['description'])
+        for slot in slots
+        if slot['type'] == 'book' and _lawn_club_slot_option(slot) == option
+    ]
+    logger.info(f"[Lawn Club] {len(results)} {option} slots for {target_date} via SevenRooms API")
+    return results
+
+
 def scrape_lawn_club(guests, target_date, option='indoor_gaming', selected_time=None, selected_duration=None):
     """
-    Lawn Club NYC scraper function for a specific option
+    Lawn Club NYC scraper function for a specific option.
+
+    Uses the SevenRooms API unless a specific time/duration was requested (those
+    are picker selections only the booking page understands) or the API result
+    cannot be mapped to options; then falls back to driving the booking page.
+    """
+    if not selected_time and not selected_duration:
+        try:
+            results = scrape_lawn_club_api(guests, target_date, option)
+            if results is not None:
+                return results
+            logger.info("[Lawn Club] Could not map API slots to options, using browser flow")
+        except SevenRoomsError as e:
+            logger.warning(f"[Lawn Club] SevenRooms API unavailable ({e}), using browser flow")
+    return scrape_lawn_club_browser(guests, target_date, option, selected_time, selected_duration)
+
+
+def scrape_lawn_club_browser(guests, target_date, option='indoor_gaming', selected_time=None, selected_duration=None):
+    """
+    Lawn Club NYC scraper function for a specific option (booking page flow)
     
     Args:
         guests: Number of guests
@@ -307,10 +370,9 @@ def scrape_lawn_club(guests, target_date, option='indoor_gaming', selected_time=
     try:
         date_str = target_date
         
-        with BaseScraper() as scraper:
+        with BaseScraper(blocking_profile='standard', name='lawn_club') as scraper:
             print('start')
             scraper.goto("https://www.sevenrooms.com/landing/lawnclubnyc", timeout=60000, wait_until="networkidle")
-            scraper.wait_for_timeout(8000)  # Wait for page to fully render
             
             logger.info(f'Navigating to Lawn Club NYC {option_display}...')
             
@@ -322,11 +384,10 @@ def scrape_lawn_club(guests, target_date, option='indoor_gaming', selected_time=
                 return results
             
             scraper.click(f'//a[contains(text(), "{option_display}")]')
-            scraper.wait_for_timeout(5000)  # Wait for navigation
             
             try:
+                # wait_for_selector also lets the widget's follow-up requests settle
                 scraper.wait_for_selector('button[data-test="sr-calendar-date-button"]', timeout=60000)
-                scraper.wait_for_timeout(3000)  # Additional wait for calendar to be ready
             except Exception as e:
                 logger.info('Page did not load properly for Lawn Club')
                 return results
@@ -350,6 +411,10 @@ def scrape_lawn_club(guests, target_date, option='indoor_gaming', selected_time=
                     scraper.click('button[aria-label="increment Date"]')
                 except:
                     break
+                scraper.wait_for_text_change(
+                    'button[data-test="sr-calendar-date-button"] div',
+                    previous_text=current_date.strip(), timeout=2000
+                )
             while True:
                 content = scraper.get_content()
                 soup = BeautifulSoup(content, "html.parser")
@@ -367,6 +432,10 @@ def scrape_lawn_club(guests, target_date, option='indoor_gaming', selected_time=
                         scraper.click('button[aria-label="increment Guest"]')
                 except:
                     break
+                scraper.wait_for_text_change(
+                    'button[data-test="sr-guest-count-button"] div',
+                    previous_text=current_guests, timeout=2000
+                )
             
             normalized_time = normalize_time_value(selected_time)
             if normalized_time:
@@ -387,7 +456,7 @@ def scrape_lawn_club(guests, target_date, option='indoor_gaming', selected_time=
                     normalize_time_value
                 ):
                     logger.warning(f"Could not set Lawn Club time to {normalized_time}")
-                scraper.wait_for_timeout(1000)  # Increased wait after time selection
+                scraper.wait_for_network_quiet(quiet_ms=300, timeout=1000)
             
             normalized_duration = normalize_duration_value(selected_duration)
             if normalized_duration:
@@ -408,10 +477,9 @@ def scrape_lawn_club(guests, target_date, option='indoor_gaming', selected_time=
                     normalize_duration_value
                 ):
                     logger.warning(f"Could not set Lawn Club duration to {normalized_duration}")
-                scraper.wait_for_timeout(1000)  # Increased wait after duration selection
             
-            # Wait a moment to ensure URL has updated with all selections
-            scraper.wait_for_timeout(2000)  # Increased wait for URL update
+            # Wait for the widget to settle so the URL reflects all selections
+            scraper.wait_for_network_quiet(quiet_ms=500, timeout=2000)
             
             # Capture the booking URL after all selections
             booking_url = scraper.page.url
@@ -422,7 +490,6 @@ def scrape_lawn_club(guests, target_date, option='indoor_gaming', selected_time=
                 # Wait for search button to be available
                 scraper.wait_for_selector('button[data-test="sr-search-button"]', timeout=30000)
                 scraper.click('button[data-test="sr-search-button"]')
-                scraper.wait_for_timeout(6000)  # Increased wait after clicking search
             except Exception as e:
                 logger.info('Could not click search button')
                 return results
@@ -436,7 +503,7 @@ def scrape_lawn_club(guests, target_date, option='indoor_gaming', selected_time=
                 logger.warning("⛔ No SevenRooms slot buttons found")
                 return results
 
-            scraper.wait_for_timeout(2000)
+            scraper.wait_for_dom_stable('button[data-test="sr-timeslot-button"]', stable_ms=500, timeout=2000)
 
             content = scraper.get_content()
             soup = BeautifulSoup(content, "html.parser")
@@ -37,7 +37,7 @@ def scrape_lucky_strike(guests, target_date, location='chelsea_piers'):
 
         logger.info(f"[LuckyStrike] Navigating to: {url} (location: {location})")
 
-        with BaseScraper() as scraper:
+        with BaseScraper(blocking_profile='standard', name='lucky_strike') as scraper:
             scraper.page.set_default_timeout(60000)
 
             # Load quickly then stop heavy JS loading
@@ -1,6 +1,11 @@
 import json
+import os
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,12 +16,37 @@ BASE_URL = (
 )
 COOKIE_REGION = {"Cookie": "current_region=london"}
 
+# Start hours of the 2-hour windows the availability API is queried with (12-14, 15-17, 18-20, 21-23)
+TIME_WINDOW_STARTS = (12, 15, 18, 21)
+
+# Concurrent time-window requests per scrape
+PINGPONG_MAX_WORKERS = int(os.getenv('PINGPONG_MAX_WORKERS', '4'))
+
+# Seconds to wait before retrying a failed time-window request
+WINDOW_RETRY_DELAY = float(os.getenv('PINGPONG_WINDOW_RETRY_DELAY', '1'))
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Shared keep-alive session, recreated after fork."""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(4, PINGPONG_MAX_WORKERS))
+            session.mount("https://", adapter)
+            session.headers.update(COOKIE_REGION)
+            _session = session
+            _session_pid = os.getpid()
+        return _session
+
 
 def fetch_json(url: str, params: dict) -> dict:
     """Send GET request and return JSON or raise helpful error."""
-    with requests.Session() as session:
-        session.headers.update(COOKIE_REGION)
-        response = session.get(url, params=params, timeout=10)
+    response = get_session().get(url, params=params, timeout=10)
 
     if response.status_code != 200:
         raise RuntimeError(f"Request failed [{response.status_code}]: {response.text}")
@@ -48,6 +78,29 @@ def fetch_available_dates(num_people: int, start_date: str) -> list:
     return valid_dates
 
 
+def fetch_available_dates_in_range(num_people: int, dates) -> list:
+    """Return the bookable dates among ``dates``, continuing the lookup if the API stops short."""
+    wanted = sorted(set(dates))
+    if not wanted:
+        return []
+
+    wanted_set = set(wanted)
+    bookable = set()
+    start_date = wanted[0]
+    while True:
+        valid_dates = fetch_available_dates(num_people, start_date)
+        bookable.update(d for d in valid_dates if d in wanted_set)
+        if not valid_dates or max(valid_dates) >= wanted[-1]:
+            break
+        # The lookup returned a partial list; resume after the last date it covered
+        next_start = (datetime.strptime(max(valid_dates), "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+        if next_start <= start_date:
+            break
+        start_date = next_start
+
+    return [d for d in wanted if d in bookable]
+
+
 def fetch_available_times(date: str, num_people: int, time_from: int) -> list:
     """Fetch valid booking times within a 2-hour range."""
     params = {
@@ -71,85 +124,116 @@ def fetch_available_times(date: str, num_people: int, time_from: int) -> list:
     ]
 
 
+def fetch_times_for_date(date: str, num_people: int) -> list:
+    """Fetch every bookable time for a date, querying the four 2-hour windows concurrently."""
+    return fetch_times_for_dates([date], num_people).get(date, [])
+
+
+def fetch_times_for_dates(dates, num_people: int) -> dict:
+    """Fetch bookable times for several dates; every (date, window) request runs on the shared pool."""
+    def fetch_window(job):
+        # A failed window is retried once, then fails the scrape: returning no
+        # times for it would be saved as "sold out" and remove its slots
+        date, start_time = job
+        try:
+            return date, fetch_available_times(date, num_people, start_time)
+        except Exception as e:
+            logger.warning(f"[Bounce] Error fetching times for {date} window {start_time}:00-{start_time+2}:59, retrying: {e}")
+        time.sleep(WINDOW_RETRY_DELAY)
+        return date, fetch_available_times(date, num_people, start_time)
+
+    jobs = [(date, start_time) for date in dates for start_time in TIME_WINDOW_STARTS]
+    times_by_date = {date: [] for date in dates}
+    if not jobs:
+        return times_by_date
+
+    with ThreadPoolExecutor(max_workers=max(1, min(PINGPONG_MAX_WORKERS, len(jobs)))) as executor:
+        for date, times in executor.map(fetch_window, jobs):
+            times_by_date[date].extend(times)
+
+    return {date: sorted(set(times)) for date, times in times_by_date.items()}
+
+
+def build_slot(guests, date, time_str):
+    """Build an app-format slot with a prefilled DesignMyNight booking URL."""
+    # URL encode the time (e.g., "20:30" becomes "20%3A30")
+    time_encoded = time_str.replace(':', '%3A')
+    booking_url = (
+        f"https://bookings.designmynight.com/book?"
+        f"widget_version=2&"
+        f"venue_id=512b203fd5d190d2978ca644&"
+        f"venue_group=5536821278727915249864d6&"
+        f"type=5955253c91c098669b3202d3&"
+        f"num_people={guests}&"
+        f"date={date}&"
+        f"time={time_encoded}&"
+        f"duration=55&"
+        f"marketing_preferences=&"
+        f"tags=%7B%7D&"
+        f"source=partner&"
+        f"return_url=https%3A%2F%2Fwww.bouncepingpong.com%2Fapi%2Fbooking-confirmed%2F&"
+        f"return_method=post&"
+        f"gtm_account=Farringdon_booknow&"
+        f"locale=en-GB"
+    )
+
+    return {
+        'date': date,
+        'time': time_str,
+        'price': 'Price not available',  # API doesn't provide price
+        'status': 'Available',
+        'website': 'Bounce (Farringdon)',
+        'guests': guests,
+        'timestamp': datetime.now().isoformat(),
+        'booking_url': booking_url,
+    }
+
+
 def scrape_pingpong(guests, target_date):
     """
     Scrape Bounce availability slots
     :param guests: Number of guests (e.g., 4)
     :param target_date: Date in format "YYYY-MM-DD" (e.g., "2026-01-15")
+    :return: List of slot dictionaries in app format (target_date only)
+    """
+    return scrape_pingpong_range(guests, [target_date])
+
+
+def scrape_pingpong_range(guests, dates):
+    """
+    Scrape Bounce availability for exactly the given window of dates
+    :param guests: Number of guests (e.g., 4)
+    :param dates: Iterable of dates in format "YYYY-MM-DD"
     :return: List of slot dictionaries in app format
     """
     results = []
-    
+    wanted = sorted(set(dates))
+    if not wanted:
+        return results
+
     try:
-        logger.info(f"[Bounce] Starting scrape for {guests} guests on {target_date}")
-        
-        # Fetch available dates starting from target_date
-        dates = fetch_available_dates(guests, target_date)
-        
-        if not dates:
-            logger.info(f"[Bounce] No available dates found starting from {target_date}")
+        logger.info(f"[Bounce] Starting scrape for {guests} guests, {wanted[0]} to {wanted[-1]}")
+
+        # One date lookup covers the whole window; only bookable dates need time lookups
+        bookable = fetch_available_dates_in_range(guests, wanted)
+
+        if not bookable:
+            logger.info(f"[Bounce] No available dates found between {wanted[0]} and {wanted[-1]}")
             return results
-        
-        logger.info(f"[Bounce] Found {len(dates)} available date(s)")
-        
-        # For each date, fetch all available times
-        for date in dates:
-            all_times = []
-            
-            # Check all time windows (12-14, 15-17, 18-20, 21-23)
-            start_time = 12
-            for window in range(4):
-                try:
-                    times = fetch_available_times(date, guests, start_time)
-                    if times:
-                        all_times.extend(times)
-                except Exception as e:
-                    logger.warning(f"[Bounce] Error fetching times for {date} window {start_time}:00-{start_time+2}:59: {e}")
-                
-                start_time += 3
-            
-            # Create slot entries for each time
-            for time_str in sorted(all_times):
-                # Construct booking URL with date, time, and guests
-                # URL encode the time (e.g., "20:30" becomes "20%3A30")
-                time_encoded = time_str.replace(':', '%3A')
-                booking_url = (
-                    f"https://bookings.designmynight.com/book?"
-                    f"widget_version=2&"
-                    f"venue_id=512b203fd5d190d2978ca644&"
-                    f"venue_group=5536821278727915249864d6&"
-                    f"type=5955253c91c098669b3202d3&"
-                    f"num_people={guests}&"
-                    f"date={date}&"
-                    f"time={time_encoded}&"
-                    f"duration=55&"
-                    f"marketing_preferences=&"
-                    f"tags=%7B%7D&"
-                    f"source=partner&"
-                    f"return_url=https%3A%2F%2Fwww.bouncepingpong.com%2Fapi%2Fbooking-confirmed%2F&"
-                    f"return_method=post&"
-                    f"gtm_account=Farringdon_booknow&"
-                    f"locale=en-GB"
-                )
-                
-                result_item = {
-                    'date': date,
-                    'time': time_str,
-                    'price': 'Price not available',  # API doesn't provide price
-                    'status': 'Available',
-                    'website': 'Bounce (Farringdon)',
-                    'guests': guests,
-                    'timestamp': datetime.now().isoformat(),
-                    'booking_url': booking_url,
-                }
-                results.append(result_item)
-        
+
+        logger.info(f"[Bounce] {len(bookable)}/{len(wanted)} date(s) bookable")
+
+        times_by_date = fetch_times_for_dates(bookable, guests)
+        for date in bookable:
+            for time_str in times_by_date.get(date, []):
+                results.append(build_slot(guests, date, time_str))
+
         logger.info(f"[Bounce] Found {len(results)} available slots")
         return results
-        
+
     except Exception as e:
         logger.error(f"[Bounce] Error during scraping: {str(e)}", exc_info=True)
-        return results
+        raise e
 
 
 def main():
@@ -6,7 +6,8 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 from playwright.sync_api import Browser, BrowserContext, Page
 import re
-from browser_utils import create_browser, create_browser_context, create_page, create_browser_with_context
+from browser_utils import create_page, lease_browser_context, release_browser_context
+from rate_limiter import report_throttled
 import logging
 
 logger = logging.getLogger(__name__)
@@ -113,11 +114,12 @@ class ExploretockAutomation:
             self.log("Initializing Playwright with FlareSolverr cookies...", "INFO")
 
             # Create browser with context
-            browser_kwargs = {'headless': self.headless}
+            # Only drop heavy assets - Cloudflare checks need scripts/styles intact
+            browser_kwargs = {'headless': self.headless, 'blocking_profile': 'minimal'}
             if self.user_agent:
                 browser_kwargs['user_agent'] = self.user_agent
             
-            self.browser, self.context = create_browser_with_context(**browser_kwargs)
+            self.browser, self.context = lease_browser_context(**browser_kwargs)
             
             # Create page
             self.page = create_page(self.context, timeout=30000)
@@ -476,7 +478,7 @@ class ExploretockAutomation:
 
         except Exception as e:
             self.log(f"Error scraping times: {str(e)}", "ERROR")
-            return []
+            return None
 
     def print_available_times(self, times):
         """Print times in formatted table"""
@@ -502,6 +504,7 @@ class ExploretockAutomation:
             self.log("Step 1: Bypassing Cloudflare with FlareSolverr", "STEP")
             if not self.create_flaresolverr_session():
                 self.log("Failed to bypass Cloudflare", "ERROR")
+                report_throttled('exploretock', 'Cloudflare challenge not solved')
                 return False
 
             # Step 2: Initialize Playwright with cookies and navigate to direct URL
@@ -524,6 +527,8 @@ class ExploretockAutomation:
             # Step 4: Scrape times (date and guest count are already set via URL)
             self.log("Step 4: Scraping available times", "STEP")
             times = self.scrape_modal_times()
+            if times is None:
+                return False
 
             if times:
                 self.print_available_times(times)
@@ -537,7 +542,7 @@ class ExploretockAutomation:
             self.log(f"Unexpected error: {str(e)}", "ERROR")
             import traceback
             traceback.print_exc()
-            return []
+            return False
 
         finally:
             self.cleanup()
@@ -551,19 +556,15 @@ class ExploretockAutomation:
         except Exception as e:
             logger.warning(f"Error closing page: {e}")
 
+        # Return the context's browser to the pool (or close it if dedicated)
         try:
-            if self.context:
-                self.context.close()
-                self.context = None
-        except Exception as e:
-            logger.warning(f"Error closing context: {e}")
-
-        try:
-            if self.browser:
-                self.browser.close()
-                self.browser = None
+            if self.browser or self.context:
+                release_browser_context(self.browser, self.context, label='puttery')
         except Exception as e:
-            logger.warning(f"Error closing browser: {e}")
+            logger.warning(f"Error releasing browser: {e}")
+        finally:
+            self.context = None
+            self.browser = None
 
 
 def scrape_puttery(guests, target_date):
@@ -604,8 +605,10 @@ def scrape_puttery(guests, target_date):
         )
         automation.original_date_format = target_date  # Store original format for return
         
-        # Run the automation - it returns the scraped times
+        # Run the automation - it returns the scraped times, or False if it failed
         results = automation.run()
+        if results is False:
+            raise RuntimeError(f"Puttery automation failed for {target_date}")
         
         if results:
             logger.info(f"[PUTTERY] Successfully scraped {len(results)} time slots")
@@ -617,6 +620,7 @@ def scrape_puttery(guests, target_date):
                 
     except Exception as e:
         logger.error(f"[PUTTERY] Error during scraping: {e}", exc_info=True)
+        raise e
     
     return results
 
@@ -17,14 +17,17 @@ def scrape_puttshack(location, guests, target_date):
     print(f"[DEBUG] Date: {target_date}")
 
     try:
-        with BaseScraper() as scraper:
+        with BaseScraper(blocking_profile='standard', name='puttshack') as scraper:
 
             # ------------------------------------------------------------
             # OPEN PAGE
             # ------------------------------------------------------------
             print("[DEBUG] Opening booking page...")
             scraper.goto("https://www.puttshack.com/book-golf", timeout=60000)
-            scraper.wait_for_timeout(4000)
+            try:
+                scraper.page.wait_for_selector('button.input-button.svelte-9udp5p', timeout=15000)
+            except Exception:
+                print("[DEBUG] Country selector not rendered yet")
 
             # ------------------------------------------------------------
             # CLOSE POPUPS (GetSiteControl widget)
@@ -38,7 +41,6 @@ def scrape_puttshack(location, guests, target_date):
                         .forEach(w => w.remove());
                 }
             """)
-            scraper.wait_for_timeout(500)
 
             # ------------------------------------------------------------
             # COUNTRY SELECT
@@ -46,7 +48,7 @@ def scrape_puttshack(location, guests, target_date):
             print("[DEBUG] Selecting country...")
             scraper.click('button.input-button.svelte-9udp5p')
             scraper.click('div[data-label="United Kingdom"]')
-            scraper.wait_for_timeout(1000)
+            scraper.wait_for_network_quiet(quiet_ms=300, timeout=1000)
 
             # ------------------------------------------------------------
             # VENUE SELECT
@@ -59,7 +61,7 @@ def scrape_puttshack(location, guests, target_date):
             ).first
 
             venue_btn.click()
-            scraper.wait_for_timeout(1000)
+            scraper.wait_for_network_quiet(quiet_ms=300, timeout=1000)
 
             # ------------------------------------------------------------
             # DATE SELECT
@@ -67,7 +69,10 @@ def scrape_puttshack(location, guests, target_date):
             print("[DEBUG] Opening date selector...")
             scraper.click('button[aria-label="Date Selector"]')
 
-            scraper.wait_for_timeout(1500)
+            try:
+                scraper.page.wait_for_selector('button[aria-label="Previous"]', timeout=1500)
+            except Exception:
+                pass
 
             # Go back 2 months (matches your Selenium version)
             scraper.click('button[aria-label="Previous"]')
@@ -88,14 +93,17 @@ def scrape_puttshack(location, guests, target_date):
                         print("[ERROR] Could not click NEXT in calendar")
                         break
 
-            scraper.wait_for_timeout(1500)
+            scraper.wait_for_network_quiet(quiet_ms=300, timeout=1500)
 
             # ------------------------------------------------------------
             # PLAYER COUNT
             # ------------------------------------------------------------
             print("[DEBUG] Selecting players:", guests)
             scraper.click('button[aria-label="Player Selector"]')
-            scraper.wait_for_timeout(1000)
+            try:
+                scraper.page.wait_for_selector('.count.svelte-1v5dv5l', state="attached", timeout=1000)
+            except Exception:
+                pass
 
             while True:
                 # read current value
@@ -113,16 +121,16 @@ def scrape_puttshack(location, guests, target_date):
                 # Increase
                 scraper.click("button[aria-label='Increase player count']", timeout=2000)
 
-                scraper.wait_for_timeout(300)
+                scraper.wait_for_text_change('.count.svelte-1v5dv5l', previous_text=str(current), timeout=1000)
 
-            scraper.wait_for_timeout(800)
+            scraper.wait_for_network_quiet(quiet_ms=300, timeout=800)
 
             # ------------------------------------------------------------
             # SEARCH FOR TIME
             # ------------------------------------------------------------
             print("[DEBUG] Clicking Find a time...")
             scraper.click('button[aria-label="Find a time"]')
-            scraper.wait_for_timeout(5000)
+            scraper.wait_for_results("button.timeslot.svelte-1ihytzt", timeout=5000)
 
             # Sometimes they show session type
             try:
@@ -133,7 +141,7 @@ def scrape_puttshack(location, guests, target_date):
                 if choose_btn.is_visible():
                     print("[DEBUG] Selecting session type...")
                     choose_btn.click()
-                    scraper.wait_for_timeout(5000)
+                    scraper.wait_for_results("button.timeslot.svelte-1ihytzt", timeout=5000)
 
             except:
                 pass
@@ -179,6 +187,6 @@ def scrape_puttshack(location, guests, target_date):
 
     except Exception as e:
         print("[ERROR] Puttshack scraper failure:", e)
-        return results
+        raise e
 
 
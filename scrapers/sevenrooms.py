@@ -0,0 +1,438 @@
+"""
+Shared SevenRooms availability engine
+
+Every SevenRooms venue (Electric Shuffle NYC, Fair Game, Topgolf Chigwell,
+Lawn Club, ...) renders its slot grid from the same widget API:
+
+    GET https://www.sevenrooms.com/api-yoa/availability/widget/range
+        ?venue=<slug>&party_size=N&start_date=MM-DD-YYYY&num_days=N&...
+
+This module calls that endpoint directly over a pooled requests.Session and
+only opens a browser when SevenRooms refuses the plain HTTP request (to pick
+up cookies) or the API response is unusable. Venues are configured by slug in
+SEVENROOMS_VENUES, so a venue scraper is just a thin wrapper around
+scrape_sevenrooms_venue().
+"""
+import os
+import threading
+import logging
+from datetime import datetime, timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup
+
+from browser_utils import DEFAULT_USER_AGENT
+from rate_limiter import report_throttled
+
+logger = logging.getLogger(__name__)
+
+SEVENROOMS_API_URL = "https://www.sevenrooms.com/api-yoa/availability/widget/range"
+SEVENROOMS_AVAILABILITY_PATTERN = "/api-yoa/availability"
+
+# Query the whole day: centre on noon with a halo wide enough to cover opening to close
+SEVENROOMS_TIME_SLOT = os.getenv('SEVENROOMS_TIME_SLOT', '12:00')
+SEVENROOMS_HALO_SIZE_INTERVAL = int(os.getenv('SEVENROOMS_HALO_SIZE_INTERVAL', '100'))
+# Dates requested per API call when harvesting a range
+SEVENROOMS_MAX_DAYS_PER_REQUEST = int(os.getenv('SEVENROOMS_MAX_DAYS_PER_REQUEST', '7'))
+
+# Venue configuration keyed by SevenRooms slug.
+#   venue_name  - name stored in availability_slots
+#   search_url  - public booking page; {date} and {guests} are filled in
+SEVENROOMS_VENUES = {
+    'electricshufflenyc': {
+        'venue_name': 'Electric Shuffle (Nomad)',
+        'search_url': (
+            "https://www.sevenrooms.com/explore/electricshufflenyc/"
+            "reservations/create/search/?date={date}&halo=120&party_size={guests}&start_time=ALL"
+        ),
+    },
+    'fairgame': {
+        'venue_name': 'Fair Game (Canary Wharf)',
+        'search_url': (
+            "https://www.sevenrooms.com/explore/fairgame/"
+            "reservations/create/search?date={date}&party_size={guests}"
+        ),
+    },
+    'fairgamecity': {
+        'venue_name': 'Fair Game (City)',
+        'search_url': (
+            "https://www.sevenrooms.com/explore/fairgamecity/"
+            "reservations/create/search?date={date}&party_size={guests}"
+        ),
+    },
+    'topgolfchigwell': {
+        'venue_name': 'Topgolf (Chigwell)',
+        'search_url': (
+            "https://www.sevenrooms.com/explore/topgolfchigwell/"
+            "reservations/create/search?date={date}&party_size={guests}"
+        ),
+    },
+    'lawnclubnyc': {
+        # One SevenRooms venue, split into options by lawn_club.py
+        'venue_name': 'The Lawn Club',
+        'search_url': "https://www.sevenrooms.com/landing/lawnclubnyc",
+    },
+}
+
+
+class SevenRoomsError(Exception):
+    """SevenRooms API request failed or returned something we cannot parse"""
+
+
+class SevenRoomsBlocked(SevenRoomsError):
+    """SevenRooms rejected the plain HTTP request (403 / bot challenge)"""
+
+
+# ---------------------------------------------------------------------------
+# HTTP session (one per process, shared by all SevenRooms venues)
+# ---------------------------------------------------------------------------
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Pooled keep-alive session, recreated after fork"""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            session = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                          allowed_methods=frozenset(['GET']))
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+            session.mount("https://", adapter)
+            session.headers.update({
+                "User-Agent": DEFAULT_USER_AGENT,
+                "Accept": "application/json, text/plain, */*",
+                "Accept-Language": "en-US,en;q=0.9",
+                "Origin": "https://www.sevenrooms.com",
+            })
+            _session = session
+            _session_pid = os.getpid()
+        return _session
+
+
+def _store_browser_cookies(cookies):
+    """Copy cookies from a Playwright context into the shared session"""
+    session = get_session()
+    for cookie in cookies or []:
+        try:
+            session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain'), path=cookie.get('path', '/'),
+            )
+        except Exception as e:
+            logger.debug(f"[SevenRooms] Could not copy cookie {cookie.get('name')}: {e}")
+    logger.info(f"[SevenRooms] Bootstrapped {len(cookies or [])} cookies from browser")
+
+
+# ---------------------------------------------------------------------------
+# API fetch + parse
+# ---------------------------------------------------------------------------
+
+def fetch_availability(slug, start_date, party_size, num_days=1, time_slot=None, timeout=20):
+    """
+    Fetch raw availability for num_days starting at start_date.
+
+    Args:
+        slug: SevenRooms venue slug (e.g. 'fairgame')
+        start_date: 'YYYY-MM-DD'
+        party_size: Number of guests
+        num_days: Number of consecutive days to return
+        time_slot: Centre of the search window ('HH:MM'); defaults to SEVENROOMS_TIME_SLOT
+
+    Returns:
+        Dict of 'YYYY-MM-DD' -> list of shifts (each with a 'times' list)
+
+    Raises:
+        SevenRoomsBlocked: request was refused (needs browser cookies)
+        SevenRoomsError: any other failure
+    """
+    dt = datetime.strptime(start_date, "%Y-%m-%d")
+    params = {
+        "venue": slug,
+        "time_slot": time_slot or SEVENROOMS_TIME_SLOT,
+        "party_size": party_size,
+        "halo_size_interval": SEVENROOMS_HALO_SIZE_INTERVAL,
+        "start_date": dt.strftime("%m-%d-%Y"),
+        "num_days": num_days,
+        "channel": "SEVENROOMS_WIDGET",
+    }
+    config = SEVENROOMS_VENUES.get(slug, {})
+    headers = {"Referer": config.get('search_url', 'https://www.sevenrooms.com/').split('?')[0]}
+
+    try:
+        response = get_session().get(SEVENROOMS_API_URL, params=params, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        raise SevenRoomsError(f"{slug}: request failed: {e}") from e
+
+    if response.status_code == 429:
+        # Pause all SevenRooms venues for a while (see rate_limiter.py)
+        report_throttled('sevenrooms', f"{slug}: HTTP 429")
+    if response.status_code in (401, 403, 429):
+        raise SevenRoomsBlocked(f"{slug}: HTTP {response.status_code}")
+    if response.status_code != 200:
+        raise SevenRoomsError(f"{slug}: HTTP {response.status_code}")
+
+    try:
+        payload = response.json()
+    except ValueError:
+        # Cloudflare / bot challenges come back as HTML with a 200
+        raise SevenRoomsBlocked(f"{slug}: non-JSON response")
+
+    availability = extract_availability(payload)
+    if availability is None:
+        raise SevenRoomsError(f"{slug}: unexpected payload shape")
+    return availability
+
+
+def extract_availability(payload):
+    """Return the date -> shifts mapping from an API payload, or None if the shape is unknown"""
+    data = payload.get("data", payload) if isinstance(payload, dict) else None
+    availability = data.get("availability") if isinstance(data, dict) else None
+    return availability if isinstance(availability, dict) else None
+
+
+def parse_shifts(shifts, bookable_only=True):
+    """
+    Flatten a list of shifts into slot dicts.
+
+    Returns:
+        List of {'time', 'description', 'type', 'shift', 'seating_area', 'time_iso'}
+    """
+    slots = []
+    for shift in shifts or []:
+        for slot in shift.get("times") or []:
+            # "book" = instantly bookable; "request" / "request_only" are waitlist-style
+            if bookable_only and slot.get("type") != "book":
+                continue
+            slots.append({
+                'time': slot.get("time") or "None",
+                'description': (
+                    slot.get("public_time_slot_description")
+                    or slot.get("access_seating_area")
+                    or shift.get("name")
+                    or "None"
+                ),
+                'type': slot.get("type"),
+                'shift': shift.get("name"),
+                'seating_area': slot.get("access_seating_area"),
+                'time_iso': slot.get("time_iso"),
+            })
+    return slots
+
+
+def parse_availability_json(payload, target_date):
+    """
+    Bookable (time, description) pairs for target_date from a widget API payload.
+
+    Returns None if the payload does not have the expected shape, so callers can
+    fall back to DOM parsing instead of reporting a false "no availability".
+    """
+    availability = extract_availability(payload)
+    if availability is None:
+        return None
+    return [(s['time'], s['description']) for s in parse_shifts(availability.get(target_date))]
+
+
+def parse_search_page_slots(html):
+    """Parse (time, description) pairs from a rendered explore/search page"""
+    soup = BeautifulSoup(html, "html.parser")
+    slots = []
+    for btn in soup.select('button[data-test^="reservation-timeslot-button"]'):
+        time_el = btn.select_one('span[data-test="reservation-timeslot-button-time"]')
+        desc_el = btn.select_one('span[data-test="reservation-timeslot-button-description"]')
+        slots.append((
+            time_el.get_text(strip=True) if time_el else "None",
+            desc_el.get_text(strip=True) if desc_el else "None",
+        ))
+    return slots
+
+
+# ---------------------------------------------------------------------------
+# Browser fallback (also bootstraps cookies for the HTTP session)
+# ---------------------------------------------------------------------------
+
+def _scrape_with_browser(slug, guests, target_date):
+    """
+    Load the venue's search page in a browser. Slots come from the captured
+    widget API response (or the rendered grid), and the context's cookies are
+    copied into the shared session so later calls can use plain HTTP again.
+
+    Returns:
+        List of (time, description) pairs
+
+    Raises:
+        SevenRoomsError: if neither the API response nor the grid showed up
+    """
+    from scrapers.base_scraper import BaseScraper
+
+    url = booking_url_for(slug, guests, target_date)
+    with BaseScraper(blocking_profile='standard', name=f'sevenrooms:{slug}') as scraper:
+        scraper.capture_json(SEVENROOMS_AVAILABILITY_PATTERN)
+        navigation_error = None
+        try:
+            scraper.goto(url, timeout=30000, wait_until="domcontentloaded")
+        except Exception as e:
+            # The widget API response may still have been captured
+            navigation_error = e
+            logger.warning(f"[SevenRooms] {slug}: navigation warning: {e}")
+
+        payloads = scraper.wait_for_captured_json(timeout=15000)
+        _store_browser_cookies(scraper.context.cookies())
+
+        slots = None
+        for payload in payloads:
+            parsed = parse_availability_json(payload["data"], target_date)
+            if parsed is not None:
+                slots = (slots or []) + parsed
+        if slots is not None:
+            return slots
+
+        logger.info(f"[SevenRooms] {slug}: no availability JSON captured, parsing rendered grid")
+        try:
+            scraper.page.wait_for_selector(
+                'div[data-test="reservation-availability-grid-primary"]', timeout=15000
+            )
+        except Exception as e:
+            reason = f"navigation failed ({navigation_error})" if navigation_error else f"grid did not render ({e})"
+            raise SevenRoomsError(f"{slug}: browser fallback got no availability: {reason}") from e
+        scraper.wait_for_dom_stable('button[data-test^="reservation-timeslot-button"]', stable_ms=500, timeout=3000)
+        return parse_search_page_slots(scraper.get_content())
+
+
+# ---------------------------------------------------------------------------
+# Public entry points
+# ---------------------------------------------------------------------------
+
+def booking_url_for(slug, guests, target_date):
+    config = SEVENROOMS_VENUES[slug]
+    return config['search_url'].format(date=target_date, guests=guests)
+
+
+def build_slot(slug, venue_name, guests, date_str, time_str, description):
+    return {
+        "date": date_str,
+        "time": time_str,
+        "price": description,      # SevenRooms shows a description (e.g. "Classic Shuffle"), not a price
+        "status": "Available",
+        "timestamp": datetime.now().isoformat(),
+        "website": venue_name,
+        "guests": guests,
+        "booking_url": booking_url_for(slug, guests, date_str),
+    }
+
+
+def _date_windows(dates):
+    """Group sorted dates into (start, num_days) windows of consecutive days"""
+    windows = []
+    for date_str in sorted(set(dates)):
+        dt = datetime.strptime(date_str, "%Y-%m-%d")
+        if windows:
+            start, num_days = windows[-1]
+            start_dt = datetime.strptime(start, "%Y-%m-%d")
+            if dt == start_dt + timedelta(days=num_days) and num_days < SEVENROOMS_MAX_DAYS_PER_REQUEST:
+                windows[-1] = (start, num_days + 1)
+                continue
+        windows.append((date_str, 1))
+    return windows
+
+
+def fetch_venue_availability(slug, guests, dates, venue_name=None, slot_filter=None, time_slot=None):
+    """
+    Fetch normalized slots for a venue over many dates for one party size.
+
+    Consecutive dates are fetched in a single API call (up to
+    SEVENROOMS_MAX_DAYS_PER_REQUEST days each).
+
+    Args:
+        slug: SevenRooms venue slug
+        guests: Party size
+        dates: Iterable of 'YYYY-MM-DD'
+        venue_name: Override the configured venue name
+        slot_filter: Optional callable(slot_dict) -> bool applied to parsed slots
+        time_slot: Optional centre of the search window ('HH:MM')
+
+    Returns:
+        List of slot dicts ready for run_scraper_and_save_to_db
+
+    Raises:
+        SevenRoomsError / SevenRoomsBlocked from fetch_availability()
+    """
+    venue_name = venue_name or SEVENROOMS_VENUES[slug]['venue_name']
+    wanted = set(dates)
+    results = []
+    for start, num_days in _date_windows(wanted):
+        availability = fetch_availability(slug, start, guests, num_days=num_days, time_slot=time_slot)
+        for date_str, shifts in availability.items():
+            if date_str not in wanted:
+                continue
+            for slot in parse_shifts(shifts):
+                if slot_filter and not slot_filter(slot):
+                    continue
+                results.append(build_slot(slug, venue_name, guests, date_str, slot['time'], slot['description']))
+    return results
+
+
+def scrape_sevenrooms_venue(slug, guests, target_date, time_slot=None):
+    """
+    Scrape one venue / date / party size.
+
+    Uses the widget API; if SevenRooms blocks plain HTTP or the API fails, the
+    search page is loaded in a browser once (which also refreshes the session
+    cookies for subsequent API calls).
+    """
+    venue_name = SEVENROOMS_VENUES[slug]['venue_name']
+    try:
+        results = fetch_venue_availability(slug, guests, [target_date], time_slot=time_slot)
+        logger.info(f"[SevenRooms] {slug}: {len(results)} slots for {target_date} ({guests} guests) via API")
+        return results
+    except SevenRoomsError as e:
+        logger.warning(f"[SevenRooms] {slug}: API unavailable ({e}), falling back to browser")
+
+    pairs = _scrape_with_browser(slug, guests, target_date)
+    return [build_slot(slug, venue_name, guests, target_date, t, d) for t, d in pairs]
+
+
+def scrape_sevenrooms_range(slug, guests, dates):
+    """
+    Scrape one venue / party size across many dates.
+
+    On an API failure the browser is used once to refresh cookies, then the
+    API is retried; dates that still fail fall back to a browser load each.
+    """
+    dates = sorted(set(dates))
+    try:
+        return fetch_venue_availability(slug, guests, dates)
+    except SevenRoomsError as e:
+        logger.warning(f"[SevenRooms] {slug}: API unavailable for range ({e}), bootstrapping via browser")
+
+    venue_name = SEVENROOMS_VENUES[slug]['venue_name']
+    results = [
+        build_slot(slug, venue_name, guests, dates[0], t, d)
+        for t, d in _scrape_with_browser(slug, guests, dates[0])
+    ]
+    remaining = dates[1:]
+    if not remaining:
+        return results
+    try:
+        return results + fetch_venue_availability(slug, guests, remaining)
+    except SevenRoomsError as e:
+        logger.warning(f"[SevenRooms] {slug}: API still unavailable ({e}), scraping dates in browser")
+    for date_str in remaining:
+        results.extend(
+            build_slot(slug, venue_name, guests, date_str, t, d)
+            for t, d in _scrape_with_browser(slug, guests, date_str)
+        )
+    return results
+
+
+def scrape_sevenrooms_multi(slug, guests_list, dates):
+    """Scrape several party sizes and dates for one venue"""
+    results = []
+    for guests in guests_list:
+        results.extend(scrape_sevenrooms_range(slug, guests, dates))
+    return results
@@ -67,7 +67,7 @@ def scrape_spin(guests, target_date, selected_time=None, location='flatiron'):
         dt = datetime.strptime(target_date, "%Y-%m-%d")
         formatted_date = dt.strftime("%a, %b ") + str(dt.day)
 
-        with BaseScraper() as scraper:
+        with BaseScraper(blocking_profile='standard', name='spin') as scraper:
 
             # ---- LOAD ROOT PAGE ----
             # Get URL for the specified location
@@ -96,14 +96,8 @@ def scrape_spin(guests, target_date, selected_time=None, location='flatiron'):
                 except:
                     pass
 
-            # Wait for page to be fully interactive (longer wait for headless)
-            scraper.wait_for_timeout(3000)
-            
-            # Wait for JavaScript to execute
-            try:
-                scraper.page.wait_for_load_state("networkidle", timeout=10000)
-            except:
-                pass
+            # Wait for page to be fully interactive (requests settled, up to 10s for headless)
+            scraper.wait_for_network_quiet(quiet_ms=500, timeout=10000)
 
             # ---- CLOSE POPUPS ----
             try:
@@ -117,7 +111,7 @@ def scrape_spin(guests, target_date, selected_time=None, location='flatiron'):
             except:
                 pass
 
-            scraper.wait_for_timeout(2000)
+            scraper.wait_for_network_quiet(quiet_ms=300, timeout=2000)
             
             # Try to trigger elementor off-canvas widget via JavaScript
             # Wait for elementor to be ready (important for headless)
@@ -157,7 +151,7 @@ def scrape_spin(guests, target_date, selected_time=None, location='flatiron'):
                 """)
                 if result:
                     logger.info("SPIN triggered elementor off-canvas via JavaScript")
-                scraper.wait_for_timeout(3000)  # Longer wait for headless
+                scraper.wait_for_network_quiet(quiet_ms=500, timeout=3000)
             except Exception as e:
                 logger.warning(f"SPIN JavaScript trigger failed: {e}")
 
@@ -206,7 +200,7 @@ def scrape_spin(guests, target_date, selected_time=None, location='flatiron'):
                 if clicked:
                     button_clicked = True
                     logger.info("SPIN reservation button clicked via JavaScript")
-                    scraper.wait_for_timeout(3000)  # Longer wait for headless
+                    scraper.wait_for_network_quiet(quiet_ms=500, timeout=3000)
             except Exception as e:
                 logger.warning(f"SPIN JavaScript button click failed: {e}")
             
@@ -226,7 +220,7 @@ def scrape_spin(guests, target_date, selected_time=None, location='flatiron'):
                         scraper.click(selector)
                         button_clicked = True
                         logger.info(f"SPIN reservation button clicked using selector: {selector}")
-                        scraper.wait_for_timeout(2000)
+                        scraper.wait_for_network_quiet(quiet_ms=500, timeout=2000)
                         break
                     except:
                         continue
@@ -247,7 +241,7 @@ def scrape_spin(guests, target_date, selected_time=None, location='flatiron'):
                                 element.click()
                                 button_clicked = True
                                 logger.info(f"SPIN reservation button clicked using text: {text}")
-                                scraper.wait_for_timeout(2000)
+                                scraper.wait_for_network_quiet(quiet_ms=500, timeout=2000)
                                 break
                         except:
                             continue
@@ -282,7 +276,7 @@ def scrape_spin(guests, target_date, selected_time=None, location='flatiron'):
                 try:
                     hash_url = base_url + "#elementor-action%3Aaction%3Doff_canvas%3Aopen%26settings%3DeyJpZCI6ImM4OGU1Y2EiLCJkaXNwbGF5TW9kZSI6Im9wZW4ifQ%3D%3D"
                     scraper.goto(hash_url, timeout=30000, wait_until="networkidle")
-                    scraper.wait_for_timeout(3000)
+                    scraper.wait_for_network_quiet(quiet_ms=500, timeout=3000)
                     logger.info("SPIN navigated with hash fragment, checking for iframe...")
                 except Exception as e:
                     logger.warning(f"SPIN hash fragment navigation failed: {e}")
@@ -299,10 +293,8 @@ def scrape_spin(guests, target_date, selected_time=None, location='flatiron'):
                 if not button_clicked:
                     return results
 
-            # Wait longer for the widget to open (VPS/headless might be slower)
-            scraper.wait_for_timeout(5000)
-            
-            # Additional wait for iframe to start loading
+            # Wait for the widget to open and the iframe to start loading
+            # (VPS/headless might be slower)
             try:
                 scraper.page.wait_for_function(
                     "document.querySelector('iframe[src*=\"sevenrooms\"], iframe[nitro-lazy-src*=\"sevenrooms\"]') !== null",
@@ -340,8 +332,8 @@ def scrape_spin(guests, target_date, selected_time=None, location='flatiron'):
                             )
                         except:
                             pass
-                        # Wait a bit more for iframe to be ready
-                        scraper.wait_for_timeout(3000)  # Longer wait for headless
+                        # Wait for the iframe's initial requests to settle
+                        scraper.wait_for_network_quiet(quiet_ms=500, timeout=3000)
                         break
                 except Exception as e:
                     logger.debug(f"SPIN iframe selector {selector} failed: {e}")
@@ -356,8 +348,6 @@ def scrape_spin(guests, target_date, selected_time=None, location='flatiron'):
                 if not frame:
                     logger.warning("SPIN iframe content frame is None")
                     return results
-                # Wait for iframe to be ready
-                scraper.wait_for_timeout(1000)
             except Exception as e:
                 logger.error(f"Could not load iframe: {e}")
                 return results
@@ -384,7 +374,10 @@ def scrape_spin(guests, target_date, selected_time=None, location='flatiron'):
                         break
                     frame.click('button[aria-label="increment Date"]')
                     date_attempts += 1
-                    scraper.wait_for_timeout(100)
+                    scraper.wait_for_text_change(
+                        'button[data-test="sr-calendar-date-button"] div:nth-child(1)',
+                        previous_text=cur, timeout=1000, frame=frame
+                    )
                 except Exception as e:
                     logger.warning(f"SPIN date picker error: {e}")
                     break
@@ -450,7 +443,7 @@ def scrape_spin(guests, target_date, selected_time=None, location='flatiron'):
                 frame.wait_for_selector('button[data-test="sr-search-button"]', timeout=5000, state='visible')
                 frame.click('button[data-test="sr-search-button"]', force=True)
                 logger.info("SPIN search button clicked")
-                scraper.wait_for_timeout(3500)
+                scraper.wait_for_results('button[data-test="sr-timeslot-button"]', timeout=8000, frame=frame)
             except Exception as e:
                 logger.warning(f"SPIN Search button click failed: {e}")
                 return results
@@ -1,7 +1,12 @@
 """
 Swingers scraper (NYC and London) using Playwright
+
+The booking calendar lists every date of a month with a data-available flag,
+so a whole date window is harvested from one calendar load per month: only
+dates flagged available get a slot page load, all in the same browser.
 """
 from datetime import datetime
+from itertools import groupby
 from urllib.parse import urlencode
 from bs4 import BeautifulSoup
 from scrapers.base_scraper import BaseScraper
@@ -9,220 +14,150 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+SWINGERS_BASE_URL = "https://www.swingers.club"
+
+SWINGERS_LOCATIONS = {
+    'nyc': {
+        'book_url': f"{SWINGERS_BASE_URL}/us/locations/nyc/book-now",
+        'venue_name': "Swingers (Nomad)",
+    },
+    'uk': {
+        'book_url': f"{SWINGERS_BASE_URL}/uk/book-now",
+        'venue_name': "Swingers (Oxford Circus)",
+    },
+}
+
+
+class SwingersError(Exception):
+    """A calendar or slot page did not load, so its dates can't be reported as unavailable"""
+
+
+def _calendar_url(location, guests, depart):
+    dt = datetime.strptime(depart, "%Y-%m-%d")
+    query_params = {
+        "guests": str(guests),
+        "search[month]": str(dt.month),
+        "search[year]": str(dt.year),
+        "depart": depart
+    }
+    return f"{SWINGERS_LOCATIONS[location]['book_url']}?{urlencode(query_params)}"
+
+
+def _available_date_links(scraper, url):
+    """Load a calendar month and return {YYYY-MM-DD: slot page URL} for available dates.
+
+    Raises SwingersError if the calendar never rendered.
+    """
+    try:
+        scraper.goto(url, timeout=4000, wait_until="domcontentloaded")
+    except Exception:
+        pass  # The calendar is often usable before the load event; checked below
+
+    try:
+        scraper.wait_for_selector("li.slot-calendar__dates-item", timeout=10000)
+    except Exception as e:
+        raise SwingersError(f"Calendar dates not found at {url}") from e
+
+    soup = BeautifulSoup(scraper.get_content(), "html.parser")
+    links = {}
+    for li in soup.find_all("li", {"class": "slot-calendar__dates-item", "data-available": "true"}):
+        anchor = li.find("a")
+        if li.get("data-date") and anchor and anchor.get("href"):
+            links[li["data-date"]] = SWINGERS_BASE_URL + anchor["href"]
+    return links
+
+
+def _parse_slots(content, target_date, venue_name):
+    dt = datetime.strptime(target_date, "%Y-%m-%d")
+    soup = BeautifulSoup(content, "html.parser")
+    results = []
+
+    slots = soup.find_all("button", {"data-day": dt.strftime("%d"), "data-month": dt.strftime("%b")})
+
+    for slot in slots:
+        status_el = slot.select_one("div.slot-search-result__low-stock")
+        status = status_el.get_text(strip=True) if status_el else "Available"
+
+        time_el = slot.find("span", {"class": "slot-search-result__time h5"})
+        time_val = time_el.get_text(strip=True) if time_el else "None"
+
+        price_el = slot.find("span", {"class": "slot-search-result__price-label"})
+        price_val = price_el.get_text(strip=True) if price_el else "None"
+
+        results.append({
+            "date": target_date,
+            "time": time_val,
+            "price": price_val,
+            "status": status,
+            "timestamp": datetime.now().isoformat(),
+            "website": venue_name
+        })
+    return results
+
+
+def _scrape_swingers_dates(location, guests, dates):
+    """Scrape a Swingers location for every date in ``dates`` within one browser session"""
+    venue_name = SWINGERS_LOCATIONS[location]['venue_name']
+    dates = sorted(set(dates))
+    results = []
+
+    with BaseScraper(blocking_profile='standard', name='swingers') as scraper:
+        for _, month_dates in groupby(dates, key=lambda d: d[:7]):
+            month_dates = list(month_dates)
+
+            # ---- ONE CALENDAR LOAD PER MONTH ----
+            links = _available_date_links(scraper, _calendar_url(location, guests, month_dates[0]))
+            available = [d for d in month_dates if d in links]
+            logger.info(f"[Swingers] {venue_name}: {len(available)}/{len(month_dates)} dates available in {month_dates[0][:7]}")
+
+            for date_str in available:
+                # ---- LOAD SLOT PAGE ----
+                try:
+                    scraper.goto(links[date_str], timeout=5000, wait_until="domcontentloaded")
+                except Exception:
+                    pass  # Checked by waiting for the slot buttons below
+
+                # The calendar flagged this date as available, so a page without
+                # slot buttons failed to load rather than being sold out
+                if not scraper.wait_for_results("button[data-day]", timeout=6000):
+                    raise SwingersError(f"Slot buttons not found for {date_str}")
+
+                results.extend(_parse_slots(scraper.get_content(), date_str, venue_name))
+
+    return results
+
+
 def scrape_swingers(guests, target_date):
     """Swingers NYC scraper function"""
-    results = []
-    
     try:
-        dt = datetime.strptime(target_date, "%Y-%m-%d")
-        date_str = target_date
-        month = dt.month
-        year = dt.year
-        day = dt.strftime("%d")
-        month_abbr = dt.strftime("%b")
-        
-        query_params = {
-            "guests": str(guests),
-            "search[month]": str(month),
-            "search[year]": str(year),
-            "depart": date_str
-        }
-        
-        url = f"https://www.swingers.club/us/locations/nyc/book-now?{urlencode(query_params)}"
-
-        with BaseScraper() as scraper:
-
-            # ---- LOAD PAGE WITH FORCED STOP ----
-            try:
-                scraper.goto(url, timeout=4000, wait_until="domcontentloaded")
-            except:
-                pass  # Ignore timeout
-
-            # scraper.wait_for_timeout(5000)  # allow JS to run
-            # Stop loading - with error handling for navigation race conditions
-            # try:
-            #     scraper.page.evaluate("window.stop()")  # STOP loading immediately
-            # except Exception as e:
-            #     # Page may have navigated away - this is OK, continue
-            #     if "Execution context was destroyed" not in str(e) and "navigation" not in str(e).lower():
-            #         raise
-            #     logger.debug(f"Page navigated during stop() call, continuing: {e}")
-
-            # ---- WAIT FOR CALENDAR RENDER ----
-            try:
-                scraper.wait_for_selector("li.slot-calendar__dates-item", timeout=10000)
-            except:
-                logger.warning("Calendar dates not found.")
-
-            content = scraper.get_content()
-            soup = BeautifulSoup(content, "html.parser")
-
-            dates = soup.find_all(
-                "li",
-                {"class": "slot-calendar__dates-item", "data-available": "true"}
-            )
-
-            if not dates:
-                return results
-
-            target_li = None
-            for d in dates:
-                if d.get("data-date") == target_date:
-                    target_li = d
-                    break
-
-            if not target_li:
-                return results
-
-            full_url = "https://www.swingers.club" + target_li.find("a")["href"]
-            # ---- LOAD SLOT PAGE WITH FORCED STOP ----
-            try:
-                scraper.goto(full_url, timeout=5000, wait_until="domcontentloaded")
-            except:
-                pass
-
-            scraper.wait_for_timeout(4000)
-            # scraper.page.evaluate("window.stop()")
-
-            # ---- WAIT FOR SLOTS ----
-            try:
-                scraper.wait_for_selector("button[data-day]", timeout=2000)
-            except:
-                logger.warning("Slot buttons not found.")
-
-            # ---- PARSE SLOTS ----
-            content = scraper.get_content()
-            soup = BeautifulSoup(content, "html.parser")
-
-            slots = soup.find_all("button", {"data-day": day, "data-month": month_abbr})
-
-            for slot in slots:
-                status_el = slot.select_one("div.slot-search-result__low-stock")
-                status = status_el.get_text(strip=True) if status_el else "Available"
-
-                time_el = slot.find("span", {"class": "slot-search-result__time h5"})
-                time_val = time_el.get_text(strip=True) if time_el else "None"
-
-                price_el = slot.find("span", {"class": "slot-search-result__price-label"})
-                price_val = price_el.get_text(strip=True) if price_el else "None"
-
-                slot_data = {
-                    "date": target_date,
-                    "time": time_val,
-                    "price": price_val,
-                    "status": status,
-                    "timestamp": datetime.now().isoformat(),
-                    "website": "Swingers (Nomad)"
-                }
-                results.append(slot_data)
-
-        return results
+        return _scrape_swingers_dates('nyc', guests, [target_date])
+    except Exception as e:
+        logger.error(f"Error scraping Swingers NYC: {e}", exc_info=True)
+        raise e
+
 
+def scrape_swingers_range(guests, dates):
+    """Swingers NYC scraper for a window of dates"""
+    try:
+        return _scrape_swingers_dates('nyc', guests, dates)
     except Exception as e:
         logger.error(f"Error scraping Swingers NYC: {e}", exc_info=True)
         raise e
 
+
 def scrape_swingers_uk(guests, target_date):
     """Swingers UK scraper function"""
-    results = []
-    
     try:
-        dt = datetime.strptime(target_date, "%Y-%m-%d")
-        date_str = target_date
-        month = dt.month
-        year = dt.year
-        day = dt.strftime("%d")
-        month_abbr = dt.strftime("%b")
-        
-        query_params = {
-            "guests": str(guests),
-            "search[month]": str(month),
-            "search[year]": str(year),
-            "depart": date_str
-        }
-        
-        url = f"https://www.swingers.club/uk/book-now?{urlencode(query_params)}"
-        
-        with BaseScraper() as scraper:
-
-            # ---- LOAD PAGE WITH FORCED STOP ----
-            try:
-                scraper.goto(url, timeout=4000, wait_until="domcontentloaded")
-            except:
-                pass  # Ignore timeout
-
-            # scraper.wait_for_timeout(5000)  # allow JS to run
-            # scraper.page.evaluate("window.stop()")  # STOP loading immediately
-
-            # ---- WAIT FOR CALENDAR RENDER ----
-            try:
-                scraper.wait_for_selector("li.slot-calendar__dates-item", timeout=10000)
-            except:
-                logger.warning("Calendar dates not found.")
-
-            content = scraper.get_content()
-            soup = BeautifulSoup(content, "html.parser")
-
-            dates = soup.find_all(
-                "li",
-                {"class": "slot-calendar__dates-item", "data-available": "true"}
-            )
-
-            if not dates:
-                return results
-
-            target_li = None
-            for d in dates:
-                if d.get("data-date") == target_date:
-                    target_li = d
-                    break
-
-            if not target_li:
-                return results
-
-            full_url = "https://www.swingers.club" + target_li.find("a")["href"]
-            # ---- LOAD SLOT PAGE WITH FORCED STOP ----
-            try:
-                scraper.goto(full_url, timeout=2000, wait_until="domcontentloaded")
-            except:
-                pass
-
-            scraper.wait_for_timeout(2000)
-            scraper.page.evaluate("window.stop()")
-
-            # ---- WAIT FOR SLOTS ----
-            try:
-                scraper.wait_for_selector("button[data-day]", timeout=2000)
-            except:
-                logger.warning("Slot buttons not found.")
-
-            # ---- PARSE SLOTS ----
-            content = scraper.get_content()
-            soup = BeautifulSoup(content, "html.parser")
-
-            slots = soup.find_all("button", {"data-day": day, "data-month": month_abbr})
-
-            for slot in slots:
-                status_el = slot.select_one("div.slot-search-result__low-stock")
-                status = status_el.get_text(strip=True) if status_el else "Available"
-
-                time_el = slot.find("span", {"class": "slot-search-result__time h5"})
-                time_val = time_el.get_text(strip=True) if time_el else "None"
-
-                price_el = slot.find("span", {"class": "slot-search-result__price-label"})
-                price_val = price_el.get_text(strip=True) if price_el else "None"
-
-                slot_data = {
-                    "date": target_date,
-                    "time": time_val,
-                    "price": price_val,
-                    "status": status,
-                    "timestamp": datetime.now().isoformat(),
-                    "website": "Swingers (Oxford Circus)"
-                }
-                results.append(slot_data) 
-        return results
+        return _scrape_swingers_dates('uk', guests, [target_date])
+    except Exception as e:
+        logger.error(f"Error scraping Swingers UK: {e}", exc_info=True)
+        raise e
+
 
+def scrape_swingers_uk_range(guests, dates):
+    """Swingers UK scraper for a window of dates"""
+    try:
+        return _scrape_swingers_dates('uk', guests, dates)
     except Exception as e:
         logger.error(f"Error scraping Swingers UK: {e}", exc_info=True)
-        raise e
\ No newline at end of file
+        raise e
@@ -21,7 +21,7 @@ def scrape_tsquaredsocial(guests, target_date, selected_time=None):
     )
 
     try:
-        with BaseScraper() as scraper:
+        with BaseScraper(blocking_profile='standard', name='tsquaredsocial') as scraper:
 
             # -------------------------------------------------
             # LOAD PAGE
@@ -0,0 +1,143 @@
+"""
+Live slot change events over Redis pub/sub.
+
+The persistence code publishes after each commit: 'slot' events (op insert,
+update or delete, keyed by venue_name/date/time/guests) from the slot writers,
+'task' events from update_task_status, and 'purge' events for bulk deletes.
+/api/events relays them to browsers as Server-Sent Events, filtered by city,
+date range, guests and task id, so clients can apply deltas instead of
+refetching /api/data or polling /task_status.
+
+Publishing is best-effort: without Redis events are dropped and the data in
+the database is unaffected.
+"""
+import os
+import time
+import json
+import logging
+
+from redis_utils import get_redis, mark_redis_failed
+from models import dumps_json
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = os.getenv('SLOT_EVENTS_CHANNEL', 'slot-events')
+# Events per pub/sub message; large scrapes are split over several messages
+SLOT_EVENTS_BATCH = int(os.getenv('SLOT_EVENTS_BATCH', '500'))
+SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+# Streams are closed after this long; EventSource reconnects on its own
+SSE_MAX_SECONDS = float(os.getenv('SSE_MAX_SECONDS', '600'))
+
+
+def slot_event(op, venue_name, date, time, guests, city, slot=None):
+    """Event for one slot; slot is the API representation (absent for deletes)"""
+    event = {
+        'type': 'slot',
+        'op': op,
+        'venue_name': venue_name,
+        'date': date.isoformat() if hasattr(date, 'isoformat') else date,
+        'time': time,
+        'guests': guests,
+        'city': city,
+    }
+    if slot is not None:
+        event['slot'] = slot
+    return event
+
+
+def publish(events):
+    """Publish events to EVENTS_CHANNEL; returns False if Redis is unavailable"""
+    events = list(events)
+    if not events:
+        return True
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        pipe = client.pipeline(transaction=False)
+        for start in range(0, len(events), SLOT_EVENTS_BATCH):
+            pipe.publish(EVENTS_CHANNEL, dumps_json(events[start:start + SLOT_EVENTS_BATCH]))
+        pipe.execute()
+        return True
+    except Exception as e:
+        mark_redis_failed(e)
+        return False
+
+
+def publish_task(task_dict):
+    return publish([{'type': 'task', **task_dict}])
+
+
+def publish_purge(city=None, date_from=None, date_to=None):
+    """Rows were deleted in bulk; clients should drop matching slots (None = unbounded)"""
+    return publish([{
+        'type': 'purge',
+        'city': city,
+        'date_from': date_from.isoformat() if hasattr(date_from, 'isoformat') else date_from,
+        'date_to': date_to.isoformat() if hasattr(date_to, 'isoformat') else date_to,
+    }])
+
+
+def event_matches(event, city=None, date_from=None, date_to=None, guests=None, task_id=None):
+    """Whether an event passes the /api/events filters (dates are ISO strings)"""
+    kind = event.get('type')
+    if kind == 'task':
+        return task_id is None or event.get('task_id') == task_id
+    if kind == 'slot':
+        if city and event.get('city') != city:
+            return False
+        if guests is not None and event.get('guests') != guests:
+            return False
+        if date_from and (event.get('date') or '') < date_from:
+            return False
+        if date_to and (event.get('date') or '') > date_to:
+            return False
+        return True
+    if kind == 'purge':
+        return not (city and event.get('city') and event.get('city') != city)
+    return False
+
+
+def stream_events(filters):
+    """Generator of SSE text for events matching filters (see event_matches).
+
+    Raises RuntimeError up front if Redis is unavailable. Sends a comment line
+    every SSE_HEARTBEAT_SECONDS so proxies keep the connection open.
+    """
+    client = get_redis()
+    if client is None:
+        raise RuntimeError('Redis is unavailable')
+    pubsub = client.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(EVENTS_CHANNEL)
+
+    def _generate():
+        started = last_sent = time.monotonic()
+        try:
+            yield 'retry: 3000\n\n'
+            while time.monotonic() - started < SSE_MAX_SECONDS:
+                message = pubsub.get_message(timeout=1.0)
+                if message is None:
+                    if time.monotonic() - last_sent >= SSE_HEARTBEAT_SECONDS:
+                        last_sent = time.monotonic()
+                        yield ': keepalive\n\n'
+                    continue
+                try:
+                    events = json.loads(message['data'])
+                except (TypeError, ValueError):
+                    continue
+                chunks = [
+                    f"event: {event['type']}\ndata: {dumps_json(event)}\n\n"
+                    for event in events if event_matches(event, **filters)
+                ]
+                if chunks:
+                    last_sent = time.monotonic()
+                    yield ''.join(chunks)
+        except Exception as e:
+            logger.warning(f"[EVENTS] Stream ended: {e}")
+        finally:
+            try:
+                pubsub.close()
+            except Exception:
+                pass
+
+    return _generate()
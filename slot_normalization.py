@@ -0,0 +1,108 @@
+"""
+Parsing of the free-form slot fields scrapers return.
+
+Times arrive as "7:30 PM", "07:30 PM", "7:30pm", "7pm", "19:30", "19:30:00",
+"19.30", "noon", ISO datetimes or ranges like "7:00 PM - 8:00 PM"; prices as "$45.00",
+"£25 pp", SevenRooms descriptions or "Price not available". These helpers turn
+them into values SQL can order and aggregate, and return None for anything
+they don't recognise.
+"""
+import re
+
+_ISO_TIME_RE = re.compile(r'T(\d{2}):(\d{2})')
+_TIME_RE = re.compile(
+    r'(?<![\d:.])(\d{1,2})(?:[:.](\d{2}))?(?::\d{2})?\s*([ap])?(\.?m\b\.?)?',
+    re.IGNORECASE
+)
+_AMOUNT_RE = re.compile(r'(\d{1,3}(?:,\d{3})+|\d+)(\.\d{1,2})?')
+
+CURRENCY_SYMBOLS = {'$': 'USD', '£': 'GBP', '€': 'EUR'}
+CURRENCY_CODES = ('USD', 'GBP', 'EUR')
+CITY_CURRENCIES = {'NYC': 'USD', 'London': 'GBP'}
+# (basis, phrases) checked in order against the lower-cased label
+PRICE_BASES = (
+    ('per_person', ('per person', 'pp', 'p.p.', '/person', 'per guest', 'per head', 'each', 'pax')),
+    ('per_lane', ('per lane', '/lane', 'lane')),
+    ('per_bay', ('per bay', '/bay', 'bay')),
+    ('per_table', ('per table', '/table', 'table')),
+    ('per_hour', ('per hour', '/hour', '/hr', 'hourly')),
+)
+
+UNAVAILABLE_STATUS_WORDS = ('closed', 'sold out', 'unavailable', 'not available', 'full', 'booked')
+
+
+def parse_start_minutes(time_str):
+    """Minutes after midnight of a slot's (start) time, or None"""
+    if not time_str:
+        return None
+    text = str(time_str).strip()
+    lowered = text.lower()
+    if lowered.startswith('noon'):
+        return 12 * 60
+    if lowered.startswith('midnight'):
+        return 0
+    iso = _ISO_TIME_RE.search(text)
+    if iso:
+        hours, minutes = int(iso.group(1)), int(iso.group(2))
+        return hours * 60 + minutes if hours < 24 and minutes < 60 else None
+
+    for match in _TIME_RE.finditer(text):
+        hours = int(match.group(1))
+        minutes = int(match.group(2)) if match.group(2) else 0
+        meridiem = match.group(3).lower() if match.group(3) and match.group(4) is not None else None
+        # A bare number ("2 guests") is not a time
+        if match.group(2) is None and meridiem is None:
+            continue
+        if minutes >= 60:
+            continue
+        if meridiem:
+            if not 1 <= hours <= 12:
+                continue
+            hours = hours % 12 + (12 if meridiem == 'p' else 0)
+        elif hours >= 24:
+            continue
+        return hours * 60 + minutes
+    return None
+
+
+def parse_price_amount(price_str):
+    """First numeric amount in a price label ("$45.00" -> 45.0), or None"""
+    if not price_str:
+        return None
+    match = _AMOUNT_RE.search(str(price_str))
+    if not match:
+        return None
+    return float(match.group(1).replace(',', '') + (match.group(2) or ''))
+
+
+def normalize_price(price_str, city=None):
+    """Numeric columns for a raw price label.
+
+    Returns {'price_amount', 'price_currency', 'price_basis'}; all None when the
+    label has no amount ("Classic Shuffle", "Price not available"). The currency
+    comes from a symbol or code in the label, else from the city.
+    """
+    amount = parse_price_amount(price_str)
+    if amount is None:
+        return {'price_amount': None, 'price_currency': None, 'price_basis': None}
+
+    label = str(price_str)
+    currency = next((code for symbol, code in CURRENCY_SYMBOLS.items() if symbol in label), None)
+    if currency is None:
+        upper = label.upper()
+        currency = next((code for code in CURRENCY_CODES if code in upper), CITY_CURRENCIES.get(city))
+
+    lower = label.lower()
+    tokens = re.findall(r'[a-z./]+', lower)
+    words = set(tokens) | {token.strip('.') for token in tokens}
+    basis = None
+    for name, phrases in PRICE_BASES:
+        if any((phrase in lower) if (' ' in phrase or '/' in phrase) else (phrase in words) for phrase in phrases):
+            basis = name
+            break
+    return {'price_amount': amount, 'price_currency': currency, 'price_basis': basis}
+
+
+def is_available_status(status):
+    status = (status or '').lower()
+    return bool(status) and not any(word in status for word in UNAVAILABLE_STATUS_WORDS)
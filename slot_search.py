@@ -0,0 +1,108 @@
+"""
+Indexed substring search over availability slots.
+
+/api/data's `search` parameter matches a term anywhere in a slot's venue name,
+date, time, price or status. On SQLite this is served by an FTS5 trigram index
+kept in sync with availability_slots by triggers; on PostgreSQL by a pg_trgm GIN
+index over the same columns. Terms shorter than a trigram (and databases without
+either feature) fall back to a plain case-insensitive LIKE.
+"""
+import logging
+
+from sqlalchemy import func, or_, text, cast, Integer, String
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'availability_slots_fts'
+SEARCH_COLUMNS = ('venue_name', 'date', 'time', 'price', 'status')
+MIN_TRIGRAM_LENGTH = 3
+
+# Which backend setup_slot_search() enabled: 'fts5', 'pg_trgm' or None
+_search_backend = None
+
+
+def _setup_sqlite(conn):
+    exists = conn.execute(
+        text("SELECT name FROM sqlite_master WHERE type='table' AND name=:name"), {'name': FTS_TABLE}
+    ).fetchone() is not None
+    columns = ', '.join(SEARCH_COLUMNS)
+    new_values = ', '.join(f'new.{c}' for c in SEARCH_COLUMNS)
+    old_values = ', '.join(f'old.{c}' for c in SEARCH_COLUMNS)
+
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{columns}, content='availability_slots', content_rowid='id', tokenize='trigram')"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON availability_slots BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON availability_slots BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+    ))
+    # Only the searchable columns re-index; last_updated / removed_at changes don't touch the index
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {columns} ON availability_slots BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    ))
+    if not exists:
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        logger.info(f"[SEARCH] Built {FTS_TABLE} from existing slots")
+
+
+def _pg_search_document():
+    return (
+        "lower(coalesce(venue_name, '') || ' ' || coalesce(date::text, '') || ' ' || "
+        "coalesce(time, '') || ' ' || coalesce(price, '') || ' ' || coalesce(status, ''))"
+    )
+
+
+def _setup_postgresql(conn):
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_availability_slots_search_trgm ON availability_slots "
+        f"USING gin (({_pg_search_document()}) gin_trgm_ops)"
+    ))
+
+
+def setup_slot_search(engine):
+    """Create the search index for the engine's dialect; safe to call on every startup"""
+    global _search_backend
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == 'sqlite':
+                _setup_sqlite(conn)
+                _search_backend = 'fts5'
+            elif dialect == 'postgresql':
+                _setup_postgresql(conn)
+                _search_backend = 'pg_trgm'
+    except Exception as e:
+        _search_backend = None
+        logger.warning(f"[SEARCH] Indexed search unavailable on {dialect}, using LIKE: {e}")
+    return _search_backend
+
+
+def apply_slot_search(query, model, term):
+    """Filter a slot query to rows containing term in any searchable column"""
+    term = (term or '').strip().lower()
+    if not term:
+        return query
+
+    if _search_backend == 'fts5' and len(term) >= MIN_TRIGRAM_LENGTH:
+        phrase = '"' + term.replace('"', '""') + '"'
+        matching_ids = text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :phrase").bindparams(phrase=phrase)
+        return query.filter(model.id.in_(matching_ids.columns(rowid=Integer)))
+
+    if _search_backend == 'pg_trgm':
+        escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return query.filter(text(f"{_pg_search_document()} LIKE :pattern").bindparams(pattern=f'%{escaped}%'))
+
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    pattern = f'%{escaped}%'
+    return query.filter(or_(*[
+        func.lower(cast(getattr(model, column), String)).like(pattern, escape='\\')
+        for column in SEARCH_COLUMNS
+    ]))
@@ -0,0 +1,182 @@
+"""
+Coalescing of identical venue scrapes.
+
+/run_scraper, /refresh_data, scrape_all_venues_task and the refresh scheduler
+can all enqueue scrape_venue_task for the same (website, date, guests,
+options) while one is already queued or running. Each such scrape has a key:
+
+    scrape-dedup:<key>:lease     id of the task scraping it now (expires after
+                                 TASK_DEDUP_LEASE_SECONDS if a worker dies)
+    scrape-dedup:<key>:waiters   task ids attached to that run
+    scrape-dedup:<key>:recent    {task_id, finished_at, slots_found} of the last
+                                 successful run, kept TASK_DEDUP_RECENT_SECONDS
+
+scrape_venue_task claims the lease before scraping. A duplicate attaches its
+own task id to the running one, whose outcome is then copied to it, and
+returns without opening a browser. A scrape that finished within the recent
+window is reused as is. scrape_venue_range_task claims the option-less key of
+every date in its window and skips dates another task holds. Without Redis
+every scrape runs.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+
+from redis_utils import get_redis, mark_redis_failed
+
+logger = logging.getLogger(__name__)
+
+TASK_DEDUP_ENABLED = os.getenv('TASK_DEDUP_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+TASK_DEDUP_PREFIX = os.getenv('TASK_DEDUP_PREFIX', 'scrape-dedup')
+# Matches the Celery hard time limit, so a lease never outlives its task by much
+TASK_DEDUP_LEASE_SECONDS = int(os.getenv('TASK_DEDUP_LEASE_SECONDS', '1800'))
+# Results younger than this are reused instead of scraping again (0 disables)
+TASK_DEDUP_RECENT_SECONDS = int(os.getenv('TASK_DEDUP_RECENT_SECONDS', '300'))
+
+# KEYS: lease, recent. ARGV: owner id, lease ttl, check recent (1/0)
+_CLAIM_SCRIPT = """
+if ARGV[3] == '1' then
+    local recent = redis.call('GET', KEYS[2])
+    if recent then
+        return {'recent', recent}
+    end
+end
+local owner = redis.call('GET', KEYS[1])
+if owner and owner ~= ARGV[1] then
+    return {'in_flight', owner}
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return {'claimed', ARGV[1]}
+"""
+
+# KEYS: lease, waiters. ARGV: waiter id, ttl. Returns the owner id, or false if nothing is running
+_ATTACH_SCRIPT = """
+local owner = redis.call('GET', KEYS[1])
+if not owner then
+    return false
+end
+redis.call('SADD', KEYS[2], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return owner
+"""
+
+# KEYS: lease, waiters, recent. ARGV: owner id, recent payload ('' on failure), recent ttl
+_FINISH_SCRIPT = """
+if ARGV[2] ~= '' and tonumber(ARGV[3]) > 0 then
+    redis.call('SET', KEYS[3], ARGV[2], 'EX', ARGV[3])
+end
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return {}
+end
+redis.call('DEL', KEYS[1])
+local waiters = redis.call('SMEMBERS', KEYS[2])
+redis.call('DEL', KEYS[2])
+return waiters
+"""
+
+
+def _text(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def scrape_key(website, target_date, guests, options=None):
+    """Dedup key for a scrape; options with a None value are ignored"""
+    options = {name: value for name, value in (options or {}).items() if value is not None}
+    digest = hashlib.sha1(json.dumps(options, sort_keys=True, default=str).encode()).hexdigest()[:12]
+    return f"{website}:{target_date or 'any'}:{guests}:{digest}"
+
+
+def _keys(key):
+    base = f"{TASK_DEDUP_PREFIX}:{key}"
+    return f"{base}:lease", f"{base}:waiters", f"{base}:recent"
+
+
+def _recent_info(raw):
+    try:
+        info = json.loads(_text(raw))
+    except (TypeError, ValueError):
+        return None
+    info['age_seconds'] = max(0.0, time.time() - float(info.get('finished_at') or 0))
+    return info
+
+
+def claim(key, owner_id, use_recent=True):
+    """Try to become the task that scrapes key.
+
+    Returns None if the caller should scrape (claimed, or dedup unavailable), else
+    {'state': 'in_flight', 'task_id': owner} or {'state': 'recent', **recent result}.
+    """
+    if not TASK_DEDUP_ENABLED or not owner_id:
+        return None
+    client = get_redis()
+    if client is None:
+        return None
+    lease, _, recent = _keys(key)
+    check_recent = '1' if use_recent and TASK_DEDUP_RECENT_SECONDS > 0 else '0'
+    try:
+        state, value = client.eval(_CLAIM_SCRIPT, 2, lease, recent, owner_id, TASK_DEDUP_LEASE_SECONDS, check_recent)
+    except Exception as e:
+        mark_redis_failed(e)
+        return None
+    state = _text(state)
+    if state == 'claimed':
+        return None
+    if state == 'recent':
+        info = _recent_info(value)
+        return dict(info, state='recent') if info else None
+    return {'state': 'in_flight', 'task_id': _text(value)}
+
+
+def lookup(key):
+    """Like claim() without taking the lease: the running or recent scrape for key, or None"""
+    if not TASK_DEDUP_ENABLED:
+        return None
+    client = get_redis()
+    if client is None:
+        return None
+    lease, _, recent = _keys(key)
+    try:
+        owner, recent_raw = client.mget(lease, recent)
+    except Exception as e:
+        mark_redis_failed(e)
+        return None
+    if recent_raw is not None and TASK_DEDUP_RECENT_SECONDS > 0:
+        info = _recent_info(recent_raw)
+        if info:
+            return dict(info, state='recent')
+    if owner is not None:
+        return {'state': 'in_flight', 'task_id': _text(owner)}
+    return None
+
+
+def attach(key, waiter_id):
+    """Attach waiter_id to the running scrape of key; returns the owner id, or None if none is running"""
+    client = get_redis()
+    if client is None or not waiter_id:
+        return None
+    lease, waiters, _ = _keys(key)
+    try:
+        owner = client.eval(_ATTACH_SCRIPT, 2, lease, waiters, waiter_id, TASK_DEDUP_LEASE_SECONDS)
+    except Exception as e:
+        mark_redis_failed(e)
+        return None
+    return _text(owner) if owner else None
+
+
+def finish(key, owner_id, success, slots_found=0):
+    """Release the lease (remembering a successful result) and return the attached task ids"""
+    if not TASK_DEDUP_ENABLED or not owner_id:
+        return []
+    client = get_redis()
+    if client is None:
+        return []
+    lease, waiters, recent = _keys(key)
+    payload = json.dumps({'task_id': owner_id, 'finished_at': time.time(), 'slots_found': slots_found}) if success else ''
+    try:
+        attached = client.eval(_FINISH_SCRIPT, 3, lease, waiters, recent, owner_id, payload, TASK_DEDUP_RECENT_SECONDS)
+    except Exception as e:
+        mark_redis_failed(e)
+        return []
+    return [_text(waiter) for waiter in attached or []]
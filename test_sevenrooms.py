@@ -0,0 +1,37 @@
+"""
+Simple test script for the shared SevenRooms engine (no database required)
+"""
+from datetime import datetime, timedelta
+from scrapers.sevenrooms import SEVENROOMS_VENUES, fetch_venue_availability, scrape_sevenrooms_venue, SevenRoomsError
+
+# Set test parameters
+test_guests = 4
+# Three consecutive dates starting 7 days from now, format: YYYY-MM-DD
+start = datetime.now() + timedelta(days=7)
+test_dates = [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(3)]
+
+print("=" * 60)
+print("Testing SevenRooms Engine")
+print("=" * 60)
+print(f"Guests: {test_guests}")
+print(f"Dates: {', '.join(test_dates)}")
+print("-" * 60)
+
+for slug, config in SEVENROOMS_VENUES.items():
+    print(f"\n{config['venue_name']} ({slug})")
+    print("-" * 40)
+    try:
+        # One API call for all three dates
+        slots = fetch_venue_availability(slug, test_guests, test_dates)
+        print(f"[SUCCESS] API returned {len(slots)} slot(s)")
+        for slot in slots[:5]:
+            print(f"  {slot['date']} {slot['time']} - {slot['price']}")
+    except SevenRoomsError as e:
+        print(f"[WARNING] API unavailable ({e}), trying with browser fallback...")
+        try:
+            slots = scrape_sevenrooms_venue(slug, test_guests, test_dates[0])
+            print(f"[SUCCESS] Browser fallback returned {len(slots)} slot(s) for {test_dates[0]}")
+        except Exception as e:
+            print(f"[ERROR] {e}")
+
+print("\n" + "=" * 60)
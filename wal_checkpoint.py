@@ -0,0 +1,161 @@
+"""
+Background WAL checkpointing for the SQLite database.
+
+Readers used to run `PRAGMA wal_checkpoint` on every /api/data request, tying
+read latency to writer activity. Instead, one daemon thread per web process
+watches the -wal file and checkpoints when it grows past a size threshold or
+when the last checkpoint is older than an interval. PASSIVE checkpoints never
+block writers; a TRUNCATE is attempted only when the WAL gets very large.
+"""
+import os
+import threading
+import time
+import logging
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+WAL_CHECKPOINT_ENABLED = os.getenv('WAL_CHECKPOINT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+WAL_CHECKPOINT_BYTES = int(os.getenv('WAL_CHECKPOINT_BYTES', str(16 * 1024 * 1024)))
+WAL_TRUNCATE_BYTES = int(os.getenv('WAL_TRUNCATE_BYTES', str(256 * 1024 * 1024)))
+WAL_CHECKPOINT_INTERVAL = float(os.getenv('WAL_CHECKPOINT_INTERVAL', '60'))
+WAL_CHECKPOINT_POLL = float(os.getenv('WAL_CHECKPOINT_POLL', '5'))
+
+
+def wal_file_size(db_path):
+    try:
+        return os.path.getsize(db_path + '-wal')
+    except OSError:
+        return 0
+
+
+class WalCheckpointManager:
+    """Checkpoints the WAL of one SQLite database from a daemon thread"""
+
+    def __init__(self, engine, db_path, size_threshold=WAL_CHECKPOINT_BYTES,
+                 truncate_threshold=WAL_TRUNCATE_BYTES, interval=WAL_CHECKPOINT_INTERVAL,
+                 poll=WAL_CHECKPOINT_POLL):
+        self.engine = engine
+        self.db_path = db_path
+        self.size_threshold = size_threshold
+        self.truncate_threshold = truncate_threshold
+        self.interval = interval
+        self.poll = poll
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._metrics = {
+            'checkpoints': 0,
+            'truncates': 0,
+            'busy': 0,
+            'errors': 0,
+            'last_checkpoint_at': None,
+            'last_mode': None,
+            'last_duration_ms': None,
+            'last_result': None,
+            'last_error': None,
+            'wal_bytes_before_last': None,
+            'max_wal_bytes_seen': 0,
+        }
+        self._last_checkpoint = time.monotonic()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='wal-checkpoint', daemon=True)
+        self._thread.start()
+        logger.info(f"[WAL] Checkpoint manager started (size>{self.size_threshold}B or every {self.interval}s)")
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.wait(self.poll):
+            try:
+                self.maybe_checkpoint()
+            except Exception as e:
+                logger.warning(f"[WAL] Checkpoint loop error: {e}")
+
+    def maybe_checkpoint(self):
+        """Checkpoint if a threshold is reached; returns the mode used or None"""
+        size = wal_file_size(self.db_path)
+        with self._lock:
+            self._metrics['max_wal_bytes_seen'] = max(self._metrics['max_wal_bytes_seen'], size)
+        if size == 0:
+            return None
+        if size >= self.truncate_threshold:
+            mode = 'TRUNCATE'
+        elif size >= self.size_threshold or time.monotonic() - self._last_checkpoint >= self.interval:
+            mode = 'PASSIVE'
+        else:
+            return None
+        self.checkpoint(mode, wal_bytes=size)
+        return mode
+
+    def checkpoint(self, mode='PASSIVE', wal_bytes=None):
+        """Run PRAGMA wal_checkpoint(mode) and record the outcome"""
+        if mode not in ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'):
+            raise ValueError(f"Invalid checkpoint mode: {mode}")
+        if wal_bytes is None:
+            wal_bytes = wal_file_size(self.db_path)
+        started = time.monotonic()
+        try:
+            with self.engine.connect() as conn:
+                busy, log_frames, checkpointed = conn.execute(text(f"PRAGMA wal_checkpoint({mode})")).fetchone()
+                conn.commit()
+        except Exception as e:
+            with self._lock:
+                self._metrics['errors'] += 1
+                self._metrics['last_error'] = str(e)
+            logger.warning(f"[WAL] {mode} checkpoint failed: {e}")
+            return None
+
+        self._last_checkpoint = time.monotonic()
+        result = {'busy': busy, 'log_frames': log_frames, 'checkpointed_frames': checkpointed}
+        with self._lock:
+            self._metrics['checkpoints'] += 1
+            if mode == 'TRUNCATE':
+                self._metrics['truncates'] += 1
+            if busy:
+                self._metrics['busy'] += 1
+            self._metrics['last_checkpoint_at'] = time.time()
+            self._metrics['last_mode'] = mode
+            self._metrics['last_duration_ms'] = round((self._last_checkpoint - started) * 1000, 1)
+            self._metrics['last_result'] = result
+            self._metrics['wal_bytes_before_last'] = wal_bytes
+        logger.debug(f"[WAL] {mode} checkpoint: {result} ({wal_bytes} bytes before)")
+        return result
+
+    def stats(self):
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics.update({
+            'running': bool(self._thread and self._thread.is_alive()),
+            'wal_bytes': wal_file_size(self.db_path),
+            'size_threshold': self.size_threshold,
+            'truncate_threshold': self.truncate_threshold,
+            'interval_seconds': self.interval,
+            'seconds_since_last_checkpoint': round(time.monotonic() - self._last_checkpoint, 1),
+        })
+        return metrics
+
+
+_manager = None
+_manager_pid = None
+_manager_lock = threading.Lock()
+
+
+def get_checkpoint_manager(engine, db_path, start=True):
+    """Per-process manager (recreated after fork); started on first use when enabled"""
+    global _manager, _manager_pid
+    with _manager_lock:
+        if _manager is None or _manager_pid != os.getpid():
+            _manager = WalCheckpointManager(engine, db_path)
+            _manager_pid = os.getpid()
+        if start and WAL_CHECKPOINT_ENABLED:
+            _manager.start()
+        return _manager